@@ -0,0 +1,508 @@
+#!/usr/bin/python3
+
+# Performance benchmarks of the hot paths of stretchy, using only `timeit`
+# and `tracemalloc` from the standard library.
+#
+#   python benchmarks/bench.py --output result.json
+#   python benchmarks/bench.py --compare baseline.json
+#
+# Every case is timed with `timeit` (the best of `--repeat` runs is kept),
+# then run once more under `tracemalloc` to measure the peak allocation.
+
+import argparse
+import io
+import json
+import operator
+import platform
+import random
+import sys
+import timeit
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+import stretchy
+
+# A case is a function that prepares its fixture and returns the statement
+# to be measured. Cases run with `scale` 1 by default; `--scale` allows
+# quick runs (e.g. 0.1) or more demanding ones.
+Case = Callable[[float], Callable[[], Any]]
+
+CASES: dict[str, Case] = {}
+
+
+def case(name: str) -> Callable[[Case], Case]:
+    def register(function: Case) -> Case:
+        CASES[name] = function
+        return function
+    return register
+
+
+def _filled(size: int, margin: int = 0) -> stretchy.ArrayND:
+    # A 2-D grid of `size` x `size` cells with non-default content centered
+    # on the origin, surrounded by `margin` cells of default value in each
+    # direction
+    array = stretchy.empty(2, '.')
+    low = -(size // 2)
+    for i in range(low, low + size):
+        for j in range(low, low + size):
+            array[i, j] = '#' if (i ^ j) & 1 else 'o'
+    if margin:
+        array[low - margin, low - margin] = '.'
+        array[low + size + margin - 1, low + size + margin - 1] = '.'
+    return array
+
+
+def _langtons_ant(scale: float,
+                  factory: Callable[[], stretchy.ArrayND]) -> Callable[[], Any]:
+    steps = int(11000 * scale)
+    def run() -> Any:
+        array = factory()
+        pos = (0, 0)
+        dir = 2
+        for _ in range(steps):
+            if array[pos] == '#':
+                dir = (dir + 1) % 4
+            else:
+                dir = (dir - 1) % 4
+            array[pos] = '.' if array[pos] == '#' else '#'
+            if dir == 0:
+                pos = (pos[0], pos[1] + 1)
+            elif dir == 1:
+                pos = (pos[0] - 1, pos[1])
+            elif dir == 2:
+                pos = (pos[0], pos[1] - 1)
+            elif dir == 3:
+                pos = (pos[0] + 1, pos[1])
+        return array
+    return run
+
+
+@case('langtons_ant')
+def langtons_ant(scale: float) -> Callable[[], Any]:
+    return _langtons_ant(scale, lambda: stretchy.empty(2, '.'))
+
+
+@case('langtons_ant_bits')
+def langtons_ant_bits(scale: float) -> Callable[[], Any]:
+    return _langtons_ant(scale, lambda: stretchy.BitArrayND(2, '.', on='#'))
+
+
+def _sequential_1d(scale: float, step: int) -> Callable[[], Any]:
+    count = int(100000 * scale)
+    def run() -> Any:
+        array = stretchy.empty(1, 0)
+        for i in range(count):
+            array[i * step] = i
+        return array
+    return run
+
+
+@case('setitem_sequential_1d_positive')
+def setitem_sequential_1d_positive(scale: float) -> Callable[[], Any]:
+    return _sequential_1d(scale, 1)
+
+
+@case('setitem_sequential_1d_negative')
+def setitem_sequential_1d_negative(scale: float) -> Callable[[], Any]:
+    return _sequential_1d(scale, -1)
+
+
+def _sequential_2d(scale: float, step: int) -> Callable[[], Any]:
+    size = int(300 * scale)
+    def run() -> Any:
+        array = stretchy.empty(2, 0)
+        for i in range(size):
+            for j in range(size):
+                array[i * step, j * step] = i + j
+        return array
+    return run
+
+
+@case('setitem_sequential_2d_positive')
+def setitem_sequential_2d_positive(scale: float) -> Callable[[], Any]:
+    return _sequential_2d(scale, 1)
+
+
+@case('setitem_sequential_2d_negative')
+def setitem_sequential_2d_negative(scale: float) -> Callable[[], Any]:
+    return _sequential_2d(scale, -1)
+
+
+# Random indices are chosen from [-extent, extent] in every direction
+_EXTENTS = {1: 10000, 2: 200, 3: 30}
+
+
+def _random(scale: float, dim: int) -> Callable[[], Any]:
+    count = int(20000 * scale)
+    extent = int(_EXTENTS[dim] * scale ** (1 / dim)) or 1
+    generator = random.Random(dim)
+    indices = [
+        tuple(generator.randint(-extent, extent) for _ in range(dim))
+            for _ in range(count)
+    ]
+    if dim == 1:
+        indices = [index[0] for index in indices] # type: ignore
+    def run() -> Any:
+        array = stretchy.empty(dim, 0)
+        for index in indices:
+            array[index] = 1
+        return array
+    return run
+
+
+@case('setitem_random_1d')
+def setitem_random_1d(scale: float) -> Callable[[], Any]:
+    return _random(scale, 1)
+
+
+@case('setitem_random_2d')
+def setitem_random_2d(scale: float) -> Callable[[], Any]:
+    return _random(scale, 2)
+
+
+@case('setitem_random_3d')
+def setitem_random_3d(scale: float) -> Callable[[], Any]:
+    return _random(scale, 3)
+
+
+@case('boundaries_2d')
+def boundaries_2d(scale: float) -> Callable[[], Any]:
+    array = _filled(int(500 * scale))
+    return lambda: array.boundaries
+
+
+@case('shape_2d')
+def shape_2d(scale: float) -> Callable[[], Any]:
+    array = _filled(int(500 * scale))
+    return lambda: array.shape
+
+
+@case('trim_2d')
+def trim_2d(scale: float) -> Callable[[], Any]:
+    source = _filled(int(200 * scale), int(100 * scale))
+    # trim modifies the array, so every run works on a new snapshot; copying
+    # is deferred until the first modification
+    return lambda: source.snapshot().trim()
+
+
+@case('crop_to_2d')
+def crop_to_2d(scale: float) -> Callable[[], Any]:
+    source = _filled(int(400 * scale))
+    half = int(100 * scale)
+    return lambda: source.snapshot().crop_to(((-half, half), (-half, half)))
+
+
+@case('fill_2d')
+def fill_2d(scale: float) -> Callable[[], Any]:
+    half = int(150 * scale)
+    def run() -> Any:
+        array = stretchy.empty(2, '.')
+        array.fill(((-half, half), (-half, half)), '#')
+        return array
+    return run
+
+
+@case('paste_2d')
+def paste_2d(scale: float) -> Callable[[], Any]:
+    # Stamps a sprite with transparent cells at many places
+    sprite = _filled(int(20 * scale) or 1)
+    sprite.fill(((0, 2), (0, 2)), '.')
+    half = int(150 * scale)
+    def run() -> Any:
+        array = stretchy.empty(2, '.')
+        for i in range(-half, half, 10):
+            array.paste(sprite, (i, i))
+        return array
+    return run
+
+
+@case('format_2d')
+def format_2d(scale: float) -> Callable[[], Any]:
+    array = _filled(int(300 * scale))
+    return lambda: f'{array:s}'
+
+
+@case('repr_2d')
+def repr_2d(scale: float) -> Callable[[], Any]:
+    array = _filled(int(300 * scale))
+    return lambda: repr(array)
+
+
+@case('rle_timeline')
+def rle_timeline(scale: float) -> Callable[[], Any]:
+    # Sparse events on a long timeline, then the runs of a window of it
+    count = int(2000 * scale)
+    generator = random.Random(0)
+    events = [(generator.randrange(-10**6, 10**6), generator.randrange(3))
+              for _ in range(count)]
+    def run() -> Any:
+        timeline = stretchy.RunArray1D(0)
+        for index, value in events:
+            timeline[index:index + 50] = value
+        return list(timeline.runs((-10**5, 10**5)))
+    return run
+
+
+@case('flood_fill_2d')
+def flood_fill_2d(scale: float) -> Callable[[], Any]:
+    # Fills the default cells between the walls of a maze-like grid
+    size = int(300 * scale)
+    source = stretchy.empty(2, '.')
+    for i in range(0, size, 4):
+        for j in range(size):
+            if j % 16:
+                source[i, j] = '#'
+    source[size - 1, size - 1] = '.'
+    return lambda: source.snapshot().flood_fill((1, 0), 'o')
+
+
+@case('label_2d')
+def label_2d(scale: float) -> Callable[[], Any]:
+    array = _filled(int(300 * scale))
+    return lambda: array.label(lambda value: value == '#')
+
+
+def _maze(size: int) -> stretchy.ArrayND:
+    # Walls with a gap at alternating ends, so that paths zigzag
+    array = stretchy.empty(2, '.')
+    for i in range(1, size, 2):
+        for j in range(size - 1):
+            array[i, j + (i // 2) % 2] = '#'
+    array[size - 1, size - 1] = '.'
+    return array
+
+
+@case('distance_field_2d')
+def distance_field_2d(scale: float) -> Callable[[], Any]:
+    array = _maze(int(200 * scale))
+    return lambda: array.distance_field([(0, 0)], lambda value: value != '#')
+
+
+@case('shortest_path_2d')
+def shortest_path_2d(scale: float) -> Callable[[], Any]:
+    size = int(200 * scale)
+    array = _maze(size)
+    wall = lambda value: None if value == '#' else 1
+    return lambda: array.shortest_path((0, 0), (size - 1, size - 1), wall)
+
+
+def _tiles(scale: float, factory: Callable[[], stretchy.ArrayND]) -> Any:
+    # A map of a few kinds of tiles
+    size = int(300 * scale)
+    array = factory()
+    generator = random.Random(0)
+    for i in range(size):
+        for j in range(size):
+            array[i, j] = generator.choice(('grass', 'water', 'rock'))
+    return array
+
+
+@case('format_tiles_2d')
+def format_tiles_2d(scale: float) -> Callable[[], Any]:
+    array = _tiles(scale, lambda: stretchy.empty(2, 'void'))
+    return lambda: f'{array:a}'
+
+
+@case('format_tiles_2d_palette')
+def format_tiles_2d_palette(scale: float) -> Callable[[], Any]:
+    array = _tiles(scale, lambda: stretchy.PaletteArrayND(2, 'void'))
+    return lambda: f'{array:a}'
+
+
+@case('render_frame_2d')
+def render_frame_2d(scale: float) -> Callable[[], Any]:
+    # A frame of an animation: three cells change between the renders
+    size = int(300 * scale)
+    array = _filled(size)
+    renderer = stretchy.Renderer('s').bind(array)
+    rnd = random.Random(0)
+    low = -(size // 2)
+    def frame() -> str:
+        for _ in range(3):
+            array[rnd.randrange(low, low + size), rnd.randrange(low, low + size)] = '#'
+        return renderer.render()
+    return frame
+
+
+def _ticks(scale: float, key: Callable[[Any], Any]) -> Callable[[], Any]:
+    # Cycle detection: a few cells change per tick, then the state is
+    # looked up among the states seen so far
+    size = int(300 * scale)
+    array = _filled(size)
+    array.enable_fingerprint()
+    rnd = random.Random(0)
+    low = -(size // 2)
+    seen: set = set()
+    def tick() -> bool:
+        for _ in range(3):
+            array[rnd.randrange(low, low + size), rnd.randrange(low, low + size)] = '#'
+        state = key(array)
+        found = state in seen
+        seen.add(state)
+        return found
+    return tick
+
+
+@case('cycle_repr_2d')
+def cycle_repr_2d(scale: float) -> Callable[[], Any]:
+    return _ticks(scale, repr)
+
+
+@case('cycle_fingerprint_2d')
+def cycle_fingerprint_2d(scale: float) -> Callable[[], Any]:
+    return _ticks(scale, lambda array: array.freeze())
+
+
+def _operands(scale: float) -> list[stretchy.ArrayND]:
+    # Three numeric grids; every other row band of the first two is empty
+    size = int(300 * scale)
+    rnd = random.Random(0)
+    arrays = [stretchy.empty(2, 0) for _ in range(3)]
+    for n, array in enumerate(arrays):
+        for i in range(size):
+            if n < 2 and i // 20 % 2:
+                continue
+            for j in range(size):
+                array[i, j] = rnd.randrange(4)
+    return arrays
+
+
+@case('expression_2d_cellwise')
+def expression_2d_cellwise(scale: float) -> Callable[[], Any]:
+    # (a + b) * c > 3, a temporary array for each operation
+    a, b, c = _operands(scale)
+    def step(x: Any, y: Any, op: Callable[[Any, Any], Any]) -> Any:
+        result = stretchy.empty(2, op(x._default, y._default))
+        region = [(min(l1, l2), max(h1, h2)) for (l1, h1), (l2, h2)
+                      in zip(x.boundaries, y.boundaries)]
+        for index, value in x.ndenumerate(region):
+            result[index] = op(value, y[index])
+        return result
+    return lambda: step(step(step(a, b, operator.add), c, operator.mul),
+                        stretchy.empty(2, 3), operator.gt)
+
+
+@case('expression_2d_lazy')
+def expression_2d_lazy(scale: float) -> Callable[[], Any]:
+    a, b, c = _operands(scale)
+    return lambda: ((a.lazy() + b) * c > 3).evaluate()
+
+
+@case('symmetry_2d')
+def symmetry_2d(scale: float) -> Callable[[], Any]:
+    # Compares a grid with its rotated and mirrored views
+    array = _filled(int(100 * scale))
+    content = array.tolist()
+    return lambda: [view.tolist() == content for view in (array.rot90(),
+        array.rot90(2), array.rot90(3), array.flip(0), array.flip(1))]
+
+
+@case('parse_2d')
+def parse_2d(scale: float) -> Callable[[], Any]:
+    text = f'{_filled(int(300 * scale)):s}'
+    return lambda: stretchy.parse(text, default='.')
+
+
+@case('to_csv_2d')
+def to_csv_2d(scale: float) -> Callable[[], Any]:
+    array = _filled(int(300 * scale))
+    return lambda: array.to_csv(io.StringIO())
+
+
+@case('read_csv_2d')
+def read_csv_2d(scale: float) -> Callable[[], Any]:
+    output = io.StringIO()
+    _filled(int(300 * scale)).to_csv(output)
+    text = output.getvalue()
+    return lambda: stretchy.read_csv(io.StringIO(text), default='.')
+
+
+def measure(name: str, scale: float, repeat: int) -> dict[str, float|int]:
+    statement = CASES[name](scale)
+    timer = timeit.Timer(statement)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat, number)) / number
+    tracemalloc.start()
+    try:
+        statement()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'time': best, 'peak_memory': peak}
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any],
+            tolerance: float) -> bool:
+    if results['scale'] != baseline['scale']:
+        print(f'warning: baseline was recorded with scale {baseline["scale"]}',
+              file=sys.stderr)
+    ok = True
+    print(f'{"case":34} {"baseline":>12} {"current":>12} {"ratio":>7}')
+    for name, current in results['cases'].items():
+        previous = baseline['cases'].get(name)
+        if previous is None:
+            print(f'{name:34} {"-":>12} {current["time"]:12.6f} {"new":>7}')
+            continue
+        ratio = current['time'] / previous['time']
+        mark = ''
+        if ratio > 1 + tolerance:
+            mark = ' slower'
+            ok = False
+        elif ratio < 1 - tolerance:
+            mark = ' faster'
+        print(f'{name:34} {previous["time"]:12.6f} {current["time"]:12.6f}'
+              f' {ratio:7.2f}{mark}')
+    return ok
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description='Run the performance benchmarks of stretchy')
+    parser.add_argument('cases', nargs='*', metavar='CASE',
+                        help='cases to run (default: all)')
+    parser.add_argument('-o', '--output', type=Path,
+                        help='write the results to this JSON file')
+    parser.add_argument('-c', '--compare', type=Path, metavar='BASELINE',
+                        help='compare the results with a saved JSON file')
+    parser.add_argument('-t', '--tolerance', type=float, default=0.1,
+                        help='relative slowdown reported as regression')
+    parser.add_argument('-r', '--repeat', type=int, default=5)
+    parser.add_argument('-s', '--scale', type=float, default=1.0)
+    parser.add_argument('-l', '--list', action='store_true',
+                        help='list the available cases')
+    args = parser.parse_args()
+
+    if args.list:
+        print('\n'.join(CASES))
+        return 0
+    unknown = set(args.cases) - CASES.keys()
+    if unknown:
+        parser.error(f'unknown case(s): {", ".join(sorted(unknown))}')
+
+    results: dict[str, Any] = {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'scale': args.scale,
+        'repeat': args.repeat,
+        'cases': {},
+    }
+    for name in args.cases or CASES:
+        results['cases'][name] = measure(name, args.scale, args.repeat)
+        if not args.compare:
+            result = results['cases'][name]
+            print(f'{name:34} {result["time"]:12.6f} s'
+                  f' {result["peak_memory"]:12d} B')
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + '\n')
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        return 0 if compare(results, baseline, args.tolerance) else 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,11 +1,24 @@
 #!/usr/bin/python3
 
+import itertools
 from typing import Any
-from collections.abc import Iterable, Sequence
+from collections.abc import Iterable, Iterator, Sequence
 
 from .abc import Array
 from .array1d import Array1D
 from .arraynd import ArrayND
+from .rle import RunArray1D
+from .bits import BitArray1D, BitArrayND
+from .palette import Palette, PaletteArray1D, PaletteArrayND
+from .shared import SharedArray
+from .journal import Change, Journal
+from .fingerprint import Frozen
+from .lazy import Expression
+from .growth import GrowthPolicy, exact, geometric
+from .textio import parse, read_csv
+from .render import Renderer
+from .stats import Stats, set_hook as set_stats_hook
+from .views import View
 
 
 def _array_dim(content: Sequence, dim: int = 1) -> int:
@@ -20,12 +33,27 @@ def _array_dim(content: Sequence, dim: int = 1) -> int:
     return dim
 
 
+def _first_dim(content: Iterable, dim: int = 1) -> tuple[int, Iterable]:
+    # Detects the dimension from the first elements only; the consumed
+    # elements are chained back, so the content is still read in one pass
+    it: Iterator = iter(content)
+    try:
+        first: Any = next(it)
+    except StopIteration:
+        return dim, ()
+    if isinstance(first, Iterable) and not isinstance(first, (str, bytes)):
+        dim, first = _first_dim(first, dim + 1)
+    return dim, itertools.chain((first,), it)
+
+
 def array(
         content: Sequence|Iterable|None = None,
         *,
         default: Any = None,
         offset: tuple[int, ...]|list[int]|int = 0,
-        dim: int|None = None
+        dim: int|None = None,
+        threadsafe: bool = False,
+        growth: GrowthPolicy = exact
         ) -> Array1D|ArrayND:
     if dim is None:
         if not content or not isinstance(content, Sequence) \
@@ -36,14 +64,40 @@ def array(
     assert dim > 0
     if dim == 1:
         assert isinstance(offset, int)
-        return Array1D(default=default, content=content, offset=offset)
+        return Array1D(default=default, content=content, offset=offset,
+                       threadsafe=threadsafe, growth=growth)
     else:
         assert isinstance(content, (Sequence, type(None)))
-        return ArrayND(dim=dim, default=default, content=content, offset=offset)
+        return ArrayND(dim=dim, default=default, content=content, offset=offset,
+                       threadsafe=threadsafe, growth=growth)
 
 
-def empty(dim: int = 1, default: Any = None) -> Array1D|ArrayND:
+def empty(dim: int = 1, default: Any = None, *,
+          threadsafe: bool = False,
+          growth: GrowthPolicy = exact) -> Array1D|ArrayND:
     if dim == 1:
-        return Array1D(default)
+        return Array1D(default, threadsafe=threadsafe, growth=growth)
+    else:
+        return ArrayND(dim, default, threadsafe=threadsafe, growth=growth)
+
+
+def from_rows(
+        rows: Iterable,
+        *,
+        default: Any = None,
+        offset: tuple[int, ...]|list[int]|int = 0,
+        dim: int|None = None,
+        threadsafe: bool = False,
+        growth: GrowthPolicy = exact
+        ) -> Array1D|ArrayND:
+    if dim is None:
+        dim, rows = _first_dim(rows)
+    assert dim > 0
+    if dim == 1:
+        assert isinstance(offset, int)
+        return Array1D(default=default, content=rows, offset=offset,
+                       threadsafe=threadsafe, growth=growth)
     else:
-        return ArrayND(dim, default)
+        # `replace_content` consumes each level of the content only once
+        return ArrayND(dim=dim, default=default, content=rows, # type: ignore
+                       offset=offset, threadsafe=threadsafe, growth=growth)
@@ -1,7 +1,20 @@
 from .array1d import Array1D
 from .arraynd import ArrayND
+from .rle import RunArray1D
+from .bits import BitArray1D, BitArrayND
+from .palette import Palette, PaletteArray1D, PaletteArrayND
+from .shared import SharedArray
+from .journal import Change, Journal
+from .fingerprint import Frozen
+from .lazy import Expression
+from .growth import GrowthPolicy, exact, geometric
+from .textio import parse, read_csv
+from .render import Renderer
+from .stats import Stats, set_hook as set_stats_hook
+from .views import View
 from collections.abc import Iterable, Sequence
 from typing import Any
 
-def array(content: Union[Sequence, Iterable, None] = ..., *, default: Any = ..., offset: Union[tuple[int, ...], list[int], int] = ..., dim: Union[int, None] = ...) -> Union[Array1D, ArrayND]: ...
-def empty(dim: int = ..., default: Any = ...) -> Union[Array1D, ArrayND]: ...
+def array(content: Union[Sequence, Iterable, None] = ..., *, default: Any = ..., offset: Union[tuple[int, ...], list[int], int] = ..., dim: Union[int, None] = ..., threadsafe: bool = ..., growth: GrowthPolicy = ...) -> Union[Array1D, ArrayND]: ...
+def empty(dim: int = ..., default: Any = ..., *, threadsafe: bool = ..., growth: GrowthPolicy = ...) -> Union[Array1D, ArrayND]: ...
+def from_rows(rows: Iterable, *, default: Any = ..., offset: Union[tuple[int, ...], list[int], int] = ..., dim: Union[int, None] = ..., threadsafe: bool = ..., growth: GrowthPolicy = ...) -> Union[Array1D, ArrayND]: ...
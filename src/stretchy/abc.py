@@ -3,4 +3,10 @@
 from abc import ABC
 
 class Array(ABC):
-    pass
+    __slots__ = ()
+
+    def _rehook(self) -> None:
+        # Called when an optional feature of writing (journal, fingerprint,
+        # renderer, lock) is switched on or off; arrays checking them on a
+        # short path of writing override it
+        pass
@@ -1,25 +1,63 @@
 #!/usr/bin/python3
 
+import contextlib
+import csv
 import itertools
-from typing import Any, Callable, TypeVar, overload
+import operator
+import sys
+import threading
+from functools import partial
+from typing import Any, Callable, IO, TypeVar, overload
 from collections.abc import Iterable, Iterator
 
 from .abc import Array
+from .fingerprint import Fingerprinted
 from .format import *
+from .growth import GrowthPolicy, exact
+from .journal import Journal, Journaled
+from .lazy import Lazy
+from .memory import Measured
+from .paths import Paths
+from .regions import Regions
+from .render import Rendered, Renderer
+from .stats import Instrumented, Stats
 
 T = TypeVar('T')
 Boundaries = tuple[tuple[int, int], ...]
 
-class Array1D(Array):
+class Array1D(Array, Journaled, Instrumented, Measured, Rendered, Regions, Paths,
+              Fingerprinted, Lazy):
+    __slots__ = ('_pos', '_neg', '_poslen', '_neglen', '_growth', '_default',
+                 '_shared', '_owner', '_journal', '_stats', '_renderer',
+                 '_fingerprint', '_lock', '_hooked')
+
     def __init__(self,
             default: T|None = None,
             *,
             content: Iterable|None = None,
-            offset: int = 0
+            offset: int = 0,
+            threadsafe: bool = False,
+            growth: GrowthPolicy = exact
             ) -> None:
         self._pos: list[T|None] = []
         self._neg: list[T|None] = []
+        # Logical lengths; the backing lists may hold spare capacity beyond
+        # them, which always contains default values
+        self._poslen: int = 0
+        self._neglen: int = 0
+        self._growth: GrowthPolicy = growth
         self._default: T|None = default
+        self._shared: bool = False # backing lists are shared with a snapshot
+        self._owner: int|None = None # token of the owning plane
+        self._journal: Journal|None = None
+        self._stats: Stats|None = None
+        self._renderer: Renderer|None = None
+        self._fingerprint: int|None = None
+        # In thread-safe mode, writes and resizing hold the lock of the row
+        self._lock: threading.Lock|None = threading.Lock() if threadsafe else None
+        # Set while any of the optional features of writing may be on, see
+        # `_rehook`; cleared, writes take the short path
+        self._hooked: bool = threadsafe
         if content is not None:
             self.replace_content(content, offset)
 
@@ -30,34 +68,63 @@ class Array1D(Array):
 
     @property
     def offset(self) -> int:
-        return -len(self._neg)
+        return -self._neglen
 
     @property
     def boundaries(self) -> tuple[int, int]:
+        return -self._neglen, self._poslen
+
+    @property
+    def capacity(self) -> tuple[int, int]:
         return -len(self._neg), len(self._pos)
 
 
+    def snapshot(self) -> 'Array1D':
+        clone: Array1D = Array1D(self._default,
+            threadsafe=self._lock is not None, growth=self._growth)
+        clone._pos = self._pos
+        clone._neg = self._neg
+        clone._poslen = self._poslen
+        clone._neglen = self._neglen
+        clone._shared = self._shared = True
+        return clone
+
     def replace_content(self, content: Iterable, offset: int = 0) -> None:
-        if offset >= 0:
-            self._neg = []
-            self._pos = [self._default] * offset + list(content)
-            return
-        self._neg = [self._default] * -offset
-        self._pos = []
-        it = iter(content)
-        try:
-            for index in range(-offset-1,-1,-1):
-                self._neg[index] = next(it)
-            while True:
-                self._pos.append(next(it))
-        except StopIteration:
-            return
+        with self._guard():
+            before = self._begin_resize()
+            self._shared = False
+            if offset >= 0:
+                self._neg = []
+                self._pos = [self._default] * offset + list(content)
+            else:
+                # The cells before the origin are stored in reverse order
+                items: list = list(content)
+                head: list = items[:-offset]
+                head.reverse()
+                self._neg = [self._default] * (-offset - len(head)) + head
+                self._pos = items[-offset:]
+            self._poslen = len(self._pos)
+            self._neglen = len(self._neg)
+            self._end_resize(before)
+            self._invalidate_rendering()
+            self._invalidate_fingerprint()
 
     def trim(self) -> None:
-        while self._pos and self._pos[-1] == self._default:
-            self._pos.pop()
-        while self._neg and self._neg[-1] == self._default:
-            self._neg.pop()
+        with self._guard():
+            before = self._begin_resize()
+            if self._shared:
+                self._unshare()
+            cells: int = len(self)
+            while self._pos and self._pos[-1] == self._default:
+                self._pos.pop()
+            while self._neg and self._neg[-1] == self._default:
+                self._neg.pop()
+            self._poslen = len(self._pos)
+            self._neglen = len(self._neg)
+            if self._stats is not None:
+                self._stats.count('cells_freed', cells - len(self))
+            self._end_resize(before)
+            self._invalidate_rendering()
 
     @overload
     def shrink_by(self, by: int) -> None: ...
@@ -67,46 +134,122 @@ class Array1D(Array):
     def shrink_by(self, by) -> None:
         if isinstance(by, int):
             by = (by, by)
-        bound: int = len(self._neg) - by[0]
-        if bound < 0:
-            bound = 0
-        del self._neg[bound:]
-        bound = len(self._pos) - by[1]
-        if bound < 0:
-            bound = 0
-        del self._pos[bound:]
+        with self._guard():
+            before = self._begin_resize()
+            if self._shared:
+                self._unshare()
+            cells: int = len(self)
+            bound: int = self._neglen - by[0]
+            if bound < 0:
+                bound = 0
+            del self._neg[bound:]
+            self._neglen = bound
+            bound = self._poslen - by[1]
+            if bound < 0:
+                bound = 0
+            del self._pos[bound:]
+            self._poslen = bound
+            if self._stats is not None:
+                self._stats.count('cells_freed', cells - len(self))
+            self._end_resize(before)
+            self._invalidate_rendering()
+            self._invalidate_fingerprint()
 
     def crop_to(self, boundaries: tuple[int, int]) -> None:
         neg_bound, pos_bound = boundaries
         if neg_bound > 0 or pos_bound < 0:
             raise ValueError('Lower bound cannot be positive and upper one cannot be negative')
-        if len(self._pos) > pos_bound:
-            del self._pos[pos_bound:]
-        if len(self._neg) > -neg_bound:
-            del self._neg[-neg_bound:]
+        with self._guard():
+            before = self._begin_resize()
+            if self._shared:
+                self._unshare()
+            cells: int = len(self)
+            if len(self._pos) > pos_bound:
+                del self._pos[pos_bound:]
+                self._poslen = min(self._poslen, pos_bound)
+            if len(self._neg) > -neg_bound:
+                del self._neg[-neg_bound:]
+                self._neglen = min(self._neglen, -neg_bound)
+            if self._stats is not None:
+                self._stats.count('cells_freed', cells - len(self))
+            self._end_resize(before)
+            self._invalidate_rendering()
+            self._invalidate_fingerprint()
+
+    def reserve(self, boundaries: tuple[int, int]) -> None:
+        # Allocates capacity without changing the boundaries
+        neg_bound, pos_bound = boundaries
+        if neg_bound > 0 or pos_bound < 0:
+            raise ValueError('Lower bound cannot be positive and upper one cannot be negative')
+        with self._guard():
+            if self._shared:
+                self._unshare()
+            if len(self._neg) < -neg_bound:
+                self._extend(self._neg, -neg_bound, 'cells_added_negative')
+            if len(self._pos) < pos_bound:
+                self._extend(self._pos, pos_bound, 'cells_added_positive')
+
+
+    def ndenumerate(self, boundaries: tuple[int, int]|None = None
+                    ) -> Iterator[tuple[int, T|None]]:
+        if boundaries is None:
+            boundaries = self.boundaries
+        return zip(range(*boundaries), self._values((boundaries,)))
+
+    def items_nondefault(self) -> Iterator[tuple[int, T|None]]:
+        return itertools.compress(
+            enumerate(self, -self._neglen),
+            map(partial(operator.ne, self._default), self)
+        )
+
+    def tolist(self, boundaries: tuple[int, int]|None = None, *,
+               tuples: bool = False, stream: bool = False
+               ) -> list|tuple|Iterator:
+        if boundaries is None:
+            boundaries = self.boundaries
+        values: Iterator = self._values((boundaries,))
+        if stream:
+            return values
+        return tuple(values) if tuples else list(values)
+
+    def to_csv(self, fp: IO, index: bool = True, **fmtparams: Any) -> None:
+        # The header row holds the column indices
+        writer = csv.writer(fp, **fmtparams)
+        if index:
+            writer.writerow(range(*self.boundaries))
+        writer.writerow(self)
 
 
     def __bool__(self) -> bool:
-        return bool(self._neg) or bool(self._pos)
+        return bool(self._neglen) or bool(self._poslen)
 
     def __setitem__(self, index: int|slice, value: T|None) -> None:
-        dim: list[int|None] = [None, None]
         if isinstance(index, slice):
             range_indices = self._range_indices(index)
             # Fill with value! (Python collections do not support this)
             for i in range(*range_indices):
                 self.__setitem__(i, value)
             return
-        if index >= 0:
-            if len(self._pos) <= index:
-                self._pos.extend([self._default] * (index - len(self._pos) + 1))
-                dim[1] = len(self._pos)
+        if self._hooked or self._shared:
+            self._sethooked(index, value)
+        # Plain write, the same as `_store`, inlined as it is the most
+        # frequent operation
+        elif index >= 0:
+            if self._poslen <= index:
+                if len(self._pos) <= index:
+                    self._extend(self._pos,
+                        self._growth(len(self._pos), index + 1),
+                        'cells_added_positive')
+                self._poslen = index + 1
             self._pos[index] = value
         else:
             index = -index - 1
-            if len(self._neg) <= index:
-                self._neg.extend([self._default] * (index - len(self._neg) + 1))
-                dim[0] = -len(self._neg)
+            if self._neglen <= index:
+                if len(self._neg) <= index:
+                    self._extend(self._neg,
+                        self._growth(len(self._neg), index + 1),
+                        'cells_added_negative')
+                self._neglen = index + 1
             self._neg[index] = value
 
     def __getitem__(self, index: int|slice) -> T|Iterator|None:
@@ -114,6 +257,7 @@ class Array1D(Array):
             range_indices = self._range_indices(index)
             # Return iterator instead of some arbitrary collection
             return (self.__getitem__(i) for i in range(*range_indices))
+        # Spare capacity contains default values, so it need not be checked
         if index >= 0:
             if len(self._pos) <= index:
                 return self._default
@@ -125,10 +269,19 @@ class Array1D(Array):
             return self._neg[index]
 
     def __iter__(self) -> itertools.chain:
-        return itertools.chain(reversed(self._neg), self._pos)
+        neg: list[T|None] = self._neg
+        pos: list[T|None] = self._pos
+        if len(neg) > self._neglen:
+            neg = neg[:self._neglen]
+        if len(pos) > self._poslen:
+            pos = pos[:self._poslen]
+        return itertools.chain(reversed(neg), pos)
 
     def __len__(self) -> int:
-        return len(self._pos) + len(self._neg)
+        return self._poslen + self._neglen
+
+    def __copy__(self) -> 'Array1D':
+        return self.snapshot()
 
     def __format__(self, format: str) -> str:
         formatter: Formatter = Formatter(self._default)
@@ -144,6 +297,86 @@ class Array1D(Array):
             f'offset={self.offset}, content={repr_string})'
 
 
+    def _store(self, index: int, value: T|None) -> None:
+        if index >= 0:
+            if self._poslen <= index:
+                if len(self._pos) <= index:
+                    self._extend(self._pos,
+                        self._growth(len(self._pos), index + 1),
+                        'cells_added_positive')
+                self._poslen = index + 1
+            self._pos[index] = value
+        else:
+            index = -index - 1
+            if self._neglen <= index:
+                if len(self._neg) <= index:
+                    self._extend(self._neg,
+                        self._growth(len(self._neg), index + 1),
+                        'cells_added_negative')
+                self._neglen = index + 1
+            self._neg[index] = value
+
+    def _sethooked(self, index: int, value: T|None) -> None:
+        # Write of a cell with the optional features or copy-on-write
+        lock = self._lock
+        if lock is not None:
+            lock.acquire()
+        try:
+            if self._journal is not None:
+                self._record(index, value)
+            if self._fingerprint is not None:
+                self._rehash(index, self[index], value)
+            if self._renderer is not None:
+                self._renderer._touch(())
+            if self._shared:
+                self._unshare()
+            self._store(index, value)
+        finally:
+            if lock is not None:
+                lock.release()
+
+    def _rehook(self) -> None:
+        # Undo and redo detach the journal without calling this: the flag
+        # may stay set while all the features are off, never the reverse
+        self._hooked = self._lock is not None or self._journal is not None \
+            or self._fingerprint is not None or self._renderer is not None
+
+    def _guard(self) -> contextlib.AbstractContextManager:
+        return self._lock if self._lock is not None else contextlib.nullcontext()
+
+    def _unshare(self) -> None:
+        # Copy-on-write: take private copies of the backing lists
+        self._pos = self._pos.copy()
+        self._neg = self._neg.copy()
+        self._shared = False
+
+    def _restore(self, state: 'Array1D') -> None:
+        clone: Array1D = state.snapshot()
+        self._pos = clone._pos
+        self._neg = clone._neg
+        self._poslen = clone._poslen
+        self._neglen = clone._neglen
+        self._shared = True
+        self._invalidate_rendering()
+        self._invalidate_fingerprint()
+
+    def _extend(self, part: list, size: int, event: str) -> None:
+        # Extends a backing list with default values to the given capacity
+        if self._stats is not None:
+            self._stats.count('grow_events')
+            self._stats.count(event, size - len(part))
+        part.extend([self._default] * (size - len(part)))
+
+    def _cells(self) -> int:
+        return len(self)
+
+    def _memory(self, usage: dict[str, int], deep: bool,
+                seen: set[int]|None) -> None:
+        usage['lists'] += sys.getsizeof(self._pos) + sys.getsizeof(self._neg)
+        if seen is not None:
+            self._memory_cells(usage, self._pos, seen)
+            self._memory_cells(usage, self._neg, seen)
+
     def _range_indices(self, indices: slice) -> tuple[int, int, int]:
         range_indices: list[int|None] = [indices.start, indices.stop, indices.step]
         if range_indices[2] is None:
@@ -151,38 +384,124 @@ class Array1D(Array):
         assert isinstance(range_indices[2], int)
         if range_indices[0] is None:
             if range_indices[2] > 0:
-                range_indices[0] = -len(self._neg)
+                range_indices[0] = -self._neglen
             else:
-                range_indices[0] = len(self._pos) - 1
+                range_indices[0] = self._poslen - 1
         if range_indices[1] is None:
             if range_indices[2] > 0:
-                range_indices[1] = len(self._pos)
+                range_indices[1] = self._poslen
             else:
-                range_indices[1] = -len(self._neg) - 1
+                range_indices[1] = -self._neglen - 1
         assert isinstance(range_indices[0], int)
         assert isinstance(range_indices[1], int)
         return (range_indices[0], range_indices[1], range_indices[2])
 
+    def _values(self, boundaries: Boundaries) -> Iterator:
+        # Values of the given range, padded with default
+        low, high = boundaries[0]
+        neg_len: int = len(self._neg)
+        pos_len: int = len(self._pos)
+        parts: list[Iterable] = []
+        if low < -neg_len:
+            parts.append(itertools.repeat(self._default, min(high, -neg_len) - low))
+            low = -neg_len
+        if low < 0 and low < high:
+            parts.append(reversed(self._neg[-min(high, 0):-low]))
+            low = 0
+        if low < pos_len and low < high:
+            parts.append(self._pos[low:high])
+            low = pos_len
+        if low < high:
+            parts.append(itertools.repeat(self._default, high - low))
+        return itertools.chain.from_iterable(parts)
+
+    def _tolist(self, boundaries: Boundaries, container: type) -> Iterator:
+        return self._values(boundaries)
+
+    def _items_nondefault(self, prefix: tuple[int, ...]) -> Iterator:
+        keys = itertools.product(*((i,) for i in prefix),
+            range(-self._neglen, self._poslen))
+        return itertools.compress(
+            zip(keys, self),
+            map(partial(operator.ne, self._default), self)
+        )
+
     def _maxwidth(self, formatter: Formatter, boundaries: Boundaries) -> None:
         # This private method assumes, that repr shows all values
         if len(self):
             formatter.update_maxwidth(self)
-        if boundaries[0][0] < -len(self._neg) \
-                or boundaries[0][1] > len(self._pos):
+        if boundaries[0][0] < -self._neglen \
+                or boundaries[0][1] > self._poslen:
             formatter.update_maxwidth_default()
 
     def _output(self, formatter: Formatter, boundaries: Boundaries, indent: str = '', indices: list[int] = []) -> None:
-        b: tuple[int, int] = self.boundaries
-        pre: int = b[0] - boundaries[0][0]
-        post: int = boundaries[0][1] - b[1]
-        items: itertools.chain = itertools.chain(
-            itertools.repeat(self._default, pre),
-            self,
-            itertools.repeat(self._default, post),
-        )
-        formatter.output_iter(items)
+        formatter.output_row(self, boundaries[0], indices)
+
+    def _fill(self, low: int, high: int, value: T|None) -> None:
+        # Writes the value to the range at once; the journal is not updated
+        with self._guard():
+            self._place(low, self._segment(value, high - low))
+
+    def _paste(self, low: int, values: list) -> None:
+        # Writes the values from the index at once; the journal is not
+        # updated
+        with self._guard():
+            self._place(low, self._stored(values))
+
+    def _place(self, low: int, stored: list) -> None:
+        # Assigns a range of the backing lists, growing them only once
+        high: int = low + len(stored)
+        if self._renderer is not None:
+            self._renderer._touch(())
+        if self._shared:
+            self._unshare()
+        self._reach(low, high)
+        if high > 0:
+            self._pos[max(low, 0):high] = stored[max(-low, 0):]
+        if low < 0:
+            # Cells before the origin are stored in reverse order
+            middle: int = min(high, 0)
+            self._neg[-middle:-low] = stored[middle - low - 1::-1]
+
+    def _reach(self, low: int, high: int) -> None:
+        # Extends the boundaries to the range, the backing lists are grown
+        # at most once in each direction
+        if self._poslen < high:
+            if len(self._pos) < high:
+                self._extend(self._pos, self._growth(len(self._pos), high),
+                             'cells_added_positive')
+            self._poslen = high
+        if -self._neglen > low:
+            if len(self._neg) < -low:
+                self._extend(self._neg, self._growth(len(self._neg), -low),
+                             'cells_added_negative')
+            self._neglen = -low
+
+    def _cover(self, region: Boundaries) -> None:
+        # Extends the boundaries to the region before writing it
+        with self._guard():
+            if self._shared:
+                self._unshare()
+            self._reach(*region[0])
+
+    def _segment(self, value: T|None, size: int) -> list:
+        # Stored form of a range of cells holding the value
+        return [value] * size
+
+    def _stored(self, values: list) -> list:
+        # Stored form of a range of cells holding the values
+        return values
+
+    def _plain(self, default: Any) -> 'Array1D':
+        # Empty array of plain storage, e.g. for labels or distances
+        return Array1D(default)
+
+    def _rowstring(self, formatter: Formatter, columns: tuple[int, int]) -> str:
+        return formatter.row_string(formatter.padded(self, columns))
 
     def _format(self, formatter: Formatter) -> str:
+        if self._stats is not None:
+            self._stats.count('cells_rendered', len(self))
         if len(self):
             formatter.update_maxwidth(self)
         formatter.output_iter(self)
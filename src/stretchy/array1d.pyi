@@ -1,20 +1,32 @@
 from .format import *
 import itertools
 from .abc import Array as Array
+from .fingerprint import Fingerprinted as Fingerprinted
+from .growth import GrowthPolicy as GrowthPolicy
+from .journal import Journaled as Journaled
+from .lazy import Lazy as Lazy
+from .memory import Measured as Measured
+from .paths import Paths as Paths
+from .regions import Regions as Regions
+from .render import Rendered as Rendered
+from .stats import Instrumented as Instrumented
 from collections.abc import Iterable, Iterator
-from typing import TypeVar, overload
+from typing import Any, IO, TypeVar, overload
 
 T = TypeVar('T')
 Boundaries = tuple[tuple[int, int], ...]
 
-class Array1D(Array):
-    def __init__(self, default: Union[T, None] = ..., *, content: Union[Iterable, None] = ..., offset: int = ...) -> None: ...
+class Array1D(Array, Journaled, Instrumented, Measured, Rendered, Regions, Paths, Fingerprinted, Lazy):
+    def __init__(self, default: Union[T, None] = ..., *, content: Union[Iterable, None] = ..., offset: int = ..., threadsafe: bool = ..., growth: GrowthPolicy = ...) -> None: ...
     @property
     def dim(self) -> int: ...
     @property
     def offset(self) -> int: ...
     @property
     def boundaries(self) -> tuple[int, int]: ...
+    @property
+    def capacity(self) -> tuple[int, int]: ...
+    def snapshot(self) -> Array1D: ...
     def replace_content(self, content: Iterable, offset: int = ...) -> None: ...
     def trim(self) -> None: ...
     @overload
@@ -22,9 +34,15 @@ class Array1D(Array):
     @overload
     def shrink_by(self, by: tuple[int, int]) -> None: ...
     def crop_to(self, boundaries: tuple[int, int]) -> None: ...
+    def reserve(self, boundaries: tuple[int, int]) -> None: ...
+    def ndenumerate(self, boundaries: Union[tuple[int, int], None] = ...) -> Iterator[tuple[int, Union[T, None]]]: ...
+    def items_nondefault(self) -> Iterator[tuple[int, Union[T, None]]]: ...
+    def tolist(self, boundaries: Union[tuple[int, int], None] = ..., *, tuples: bool = ..., stream: bool = ...) -> Union[list, tuple, Iterator]: ...
+    def to_csv(self, fp: IO, index: bool = ..., **fmtparams: Any) -> None: ...
     def __bool__(self) -> bool: ...
     def __setitem__(self, index: Union[int, slice], value: Union[T, None]) -> None: ...
     def __getitem__(self, index: Union[int, slice]) -> Union[T, Iterator, None]: ...
     def __iter__(self) -> itertools.chain: ...
     def __len__(self) -> int: ...
+    def __copy__(self) -> Array1D: ...
     def __format__(self, format: str) -> str: ...
@@ -1,24 +1,56 @@
 #!/usr/bin/python3
 
 from collections.abc import Iterator, Sequence
+import contextlib
+import csv
 import itertools
-from typing import Any, TypeVar, overload
+import sys
+from math import prod
+from typing import Any, IO, TypeVar, overload
 #>from typing import Self # from v3.11!
 
 from .abc import Array
 from .array1d import Array1D
+from .fingerprint import Fingerprinted
 from .format import *
+from .growth import GrowthPolicy, exact
+from .journal import Journal, Journaled
+from .lazy import Lazy
+from .memory import Measured, _objsize
+from .locks import Locks
+from .paths import Paths
+from .regions import Regions
+from .render import Rendered, Renderer
+from .stats import Instrumented, Stats
+from .views import View
 
 T = TypeVar('T')
 #>Boundaries = tuple[tuple[int, int], ...] | list[tuple[int, int] | list[int]]
 Boundaries = Sequence[tuple[int, int] | list[int]]
 
+# Tokens identify the owner of a plane; a plane referenced by a parent with
+# a different token may be shared with a snapshot, and is copied on write.
+_tokens: Iterator[int] = itertools.count()
+
+def _blank(default: Any, boundaries: Boundaries, container: type) -> Any:
+    # Nested container of default values for the given region
+    low, high = boundaries[0]
+    if len(boundaries) == 1:
+        return container(itertools.repeat(default, max(0, high - low)))
+    return container(_blank(default, boundaries[1:], container)
+                        for _ in range(low, high))
+
 def _minmax(arr: tuple[tuple[int, int], ...]) -> tuple[int, int]:
     minarr, maxarr = zip(*arr)
     return min(minarr), max(maxarr)
 
 
-class ArrayND(Array):
+class ArrayND(Array, Journaled, Instrumented, Measured, Rendered, Regions, Paths,
+              Fingerprinted, Lazy):
+    __slots__ = ('_pos', '_neg', '_poslen', '_neglen', '_growth', '_dim',
+                 '_default', '_shared', '_owner', '_token', '_journal',
+                 '_stats', '_renderer', '_fingerprint', '_locks', '_exposed',
+                 'index_format')
     index_format: str|None
 
     def __init__(self,
@@ -26,12 +58,30 @@ class ArrayND(Array):
             default: T|None = None,
             *,
             content: Sequence|None = None,
-            offset: tuple[int,...]|list[int]|int = 0
+            offset: tuple[int,...]|list[int]|int = 0,
+            threadsafe: bool = False,
+            growth: GrowthPolicy = exact
             ) -> None:
         self._pos: list = [] # list[Self|Array1D]
         self._neg: list = [] # list[Self|Array1D]
+        # Logical lengths; the plane lists may hold spare capacity beyond
+        # them, which always contains placeholders or empty planes
+        self._poslen: int = 0
+        self._neglen: int = 0
+        self._growth: GrowthPolicy = growth
         self._dim: int = dim
         self._default: Any = default
+        self._shared: bool = False # backing lists are shared with a snapshot
+        self._owner: int|None = None # token of the owning plane
+        self._token: int = next(_tokens)
+        self._journal: Journal|None = None
+        self._stats: Stats|None = None
+        self._renderer: Renderer|None = None
+        self._fingerprint: int|None = None
+        self._locks: Locks|None = Locks() if threadsafe else None
+        # Planes have been handed out by indexing or iteration, so they may
+        # be written without the array knowing
+        self._exposed: bool = False
         if content is not None:
             self.replace_content(content, offset)
         self.index_format = None
@@ -51,16 +101,57 @@ class ArrayND(Array):
 
     @property
     def boundaries(self) -> Boundaries:
+        # Only the computations of the whole array are counted
+        if self._stats is not None and self._owner is None:
+            self._stats.count('boundaries_computed')
         if len(self) == 0:
             return (((0, 0),) * self._dim)
-        all_bounds: Iterator[Boundaries]
-        if self._dim == 2:
-            all_bounds = ((plane.boundaries,) for plane in self)
-        else:
-            all_bounds = (plane.boundaries for plane in self)
+        # Placeholders are all-default; the origin is always included
+        all_bounds: Iterator[Boundaries] = itertools.chain(
+            (((0, 0),) * (self._dim - 1),),
+            (plane.boundaries for plane in self._planes() if plane is not None)
+                if self._dim > 2 else
+            ((plane.boundaries,) for plane in self._planes() if plane is not None)
+        )
         boundmax: Iterator[tuple[int, int]] = (_minmax(a) for a in zip(*all_bounds))
-        return ((-len(self._neg), len(self._pos)), *boundmax)
+        return ((-self._neglen, self._poslen), *boundmax)
 
+    @property
+    def capacity(self) -> Boundaries:
+        if not self._neg and not self._pos:
+            return (((0, 0),) * self._dim)
+        all_capacities: Iterator[Boundaries] = itertools.chain(
+            (((0, 0),) * (self._dim - 1),),
+            (plane.capacity for plane in self._allplanes() if plane is not None)
+                if self._dim > 2 else
+            ((plane.capacity,) for plane in self._allplanes() if plane is not None)
+        )
+        capmax: Iterator[tuple[int, int]] = (_minmax(a) for a in zip(*all_capacities))
+        return ((-len(self._neg), len(self._pos)), *capmax)
+
+
+    def snapshot(self) -> 'ArrayND':
+        clone: ArrayND = self._like(self._dim, self._locks is not None)
+        clone._poslen = self._poslen
+        clone._neglen = self._neglen
+        clone.index_format = self.index_format
+        if self._exposed:
+            # Planes handed out stay with this array, the snapshot gets
+            # copy-on-write snapshots of them, sharing their cells
+            with self._guard():
+                clone._pos = [None if plane is None
+                                  else clone._adopt(plane.snapshot())
+                                  for plane in self._pos]
+                clone._neg = [None if plane is None
+                                  else clone._adopt(plane.snapshot())
+                                  for plane in self._neg]
+            return clone
+        clone._pos = self._pos
+        clone._neg = self._neg
+        clone._shared = self._shared = True
+        # Planes are not owned by any of the two arrays from now on
+        self._token = next(_tokens)
+        return clone
 
     def replace_content(self, content: Sequence|None = None,
                         offset: tuple[int,...]|list[int]|int = 0,
@@ -68,31 +159,46 @@ class ArrayND(Array):
         if content is None:
             content = array
         assert content is not None
-        self._neg = []
-        self._pos = []
-        if isinstance(offset, int):
-            offset = [offset] * self._dim
-        offset = list(offset)
-        current_offset: int = 0
-        sub_offset: list[int] = [0]
-        if len(offset) > 0:
-            current_offset = offset[0]
-            if len(offset) > 1:
-                sub_offset = offset[1:]
-        for index, subcontent in enumerate(content, current_offset):
-            plane = self._getplane(index) # Self|Array1D
-            if self._dim == 2:
-                plane.replace_content(subcontent, sub_offset[0])
-            else:
-                plane.replace_content(subcontent, sub_offset)
+        with self._guard():
+            before = self._begin_resize()
+            self._neg = []
+            self._pos = []
+            self._poslen = self._neglen = 0
+            self._shared = False
+            if isinstance(offset, int):
+                offset = [offset] * self._dim
+            offset = list(offset)
+            current_offset: int = 0
+            sub_offset: list[int] = [0]
+            if len(offset) > 0:
+                current_offset = offset[0]
+                if len(offset) > 1:
+                    sub_offset = offset[1:]
+            for index, subcontent in enumerate(content, current_offset):
+                plane = self._getplane(index) # Self|Array1D
+                if self._dim == 2:
+                    plane.replace_content(subcontent, sub_offset[0])
+                else:
+                    plane.replace_content(subcontent, sub_offset)
+            self._end_resize(before)
+            self._invalidate_rendering()
+            self._invalidate_fingerprint()
 
     def trim(self) -> None:
-        for plane in self:
-            plane.trim()
-        while self._pos and not self._pos[-1]:
-            self._pos.pop()
-        while self._neg and not self._neg[-1]:
-            self._neg.pop()
+        with self._guard():
+            before = self._begin_resize()
+            self._own()
+            for plane in self._planes():
+                if plane is not None:
+                    plane.trim()
+            while self._pos and not self._pos[-1]:
+                self._pos.pop()
+            while self._neg and not self._neg[-1]:
+                self._neg.pop()
+            self._poslen = len(self._pos)
+            self._neglen = len(self._neg)
+            self._end_resize(before)
+            self._invalidate_rendering()
 
     @overload
     def shrink_by(self, by: int) -> None: ...
@@ -124,25 +230,114 @@ class ArrayND(Array):
         neg_bound, pos_bound = boundaries[0]
         if neg_bound > 0 or pos_bound < 0:
             raise ValueError(f'Lower bounds cannot be positive and upper ones cannot be negative')
-        if len(self._pos) > pos_bound:
-            del self._pos[pos_bound:]
-        if len(self._neg) > -neg_bound:
-            del self._neg[-neg_bound:]
-        if self._dim == 2:
-            for plane in self:
-                plane.crop_to(boundaries[1])
-        else:
-            for plane in self:
-                plane.crop_to(boundaries[1:])
+        with self._guard():
+            before = self._begin_resize()
+            if self._shared:
+                self._unshare()
+            if self._stats is not None:
+                self._stats.count('cells_freed', sum(plane._cells()
+                    for plane in itertools.chain(
+                        self._pos[pos_bound:], self._neg[-neg_bound:])
+                            if plane is not None))
+            if len(self._pos) > pos_bound:
+                del self._pos[pos_bound:]
+                self._poslen = min(self._poslen, pos_bound)
+            if len(self._neg) > -neg_bound:
+                del self._neg[-neg_bound:]
+                self._neglen = min(self._neglen, -neg_bound)
+            # Spare planes are cropped as well
+            self._own()
+            subboundaries = boundaries[1] if self._dim == 2 else boundaries[1:]
+            for plane in self._allplanes():
+                if plane is not None:
+                    plane.crop_to(subboundaries)
+            self._end_resize(before)
+            self._invalidate_rendering()
+            self._invalidate_fingerprint()
+
+    def reserve(self, boundaries: Boundaries) -> None:
+        # Allocates capacity along every axis without changing the
+        # boundaries
+        neg_bound, pos_bound = boundaries[0]
+        if neg_bound > 0 or pos_bound < 0:
+            raise ValueError(f'Lower bounds cannot be positive and upper ones cannot be negative')
+        with self._guard():
+            # Capacity is added to the planes as well, so they must be owned
+            self._own()
+            if len(self._neg) < -neg_bound:
+                self._extend(self._neg, -neg_bound)
+            if len(self._pos) < pos_bound:
+                self._extend(self._pos, pos_bound)
+            subboundaries = boundaries[1] if self._dim == 2 else boundaries[1:]
+            for part in (self._neg, self._pos):
+                for index, plane in enumerate(part):
+                    if plane is None:
+                        plane = part[index] = self._newplane()
+                    plane.reserve(subboundaries)
+
+
+    def ndenumerate(self, boundaries: Boundaries|None = None
+                    ) -> Iterator[tuple[tuple[int, ...], Any]]:
+        if boundaries is None:
+            boundaries = self.boundaries
+        return zip(
+            itertools.product(*(range(*b) for b in boundaries)),
+            self._values(boundaries)
+        )
+
+    def items_nondefault(self) -> Iterator[tuple[tuple[int, ...], Any]]:
+        return self._items_nondefault(())
+
+    def tolist(self, boundaries: Boundaries|None = None, *,
+               tuples: bool = False, stream: bool = False
+               ) -> list|tuple|Iterator:
+        # Nested lists (or tuples) of the region; with `stream`, the items
+        # along the first axis are generated one at a time
+        if boundaries is None:
+            boundaries = self.boundaries
+        container: type = tuple if tuples else list
+        rows: Iterator = self._tolist(boundaries, container)
+        return rows if stream else container(rows)
+
+    def to_csv(self, fp: IO, index: bool = True, **fmtparams: Any) -> None:
+        # Leading axes are flattened to the rows, which are written one at
+        # a time. With index, the leading columns hold the indices of the
+        # leading axes, and the header row holds the column indices.
+        writer = csv.writer(fp, **fmtparams)
+        boundaries = self.boundaries
+        columns: range = range(*boundaries[-1])
+        if index:
+            writer.writerow(itertools.chain(('',) * (self._dim - 1), columns))
+        for prefix in itertools.product(*(range(*b) for b in boundaries[:-1])):
+            row: Array1D|None = self._row(prefix)
+            values: Iterator = itertools.repeat(self._default, len(columns)) \
+                if row is None else row._values(boundaries[-1:])
+            writer.writerow(itertools.chain(prefix, values) if index else values)
+
+    def transpose(self, axes: Sequence[int]|None = None) -> View:
+        # Views sharing the cells of the array, see `View`
+        return View(self, ()).transpose(axes)
+
+    def flip(self, axis: int = 0) -> View:
+        return View(self, ()).flip(axis)
+
+    def rot90(self, k: int = 1, axes: tuple[int, int] = (0, 1)) -> View:
+        return View(self, ()).rot90(k, axes)
 
 
     def __bool__(self) -> bool:
-        return bool(self._neg) or bool(self._pos)
+        return bool(self._neglen) or bool(self._poslen)
 
     def __setitem__(self, index: tuple[int, ...], value: T) -> None:
         if not isinstance(index, tuple) or len(index) != self._dim \
                 or any(map(lambda x: not isinstance(x, int), index)):
             raise TypeError(f'Index must be a {self._dim} element tuple of integers')
+        if self._journal is not None:
+            self._record(index, value)
+        if self._fingerprint is not None:
+            self._rehash(index, self[index], value)
+        if self._renderer is not None:
+            self._renderer._touch(index[:-1])
         plane = self._getplane(index[0]) # Self|Array1D
         if self._dim == 2:
             plane[index[1]] = value
@@ -152,13 +347,23 @@ class ArrayND(Array):
     def __getitem__(self, index: int|tuple[int, ...]|slice) -> Any: # Self|Array1D|T
         if isinstance(index, slice):
             range_indices = self._range_indices(index)
+            self._exposed = True
             # Return iterator instead of some arbitrary collection
             return (self._getplane(i) for i in range(*range_indices))
         if isinstance(index, int):
+            # Probing a missing region creates nothing: planes not stored
+            # are given as views, which create them on their first write
+            if self._getplane(index, create=False) is None \
+                    or not -self._neglen <= index < self._poslen:
+                return View(self, (index,))
+            self._exposed = True
             return self._getplane(index)
-        if not isinstance(index, tuple) or len(index) != self._dim \
+        if not isinstance(index, tuple) or not 0 < len(index) <= self._dim \
                 or any(map(lambda x: not isinstance(x, int), index)):
-            raise TypeError(f'Index must be a {self._dim} element tuple of integers')
+            raise TypeError(f'Index must be a tuple of at most {self._dim} integers')
+        if len(index) < self._dim:
+            # Partial index: live view of the plane, no planes are created
+            return View(self, index)
         plane = self._getplane(index[0], create=False)
         if plane is None:
             return self._default
@@ -167,11 +372,19 @@ class ArrayND(Array):
         else:
             return plane[index[1:]]
 
-    def __iter__(self) -> itertools.chain:
-        return itertools.chain(reversed(self._neg), self._pos)
+    def __iter__(self) -> Iterator:
+        # Planes may be written through the iterator, so each of them is
+        # owned (created in place of a placeholder, copied if shared with a
+        # snapshot) when the iteration reaches it, not all of them upfront
+        for index in range(-self._neglen, self._poslen):
+            self._exposed = True
+            yield self._getplane(index)
 
     def __len__(self) -> int:
-        return len(self._pos) + len(self._neg)
+        return self._poslen + self._neglen
+
+    def __copy__(self) -> 'ArrayND':
+        return self.snapshot()
 
     def __format__(self, format: str) -> str:
         formatter: Formatter = Formatter(self._default)
@@ -198,45 +411,238 @@ class ArrayND(Array):
         assert isinstance(range_indices[2], int)
         if range_indices[0] is None:
             if range_indices[2] > 0:
-                range_indices[0] = -len(self._neg)
+                range_indices[0] = -self._neglen
             else:
-                range_indices[0] = len(self._pos) - 1
+                range_indices[0] = self._poslen - 1
         if range_indices[1] is None:
             if range_indices[2] > 0:
-                range_indices[1] = len(self._pos)
+                range_indices[1] = self._poslen
             else:
-                range_indices[1] = -len(self._neg) - 1
+                range_indices[1] = -self._neglen - 1
         assert isinstance(range_indices[0], int)
         assert isinstance(range_indices[1], int)
         return (range_indices[0], range_indices[1], range_indices[2])
 
-    def _getplane(self, index: int, create: bool = True) -> Any: # Self|Array1D
+    def _planes(self) -> itertools.chain:
+        # Read-only iteration over the planes
+        neg: list = self._neg
+        pos: list = self._pos
+        if len(neg) > self._neglen:
+            neg = neg[:self._neglen]
+        if len(pos) > self._poslen:
+            pos = pos[:self._poslen]
+        return itertools.chain(reversed(neg), pos)
+
+    def _allplanes(self) -> itertools.chain:
+        # Read-only iteration over the planes, including spare capacity.
+        # Both iterations may yield None as placeholder of untouched planes.
+        return itertools.chain(reversed(self._neg), self._pos)
+
+    def _unshare(self) -> None:
+        # Copy-on-write: take private copies of the plane lists
+        self._pos = self._pos.copy()
+        self._neg = self._neg.copy()
+        self._shared = False
+
+    def _restore(self, state: 'ArrayND') -> None:
+        clone: ArrayND = state.snapshot()
+        self._pos = clone._pos
+        self._neg = clone._neg
+        self._poslen = clone._poslen
+        self._neglen = clone._neglen
+        self._shared = True
+        self._invalidate_rendering()
+        self._invalidate_fingerprint()
+        self._token = next(_tokens)
+
+    def _set_stats(self, stats: Stats|None) -> None:
+        self._stats = stats
+        for plane in self._allplanes():
+            if plane is not None:
+                plane._set_stats(stats)
+
+    def _cells(self) -> int:
+        return sum(plane._cells() for plane in self._planes()
+                   if plane is not None)
+
+    def _memory(self, usage: dict[str, int], deep: bool,
+                seen: set[int]|None) -> None:
+        usage['lists'] += sys.getsizeof(self._pos) + sys.getsizeof(self._neg)
+        if deep:
+            for plane in self._allplanes():
+                if plane is not None:
+                    usage['planes'] += _objsize(plane)
+                    plane._memory(usage, deep, seen)
+
+    def _own(self) -> None:
+        if self._shared:
+            self._unshare()
+        for part in (self._neg, self._pos):
+            for index, plane in enumerate(part):
+                if plane is not None and plane._owner != self._token:
+                    part[index] = self._adopt(plane.snapshot())
+
+    def _shorten(self, low: int, high: int) -> None:
+        # Drops the planes beyond the boundaries of the first axis only
+        with self._guard():
+            if self._shared:
+                self._unshare()
+            del self._pos[high:]
+            del self._neg[-low:]
+            self._poslen = min(self._poslen, high)
+            self._neglen = min(self._neglen, -low)
+
+    def _guard(self) -> contextlib.AbstractContextManager:
+        if self._locks is None:
+            return contextlib.nullcontext()
+        return self._locks.growth
+
+    def _adopt(self, plane: Any) -> Any: # Self|Array1D
+        plane._owner = self._token
+        plane._stats = self._stats
+        if self._locks is not None:
+            if self._dim == 2:
+                plane._lock = self._locks.stripe()
+                plane._rehook()
+            else:
+                plane._locks = self._locks
+        return plane
+
+    def _like(self, dim: int, threadsafe: bool = False) -> Any: # Self|Array1D
+        # Empty array of the same kind of storage; subclasses storing the
+        # cells differently override this, so planes are created alike
+        if dim == 1:
+            return Array1D(self._default, threadsafe=threadsafe,
+                           growth=self._growth)
+        return ArrayND(dim, self._default, threadsafe=threadsafe,
+                       growth=self._growth)
+
+    def _cover(self, region: Boundaries) -> None:
+        # Extends the boundaries to the region before writing it: the plane
+        # lists of each level are grown at most once in each direction
+        low, high = region[0]
+        with self._guard():
+            if self._shared:
+                self._unshare()
+            if self._poslen < high:
+                if len(self._pos) < high:
+                    self._extend(self._pos, self._growth(len(self._pos), high))
+                self._poslen = high
+            if -self._neglen > low:
+                if len(self._neg) < -low:
+                    self._extend(self._neg, self._growth(len(self._neg), -low))
+                self._neglen = -low
+        for index in range(low, high):
+            self._getplane(index)._cover(region[1:])
+
+    def _plain(self, default: Any) -> 'ArrayND':
+        # Empty array of plain storage, e.g. for labels or distances
+        return ArrayND(self._dim, default)
+
+    def _newplane(self) -> Any: # Self|Array1D
+        plane: Array1D|ArrayND = self._like(self._dim - 1)
+        if self._stats is not None:
+            self._stats.count('planes_created')
+        return self._adopt(plane)
+
+    def _getplane(self, index: int, create: bool = True,
+                  locked: bool = False) -> Any: # Self|Array1D
+        if create and self._locks is not None and not locked:
+            # Existing planes are got without locking, the structure is
+            # changed only while holding the growth lock
+            plane = self._getplane(index, create=False)
+            if plane is not None and not self._shared \
+                    and plane._owner == self._token \
+                    and -self._neglen <= index < self._poslen:
+                return plane
+            with self._locks.growth:
+                return self._getplane(index, locked=True)
+        # Planes got with `create` can be written, so they must be owned
+        if create and self._shared:
+            self._unshare()
+        # Spare planes are placeholders or empty, so they can be read beyond
+        # the boundaries
         if index >= 0:
             part = self._pos
+            if create and self._poslen <= index:
+                if len(part) <= index:
+                    self._extend(part, self._growth(len(part), index + 1))
+                self._poslen = index + 1
         else:
             part = self._neg
             index = -index - 1
+            if create and self._neglen <= index:
+                if len(part) <= index:
+                    self._extend(part, self._growth(len(part), index + 1))
+                self._neglen = index + 1
         if len(part) <= index:
+            return None
+        plane = part[index]
+        if plane is None:
+            # Placeholder of an untouched plane
             if not create:
                 return None
-            if self._dim == 2:
-                part.extend([
-                    Array1D(default=self._default)
-                        for _ in range(index - len(part) + 1)
-                ])
+            plane = part[index] = self._newplane()
+        elif create and plane._owner != self._token:
+            plane = self._adopt(plane.snapshot())
+            part[index] = plane
+        return plane
+
+    def _row(self, prefix: tuple[int, ...]) -> Array1D|None:
+        # Row at the given indices of the leading axes, if it exists
+        plane: Any = self
+        for index in prefix:
+            plane = plane._getplane(index, create=False)
+            if plane is None:
+                return None
+        return plane
+
+    def _extend(self, part: list, size: int) -> None:
+        # Extends a plane list with placeholders to the given capacity;
+        # planes are created on their first write
+        if self._stats is not None:
+            self._stats.count('grow_events')
+        part.extend([None] * (size - len(part)))
+
+    def _values(self, boundaries: Boundaries) -> Iterator:
+        # Values of the given region in row-major order, padded with default
+        subsize: int = prod(high - low for low, high in boundaries[1:])
+        planes = (self._getplane(index, create=False)
+                        for index in range(*boundaries[0]))
+        return itertools.chain.from_iterable(
+            itertools.repeat(self._default, subsize) if plane is None
+                else plane._values(boundaries[1:])
+                    for plane in planes
+        )
+
+    def _tolist(self, boundaries: Boundaries, container: type) -> Iterator:
+        subboundaries = boundaries[1:]
+        for index in range(*boundaries[0]):
+            plane = self._getplane(index, create=False)
+            if plane is None:
+                yield _blank(self._default, subboundaries, container)
             else:
-                part.extend([
-                    ArrayND(dim=self._dim - 1, default=self._default)
-                        for _ in range(index - len(part) + 1)
-                ])
-        return part[index]
+                yield container(plane._tolist(subboundaries, container))
+
+    def _items_nondefault(self, prefix: tuple[int, ...]) -> Iterator:
+        # Empty planes are skipped without visiting their cells
+        return itertools.chain.from_iterable(
+            plane._items_nondefault((*prefix, index))
+                for index, plane in enumerate(self._planes(), -self._neglen)
+                    if plane
+        )
 
     def _maxwidth(self, formatter: Formatter, boundaries: Boundaries) -> None:
         # This private method assumes, that repr shows all values
-        for plane in self:
-            plane._maxwidth(formatter, boundaries[1:])
-        if boundaries[0][0] < -len(self._neg) \
-                or boundaries[0][1] > len(self._pos):
+        # Placeholders show default values, unless the region is empty
+        placeholder: bool = False
+        for plane in self._planes():
+            if plane is None:
+                placeholder = prod(high - low for low, high in boundaries[1:]) > 0
+            else:
+                plane._maxwidth(formatter, boundaries[1:])
+        if placeholder or boundaries[0][0] < -self._neglen \
+                or boundaries[0][1] > self._poslen:
             formatter.update_maxwidth_default()
 
     def _output(self, formatter: Formatter, boundaries: Boundaries,
@@ -259,16 +665,16 @@ class ArrayND(Array):
             plane = self._getplane(index, create = False)
             if plane is None:
                 if dummy is None: # lazy evaluation if needed
-                    if self._dim == 2:
-                        dummy = Array1D(self._default)
-                    else:
-                        dummy = ArrayND(self._dim - 1, self._default)
+                    dummy = self._like(self._dim - 1)
                 plane = dummy
             plane._output(formatter, boundaries[1:], subindent, indices + [index])
         formatter.output_end()
 
     def _format(self, formatter: Formatter) -> str:
         boundaries = self.boundaries
+        if self._stats is not None:
+            self._stats.count('cells_rendered',
+                              prod(high - low for low, high in boundaries))
         self._maxwidth(formatter, boundaries)
         self._output(formatter, boundaries)
         return formatter.output
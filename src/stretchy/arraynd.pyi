@@ -1,17 +1,27 @@
 from .format import *
 import itertools
 from .abc import Array as Array
+from .fingerprint import Fingerprinted as Fingerprinted
+from .growth import GrowthPolicy as GrowthPolicy
+from .journal import Journaled as Journaled
+from .lazy import Lazy as Lazy
+from .memory import Measured as Measured
+from .paths import Paths as Paths
+from .regions import Regions as Regions
+from .render import Rendered as Rendered
+from .stats import Instrumented as Instrumented
 from .array1d import Array1D as Array1D
+from .views import View as View
 from _typeshed import Incomplete
-from collections.abc import Sequence
-from typing import Any, TypeVar, overload
+from collections.abc import Iterator, Sequence
+from typing import Any, IO, TypeVar, overload
 
 T = TypeVar('T')
 Boundaries: Incomplete
 
-class ArrayND(Array):
+class ArrayND(Array, Journaled, Instrumented, Measured, Rendered, Regions, Paths, Fingerprinted, Lazy):
     index_format: Union[str, None]
-    def __init__(self, dim: int, default: Union[T, None] = ..., *, content: Union[Sequence, None] = ..., offset: Union[tuple[int, ...], list[int], int] = ...) -> None: ...
+    def __init__(self, dim: int, default: Union[T, None] = ..., *, content: Union[Sequence, None] = ..., offset: Union[tuple[int, ...], list[int], int] = ..., threadsafe: bool = ..., growth: GrowthPolicy = ...) -> None: ...
     @property
     def dim(self) -> int: ...
     @property
@@ -20,6 +30,9 @@ class ArrayND(Array):
     def shape(self) -> tuple[int, ...]: ...
     @property
     def boundaries(self) -> Boundaries: ...
+    @property
+    def capacity(self) -> Boundaries: ...
+    def snapshot(self) -> ArrayND: ...
     def replace_content(self, content: Union[Sequence, None] = ..., offset: Union[tuple[int, ...], list[int], int] = ..., *, array: Union[Sequence, None] = ...) -> None: ...
     def trim(self) -> None: ...
     @overload
@@ -29,9 +42,18 @@ class ArrayND(Array):
     @overload
     def shrink_by(self, by: tuple[tuple[int, int], ...]) -> None: ...
     def crop_to(self, boundaries: Boundaries) -> None: ...
+    def reserve(self, boundaries: Boundaries) -> None: ...
+    def ndenumerate(self, boundaries: Union[Boundaries, None] = ...) -> Iterator[tuple[tuple[int, ...], Any]]: ...
+    def items_nondefault(self) -> Iterator[tuple[tuple[int, ...], Any]]: ...
+    def tolist(self, boundaries: Union[Boundaries, None] = ..., *, tuples: bool = ..., stream: bool = ...) -> Union[list, tuple, Iterator]: ...
+    def to_csv(self, fp: IO, index: bool = ..., **fmtparams: Any) -> None: ...
+    def transpose(self, axes: Union[Sequence[int], None] = ...) -> View: ...
+    def flip(self, axis: int = ...) -> View: ...
+    def rot90(self, k: int = ..., axes: tuple[int, int] = ...) -> View: ...
     def __bool__(self) -> bool: ...
     def __setitem__(self, index: tuple[int, ...], value: T) -> None: ...
     def __getitem__(self, index: Union[int, tuple[int, ...], slice]) -> Any: ...
-    def __iter__(self) -> itertools.chain: ...
+    def __iter__(self) -> Iterator: ...
     def __len__(self) -> int: ...
+    def __copy__(self) -> ArrayND: ...
     def __format__(self, format: str) -> str: ...
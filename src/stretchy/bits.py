@@ -0,0 +1,407 @@
+#!/usr/bin/python3
+
+import itertools
+import operator
+import sys
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from typing import Any
+
+from .array1d import Array1D, Boundaries
+from .arraynd import ArrayND
+from .format import Formatter, ReprFormatter
+from .growth import GrowthPolicy, exact
+
+
+def _pack(bits: list[int]) -> bytearray:
+    # Bit `i` of the result is `bits[i]`
+    value: int = int(''.join(map(str, reversed(bits))) or '0', 2)
+    return bytearray(value.to_bytes((len(bits) + 7) // 8, 'little'))
+
+def _unpack(part: bytearray) -> str:
+    # '0'/'1' characters of all bits of the part, in the order of the bits
+    return format(int.from_bytes(part, 'little'), f'0{len(part) * 8}b')[::-1]
+
+def _cut(part: bytearray, length: int) -> None:
+    # Drops the bits from `length` on; the remaining spare bits are cleared
+    del part[(length + 7) // 8:]
+    if length & 7:
+        part[-1] &= (1 << (length & 7)) - 1
+
+def _compatible(array: Any, other: Any) -> None:
+    # Bits of arrays can only be combined if they mean the same values
+    if array._default != other._default or array._on != other._on:
+        raise ValueError('Arrays must have the same default and on values')
+
+
+class BitArray1D(Array1D):
+    # One-dimensional array of two values, packed 1 bit per cell: the
+    # default value is stored as 0, the `on` value as 1. The backing lists
+    # are bytearrays; spare bits beyond the logical lengths are always 0.
+    __slots__ = ('_on',)
+
+    def __init__(self,
+            default: Any = False,
+            *,
+            on: Any = True,
+            content: Iterable|None = None,
+            offset: int = 0,
+            threadsafe: bool = False,
+            growth: GrowthPolicy = exact
+            ) -> None:
+        if on == default:
+            raise ValueError('The default and the `on` value must differ')
+        self._on: Any = on
+        super().__init__(default, threadsafe=threadsafe, growth=growth)
+        self._pos: bytearray = bytearray() # type: ignore
+        self._neg: bytearray = bytearray() # type: ignore
+        if content is not None:
+            self.replace_content(content, offset)
+
+
+    @property
+    def on(self) -> Any:
+        return self._on
+
+    @property
+    def capacity(self) -> tuple[int, int]:
+        return -len(self._neg) * 8, len(self._pos) * 8
+
+
+    def snapshot(self) -> 'BitArray1D':
+        clone: BitArray1D = BitArray1D(self._default, on=self._on,
+            threadsafe=self._lock is not None, growth=self._growth)
+        clone._pos = self._pos
+        clone._neg = self._neg
+        clone._poslen = self._poslen
+        clone._neglen = self._neglen
+        clone._shared = self._shared = True
+        return clone
+
+    def replace_content(self, content: Iterable, offset: int = 0) -> None:
+        with self._guard():
+            before = self._begin_resize()
+            items: list[int] = list(map(self._bit, content))
+            if offset >= 0:
+                self._neg = bytearray()
+                self._pos = _pack([0] * offset + items)
+                self._neglen = 0
+                self._poslen = offset + len(items)
+            else:
+                head: list[int] = items[:-offset]
+                head.reverse()
+                self._neg = _pack([0] * (-offset - len(head)) + head)
+                self._pos = _pack(items[-offset:])
+                self._neglen = -offset
+                self._poslen = max(0, offset + len(items))
+            self._shared = False
+            self._end_resize(before)
+            self._invalidate_rendering()
+            self._invalidate_fingerprint()
+
+    def trim(self) -> None:
+        with self._guard():
+            before = self._begin_resize()
+            cells: int = len(self)
+            self._resize(int.from_bytes(self._neg, 'little').bit_length(),
+                         int.from_bytes(self._pos, 'little').bit_length())
+            if self._stats is not None:
+                self._stats.count('cells_freed', cells - len(self))
+            self._end_resize(before)
+            self._invalidate_rendering()
+
+    def shrink_by(self, by) -> None:
+        if isinstance(by, int):
+            by = (by, by)
+        self.crop_to((min(0, -self._neglen + by[0]),
+                      max(0, self._poslen - by[1])))
+
+    def crop_to(self, boundaries: tuple[int, int]) -> None:
+        neg_bound, pos_bound = boundaries
+        if neg_bound > 0 or pos_bound < 0:
+            raise ValueError('Lower bound cannot be positive and upper one cannot be negative')
+        with self._guard():
+            before = self._begin_resize()
+            cells: int = len(self)
+            self._resize(min(self._neglen, -neg_bound),
+                         min(self._poslen, pos_bound))
+            if self._stats is not None:
+                self._stats.count('cells_freed', cells - len(self))
+            self._end_resize(before)
+            self._invalidate_rendering()
+            self._invalidate_fingerprint()
+
+    def reserve(self, boundaries: tuple[int, int]) -> None:
+        neg_bound, pos_bound = boundaries
+        if neg_bound > 0 or pos_bound < 0:
+            raise ValueError('Lower bound cannot be positive and upper one cannot be negative')
+        with self._guard():
+            if self._shared:
+                self._unshare()
+            self._extend(self._neg, -neg_bound, 'cells_added_negative')
+            self._extend(self._pos, pos_bound, 'cells_added_positive')
+
+    def count(self) -> int:
+        # Number of cells holding the `on` value
+        return int.from_bytes(self._pos, 'little').bit_count() \
+            + int.from_bytes(self._neg, 'little').bit_count()
+
+
+    def __setitem__(self, index: int|slice, value: Any) -> None:
+        if isinstance(index, slice):
+            super().__setitem__(index, value)
+            return
+        bit: int = self._bit(value)
+        with self._guard():
+            if self._journal is not None:
+                self._record(index, value)
+            if self._fingerprint is not None:
+                self._rehash(index, self[index], value)
+            if self._renderer is not None:
+                self._renderer._touch(())
+            if self._shared:
+                self._unshare()
+            part: bytearray
+            if index >= 0:
+                part = self._pos
+                if self._poslen <= index:
+                    if len(part) * 8 <= index:
+                        self._extend(part, self._growth(len(part) * 8, index + 1),
+                                     'cells_added_positive')
+                    self._poslen = index + 1
+            else:
+                part = self._neg
+                index = -index - 1
+                if self._neglen <= index:
+                    if len(part) * 8 <= index:
+                        self._extend(part, self._growth(len(part) * 8, index + 1),
+                                     'cells_added_negative')
+                    self._neglen = index + 1
+            if bit:
+                part[index >> 3] |= 1 << (index & 7)
+            else:
+                part[index >> 3] &= 0xff ^ (1 << (index & 7))
+
+    def __getitem__(self, index: int|slice) -> Any:
+        if isinstance(index, slice):
+            return super().__getitem__(index)
+        part: bytearray = self._pos
+        if index < 0:
+            part = self._neg
+            index = -index - 1
+        if index >> 3 < len(part) and part[index >> 3] >> (index & 7) & 1:
+            return self._on
+        return self._default
+
+    def __iter__(self) -> Iterator: # type: ignore
+        return self._values((self.boundaries,))
+
+    def __and__(self, other: Any) -> 'BitArray1D':
+        return self._combine(other, operator.and_)
+
+    def __or__(self, other: Any) -> 'BitArray1D':
+        return self._combine(other, operator.or_)
+
+    def __xor__(self, other: Any) -> 'BitArray1D':
+        return self._combine(other, operator.xor)
+
+    def __repr__(self) -> str:
+        repr_string: str = self._format(ReprFormatter(self._default))
+        return f'BitArray1D(default={self._default!r}, on={self._on!r}, ' \
+            f'offset={self.offset}, content={repr_string})'
+
+
+    def _bit(self, value: Any) -> int:
+        if value == self._default:
+            return 0
+        if value == self._on:
+            return 1
+        raise ValueError(f'Only {self._default!r} and {self._on!r} can be stored')
+
+    def _combine(self, other: Any, op: Callable[[int, int], int]) -> Any:
+        # Bitwise operation of the backing bytes; both arrays keep their
+        # spare bits 0, so the result does so as well
+        if not isinstance(other, BitArray1D):
+            return NotImplemented
+        _compatible(self, other)
+        result: BitArray1D = BitArray1D(self._default, on=self._on,
+                                        growth=self._growth)
+        for name in ('_pos', '_neg'):
+            mine: bytearray = getattr(self, name)
+            theirs: bytearray = getattr(other, name)
+            value: int = op(int.from_bytes(mine, 'little'),
+                            int.from_bytes(theirs, 'little'))
+            setattr(result, name, bytearray(
+                value.to_bytes(max(len(mine), len(theirs)), 'little')))
+        result._poslen = max(self._poslen, other._poslen)
+        result._neglen = max(self._neglen, other._neglen)
+        return result
+
+    def _fill(self, low: int, high: int, value: Any) -> None:
+        bit: int = self._bit(value)
+        with self._guard():
+            if self._renderer is not None:
+                self._renderer._touch(())
+            if self._shared:
+                self._unshare()
+            self._reach(low, high)
+            # Only the bytes holding the range are rewritten
+            for part, first, last in ((self._pos, max(low, 0), high),
+                                      (self._neg, -min(high, 0), -low)):
+                if first >= last:
+                    continue
+                start: int = first >> 3
+                stop: int = (last + 7) >> 3
+                bits: int = int.from_bytes(part[start:stop], 'little')
+                mask: int = ((1 << (last - first)) - 1) << (first - start * 8)
+                bits = bits | mask if bit else bits & ~mask
+                part[start:stop] = bits.to_bytes(stop - start, 'little')
+
+    def _paste(self, low: int, values: list) -> None:
+        for value, group in itertools.groupby(values):
+            high: int = low + sum(1 for _ in group)
+            self._fill(low, high, value)
+            low = high
+
+    def _reach(self, low: int, high: int) -> None:
+        if self._poslen < high:
+            if len(self._pos) * 8 < high:
+                self._extend(self._pos, self._growth(len(self._pos) * 8, high),
+                             'cells_added_positive')
+            self._poslen = high
+        if -self._neglen > low:
+            if len(self._neg) * 8 < -low:
+                self._extend(self._neg, self._growth(len(self._neg) * 8, -low),
+                             'cells_added_negative')
+            self._neglen = -low
+
+    def _resize(self, neglen: int, poslen: int) -> None:
+        if self._shared:
+            self._unshare()
+        _cut(self._neg, neglen)
+        _cut(self._pos, poslen)
+        self._neglen = neglen
+        self._poslen = poslen
+
+    def _extend(self, part: list, size: int, event: str) -> None:
+        # Extends a backing bytearray to hold the given number of cells
+        size = (size + 7) // 8
+        if size <= len(part):
+            return
+        if self._stats is not None:
+            self._stats.count('grow_events')
+            self._stats.count(event, (size - len(part)) * 8)
+        part.extend(bytes(size - len(part)))
+
+    def _memory(self, usage: dict[str, int], deep: bool,
+                seen: set[int]|None) -> None:
+        usage['lists'] += sys.getsizeof(self._pos) + sys.getsizeof(self._neg)
+        if seen is not None:
+            self._memory_cells(usage, [self._default, self._on], seen)
+
+    def _values(self, boundaries: Boundaries) -> Iterator:
+        low, high = boundaries[0]
+        bits: str = ''
+        if low < 0 and low < high:
+            # Cells before the origin are stored in reverse order
+            neg: str = _unpack(self._neg).ljust(-low, '0')
+            bits = neg[-min(high, 0):-low][::-1]
+        if high > 0 and low < high:
+            bits += _unpack(self._pos).ljust(high, '0')[max(low, 0):high]
+        return map({'0': self._default, '1': self._on}.__getitem__, bits)
+
+    def _maxwidth(self, formatter: Formatter, boundaries: Boundaries) -> None:
+        # Only two values can be shown
+        ones: int = self.count()
+        if ones:
+            formatter.update_maxwidth((self._on,))
+        low, high = boundaries[0]
+        if ones < high - low:
+            formatter.update_maxwidth_default()
+
+    def _format(self, formatter: Formatter) -> str:
+        if self._stats is not None:
+            self._stats.count('cells_rendered', len(self))
+        if len(self):
+            self._maxwidth(formatter, (self.boundaries,))
+        formatter.output_iter(self)
+        return formatter.output
+
+
+class BitArrayND(ArrayND):
+    # N-dimensional array of two values, its rows are BitArray1D objects
+    __slots__ = ('_on',)
+
+    def __init__(self,
+            dim: int,
+            default: Any = False,
+            *,
+            on: Any = True,
+            content: Sequence|None = None,
+            offset: tuple[int,...]|list[int]|int = 0,
+            threadsafe: bool = False,
+            growth: GrowthPolicy = exact
+            ) -> None:
+        if on == default:
+            raise ValueError('The default and the `on` value must differ')
+        self._on: Any = on
+        super().__init__(dim, default, content=content, offset=offset,
+                         threadsafe=threadsafe, growth=growth)
+
+
+    @property
+    def on(self) -> Any:
+        return self._on
+
+
+    def count(self) -> int:
+        # Number of cells holding the `on` value
+        return sum(plane.count() for plane in self._planes()
+                       if plane is not None)
+
+
+    def __and__(self, other: Any) -> 'BitArrayND':
+        return self._combine(other, operator.and_)
+
+    def __or__(self, other: Any) -> 'BitArrayND':
+        return self._combine(other, operator.or_)
+
+    def __xor__(self, other: Any) -> 'BitArrayND':
+        return self._combine(other, operator.xor)
+
+    def __repr__(self) -> str:
+        repr_string: str = self._format(ReprFormatter(self._default))
+        if repr_string != '[]':
+            repr_string = '\n' + repr_string
+        return f'BitArrayND(dim={self._dim}, default={self._default!r}, ' \
+            f'on={self._on!r}, offset={self.offset}, content={repr_string})'
+
+
+    def _like(self, dim: int, threadsafe: bool = False) -> Any: # Self|BitArray1D
+        if dim == 1:
+            return BitArray1D(self._default, on=self._on,
+                              threadsafe=threadsafe, growth=self._growth)
+        return BitArrayND(dim, self._default, on=self._on,
+                          threadsafe=threadsafe, growth=self._growth)
+
+    def _combine(self, other: Any, op: Callable[[int, int], int]) -> Any:
+        # Row-wise operation; planes missing from both arrays remain
+        # placeholders
+        if not isinstance(other, BitArrayND) or other.dim != self._dim:
+            return NotImplemented
+        _compatible(self, other)
+        result: BitArrayND = self._like(self._dim)
+        def combined(index: int) -> Any:
+            mine: Any = self._getplane(index, create=False)
+            theirs: Any = other._getplane(index, create=False)
+            if mine is None and theirs is None:
+                return None
+            if mine is None:
+                mine = self._like(self._dim - 1)
+            if theirs is None:
+                theirs = other._like(self._dim - 1)
+            return result._adopt(mine._combine(theirs, op))
+        result._poslen = max(self._poslen, other._poslen)
+        result._neglen = max(self._neglen, other._neglen)
+        result._pos = list(map(combined, range(result._poslen)))
+        result._neg = list(map(combined, range(-1, -result._neglen - 1, -1)))
+        return result
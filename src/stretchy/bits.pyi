@@ -0,0 +1,34 @@
+from .array1d import Array1D as Array1D
+from .arraynd import ArrayND as ArrayND
+from .growth import GrowthPolicy as GrowthPolicy
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Any
+
+class BitArray1D(Array1D):
+    def __init__(self, default: Any = ..., *, on: Any = ..., content: Union[Iterable, None] = ..., offset: int = ..., threadsafe: bool = ..., growth: GrowthPolicy = ...) -> None: ...
+    @property
+    def on(self) -> Any: ...
+    @property
+    def capacity(self) -> tuple[int, int]: ...
+    def snapshot(self) -> BitArray1D: ...
+    def replace_content(self, content: Iterable, offset: int = ...) -> None: ...
+    def trim(self) -> None: ...
+    def shrink_by(self, by) -> None: ...
+    def crop_to(self, boundaries: tuple[int, int]) -> None: ...
+    def reserve(self, boundaries: tuple[int, int]) -> None: ...
+    def count(self) -> int: ...
+    def __setitem__(self, index: Union[int, slice], value: Any) -> None: ...
+    def __getitem__(self, index: Union[int, slice]) -> Any: ...
+    def __iter__(self) -> Iterator: ...
+    def __and__(self, other: Any) -> BitArray1D: ...
+    def __or__(self, other: Any) -> BitArray1D: ...
+    def __xor__(self, other: Any) -> BitArray1D: ...
+
+class BitArrayND(ArrayND):
+    def __init__(self, dim: int, default: Any = ..., *, on: Any = ..., content: Union[Sequence, None] = ..., offset: Union[tuple[int, ...], list[int], int] = ..., threadsafe: bool = ..., growth: GrowthPolicy = ...) -> None: ...
+    @property
+    def on(self) -> Any: ...
+    def count(self) -> int: ...
+    def __and__(self, other: Any) -> BitArrayND: ...
+    def __or__(self, other: Any) -> BitArrayND: ...
+    def __xor__(self, other: Any) -> BitArrayND: ...
@@ -0,0 +1,190 @@
+#!/usr/bin/python3
+
+import operator
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+
+def _digest(items: Iterable[tuple[Any, Any]]) -> int:
+    # XOR of the hashes of the (index, value) pairs: the order of the cells
+    # does not matter, and a cell can be taken out by hashing it again
+    digest: int = 0
+    for item in items:
+        digest ^= hash(item)
+    return digest
+
+
+def _origin(items: Iterable[tuple[Any, Any]], dim: int) -> Any: # int|tuple
+    # Lowest index of the given cells along each axis, 0 if there are none
+    if dim == 1:
+        return min((index for index, _ in items), default=0)
+    low: list[int]|None = None
+    for index, _ in items:
+        low = list(index) if low is None else list(map(min, low, index))
+    return (0,) * dim if low is None else tuple(low)
+
+
+class Frozen:
+    # Immutable, hashable copy of an array, e.g. to detect repeated states
+    # in a set or dict. Frozen arrays are equal if their dimension, default
+    # value and non-default cells are equal; the boundaries do not matter.
+    # With `normalize`, indices are taken relative to the lowest index of
+    # the non-default cells along each axis, so translated copies are
+    # equal as well. The copy is a snapshot, taking it copies nothing.
+    __slots__ = ('_array', '_origin', '_hash')
+
+    def __init__(self, array: Any, normalize: bool = False) -> None:
+        self._array: Any = array.snapshot()
+        self._origin: Any = _origin(array.items_nondefault(), array.dim) \
+            if normalize else None
+        # Without normalization, the hash is the fingerprint of the array,
+        # unless planes handed out may have been written untracked
+        self._hash: int|None = None if normalize or array._exposed \
+            else array._fingerprint
+
+
+    @property
+    def dim(self) -> int:
+        return self._array.dim
+
+    @property
+    def default(self) -> Any:
+        return self._array._default
+
+    @property
+    def normalized(self) -> bool:
+        return self._origin is not None
+
+    @property
+    def offset(self) -> int|tuple[int, ...]:
+        return self._array.offset
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        return self._array.shape
+
+    @property
+    def boundaries(self) -> Any:
+        return self._array.boundaries
+
+
+    def ndenumerate(self, boundaries: Any = None) -> Iterator:
+        return self._array.ndenumerate(boundaries)
+
+    def items_nondefault(self) -> Iterator:
+        # With normalization, the indices are relative to the origin
+        items: Iterator = self._array.items_nondefault()
+        if self._origin is None:
+            return items
+        if self.dim == 1:
+            return ((index - self._origin, value) for index, value in items)
+        return ((tuple(map(operator.sub, index, self._origin)), value)
+                    for index, value in items)
+
+    def tolist(self, boundaries: Any = None, *,
+               tuples: bool = False, stream: bool = False
+               ) -> list|tuple|Iterator:
+        return self._array.tolist(boundaries, tuples=tuples, stream=stream)
+
+    def thaw(self) -> Any: # Array1D|ArrayND
+        # Mutable copy; it is a snapshot as well
+        return self._array.snapshot()
+
+
+    def __getitem__(self, index: int|tuple[int, ...]) -> Any:
+        # Only cells can be read, planes of the copy are not exposed
+        if self.dim == 1:
+            if not isinstance(index, int):
+                raise TypeError('Index must be an integer')
+        elif not isinstance(index, tuple) or len(index) != self.dim \
+                or any(map(lambda x: not isinstance(x, int), index)):
+            raise TypeError(f'Index must be a {self.dim} element tuple of integers')
+        return self._array[index]
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        raise TypeError('Frozen arrays are immutable')
+
+    def __len__(self) -> int:
+        return len(self._array)
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = _digest(self.items_nondefault())
+        return self._hash
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Frozen):
+            return NotImplemented
+        if self is other:
+            return True
+        return self.dim == other.dim and self.default == other.default \
+            and self.normalized == other.normalized \
+            and hash(self) == hash(other) \
+            and dict(self.items_nondefault()) == dict(other.items_nondefault())
+
+    def __format__(self, format: str) -> str:
+        return self._array.__format__(format)
+
+    def __str__(self) -> str:
+        return str(self._array)
+
+    def __repr__(self) -> str:
+        return f'Frozen({self._array!r})'
+
+
+    def _values(self, region: Any) -> Iterator:
+        # Values of a region, as read by `paste`
+        return self._array._values(region)
+
+    @property
+    def _default(self) -> Any:
+        return self._array._default
+
+
+class Fingerprinted:
+    # Mixin of fingerprinting: the fingerprint is the XOR of the hashes of
+    # the (index, value) pairs of the non-default cells (Zobrist hashing).
+    # It is opt-in; while enabled, `__setitem__` updates it in O(1) by
+    # taking the old cell out and putting the new one in, so comparing
+    # states costs O(1) per step instead of rendering or scanning the whole
+    # array. Growing and trimming never change it, other resizing and
+    # restoring recompute it. Writes through planes got by an `int` index
+    # are not tracked. Hashes of strings differ between processes, so are
+    # the fingerprints.
+    __slots__ = ()
+    _fingerprint: int|None
+    # Arrays handing out their planes override this by a slot
+    _exposed: bool = False
+
+    @property
+    def fingerprint(self) -> int:
+        if self._fingerprint is None:
+            raise ValueError('Fingerprint is not enabled')
+        return self._fingerprint
+
+    def enable_fingerprint(self) -> None:
+        if self._fingerprint is None:
+            self._fingerprint = _digest(self.items_nondefault()) # type: ignore
+            self._rehook() # type: ignore
+
+    def disable_fingerprint(self) -> None:
+        self._fingerprint = None
+        self._rehook() # type: ignore
+
+    def freeze(self, normalize: bool = False) -> Frozen:
+        return Frozen(self, normalize)
+
+    def _rehash(self, index: Any, old: Any, new: Any) -> None:
+        # Replaces a cell in the fingerprint; default cells are not hashed
+        default: Any = self._default # type: ignore
+        digest: int = self._fingerprint # type: ignore
+        if old != default:
+            digest ^= hash((index, old))
+        if new != default:
+            digest ^= hash((index, new))
+        self._fingerprint = digest
+
+    def _invalidate_fingerprint(self) -> None:
+        # Resizing and restoring may change any of the cells
+        if self._fingerprint is not None:
+            self._fingerprint = _digest(self.items_nondefault()) # type: ignore
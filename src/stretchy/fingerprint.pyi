@@ -0,0 +1,34 @@
+from collections.abc import Iterator
+from typing import Any
+
+class Frozen:
+    def __init__(self, array: Any, normalize: bool = ...) -> None: ...
+    @property
+    def dim(self) -> int: ...
+    @property
+    def default(self) -> Any: ...
+    @property
+    def normalized(self) -> bool: ...
+    @property
+    def offset(self) -> Union[int, tuple[int, ...]]: ...
+    @property
+    def shape(self) -> tuple[int, ...]: ...
+    @property
+    def boundaries(self) -> Any: ...
+    def ndenumerate(self, boundaries: Any = ...) -> Iterator: ...
+    def items_nondefault(self) -> Iterator: ...
+    def tolist(self, boundaries: Any = ..., *, tuples: bool = ..., stream: bool = ...) -> Union[list, tuple, Iterator]: ...
+    def thaw(self) -> Any: ...
+    def __getitem__(self, index: Union[int, tuple[int, ...]]) -> Any: ...
+    def __setitem__(self, index: Any, value: Any) -> None: ...
+    def __len__(self) -> int: ...
+    def __hash__(self) -> int: ...
+    def __eq__(self, other: Any) -> bool: ...
+    def __format__(self, format: str) -> str: ...
+
+class Fingerprinted:
+    @property
+    def fingerprint(self) -> int: ...
+    def enable_fingerprint(self) -> None: ...
+    def disable_fingerprint(self) -> None: ...
+    def freeze(self, normalize: bool = ...) -> Frozen: ...
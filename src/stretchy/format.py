@@ -1,5 +1,6 @@
 #!/usr/bin/python3
 
+import itertools
 from collections.abc import Iterable
 from functools import partial
 from io import StringIO
@@ -29,6 +30,11 @@ def _valrepr_repr(item: Any, width: int) -> str:
 
 
 class Formatter:
+    # The settings are class-level defaults, overridden by subclasses or
+    # per instance (in the instance dictionary); only the state of the
+    # formatting is slotted
+    __slots__ = ('_default', '_maxwidth', '_output', '_valwidth', '_valrepr',
+                 '_palette', '_reprs', '__dict__')
     sep: str = ' '
     rowend: str = ''
     begin: str = ''
@@ -64,6 +70,9 @@ class Formatter:
     def reset(self) -> None:
         self._maxwidth: int = 0
         self._output: StringIO = StringIO()
+        # Palette of the last `codes_string` call and its entries as strings
+        self._palette: list|None = None
+        self._reprs: list[str] = []
 
     def update_maxwidth(self, content: Iterable) -> None:
         maxwidth: int = max(map(self._valwidth, content))
@@ -72,16 +81,66 @@ class Formatter:
     def update_maxwidth_default(self) -> None:
         self._maxwidth = max(self._maxwidth, self._valwidth(self._default))
 
-    def output_iter(self, content: Iterable) -> None:
-        self._output.write(self.begin)
+    def configure(self, other: 'Formatter') -> None:
+        # Takes the settings of another formatter, e.g. of a compiled one
+        self.sep = other.sep
+        self.rowend = other.rowend
+        self.begin = other.begin
+        self.end = other.end
+        self.index = other.index
+        self.arrange = other.arrange
+        self.index_format = other.index_format
+        self.literal = other.literal
+
+    def row_string(self, content: Iterable) -> str:
         if self.arrange:
             maxwidth = self._maxwidth
         else:
             maxwidth = 0
         valrepr = partial(self._valrepr, width=maxwidth)
-        itrepr: str = self.sep.join(map(valrepr, content))
-        self._output.write(itrepr)
-        self._output.write(self.end)
+        return self.begin + self.sep.join(map(valrepr, content)) + self.end
+
+    def output_iter(self, content: Iterable) -> None:
+        self._output.write(self.row_string(content))
+
+    def codes_string(self, codes: Iterable[int], values: list) -> str:
+        # Cells given by their codes in a palette of values; each entry of
+        # the palette is converted to string once per formatter
+        if self._palette is not values:
+            self._palette = values
+            self._reprs = []
+        if len(self._reprs) < len(values):
+            maxwidth: int = self._maxwidth if self.arrange else 0
+            self._reprs.extend(self._valrepr(value, maxwidth)
+                                   for value in values[len(self._reprs):])
+        return self.begin + self.sep.join(map(self._reprs.__getitem__, codes)) \
+            + self.end
+
+    def output_runs(self, runs: Iterable[tuple[Any, int]]) -> None:
+        # `(value, count)` pairs; each value is converted to string once
+        if self.arrange:
+            maxwidth = self._maxwidth
+        else:
+            maxwidth = 0
+        cells: Iterable[str] = itertools.chain.from_iterable(
+            itertools.repeat(self._valrepr(value, maxwidth), count)
+                for value, count in runs
+        )
+        self._output.write(self.begin + self.sep.join(cells) + self.end)
+
+    def output_row(self, row: Any, columns: tuple[int, int],
+                   indices: list[int]) -> None:
+        # Row of an N-dimensional array, padded with default values to the
+        # columns shown; rows convert themselves, as it depends on storage
+        self.output_string(row._rowstring(self, columns))
+
+    def padded(self, row: Any, columns: tuple[int, int]) -> Iterable:
+        low, high = row.boundaries
+        return itertools.chain(
+            itertools.repeat(self._default, low - columns[0]),
+            row,
+            itertools.repeat(self._default, columns[1] - high),
+        )
 
     def output_begin(self) -> None:
         self._output.write(self.begin)
@@ -150,12 +209,14 @@ class Formatter:
 
 
 class StrFormatter (Formatter):
+    __slots__ = ()
     begin = '['
     end = ']'
     arrange = True
 
 
 class ReprFormatter (Formatter):
+    __slots__ = ()
     sep = ', '
     rowend = ','
     begin = '['
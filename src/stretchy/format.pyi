@@ -19,7 +19,13 @@ class Formatter:
     def reset(self) -> None: ...
     def update_maxwidth(self, content: Iterable) -> None: ...
     def update_maxwidth_default(self) -> None: ...
+    def configure(self, other: Formatter) -> None: ...
+    def row_string(self, content: Iterable) -> str: ...
     def output_iter(self, content: Iterable) -> None: ...
+    def codes_string(self, codes: Iterable[int], values: list) -> str: ...
+    def output_runs(self, runs: Iterable[tuple[Any, int]]) -> None: ...
+    def output_row(self, row: Any, columns: tuple[int, int], indices: list[int]) -> None: ...
+    def padded(self, row: Any, columns: tuple[int, int]) -> Iterable: ...
     def output_begin(self) -> None: ...
     def output_end(self) -> None: ...
     def output_firstrow(self, indent: str, index: list[int] = ...) -> None: ...
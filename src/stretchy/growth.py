@@ -0,0 +1,19 @@
+#!/usr/bin/python3
+
+from typing import Callable
+
+# A growth policy gets the current capacity of one side of an axis and the
+# required one, and returns the capacity to be allocated
+GrowthPolicy = Callable[[int, int], int]
+
+
+def exact(capacity: int, required: int) -> int:
+    return required
+
+
+def geometric(factor: float = 2.0) -> GrowthPolicy:
+    if factor <= 1:
+        raise ValueError('Growth factor must be greater than 1')
+    def policy(capacity: int, required: int) -> int:
+        return max(required, int(capacity * factor))
+    return policy
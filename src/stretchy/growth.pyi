@@ -0,0 +1,6 @@
+from typing import Callable
+
+GrowthPolicy = Callable[[int, int], int]
+
+def exact(capacity: int, required: int) -> int: ...
+def geometric(factor: float = ...) -> GrowthPolicy: ...
@@ -0,0 +1,213 @@
+#!/usr/bin/python3
+
+from bisect import bisect_left
+from typing import Any, NamedTuple
+from collections.abc import Iterable
+
+
+class Change(NamedTuple):
+    index: Any # int|tuple[int, ...]
+    old: Any
+    new: Any
+
+
+class Grow(NamedTuple):
+    # write beyond the boundaries, and the boundaries of the first axis of
+    # the planes along the path of the cell before it
+    change: Change
+    bounds: tuple[tuple[int, int], ...]
+
+
+class Resize(NamedTuple):
+    # snapshots of the array taken before and after the operation
+    before: Any
+    after: Any
+
+
+class Journal:
+    def __init__(self) -> None:
+        self._entries: list[Change|Grow|Resize] = []
+        # Serial numbers identify entries for checkpoints; they keep
+        # increasing even if undone entries are discarded
+        self._serials: list[int] = []
+        self._serial: int = 0
+        self._position: int = 0
+
+    @property
+    def position(self) -> int:
+        return self._position
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def record(self, entry: Change|Grow|Resize) -> None:
+        # A new entry discards the undone ones
+        del self._entries[self._position:]
+        del self._serials[self._position:]
+        self._serial += 1
+        self._entries.append(entry)
+        self._serials.append(self._serial)
+        self._position += 1
+
+    def checkpoint(self) -> int:
+        return self._serials[self._position - 1] if self._position else 0
+
+    def undo(self, array: Any, steps: int = 1) -> int:
+        done: int = 0
+        while done < steps and self._position > 0:
+            self._position -= 1
+            entry = self._entries[self._position]
+            if isinstance(entry, Change):
+                array[entry.index] = entry.old
+            elif isinstance(entry, Grow):
+                array[entry.change.index] = entry.change.old
+                array._shrink(entry.change.index, entry.bounds)
+            else:
+                array._restore(entry.before)
+            done += 1
+        return done
+
+    def redo(self, array: Any, steps: int = 1) -> int:
+        done: int = 0
+        while done < steps and self._position < len(self._entries):
+            entry = self._entries[self._position]
+            if isinstance(entry, Change):
+                array[entry.index] = entry.new
+            elif isinstance(entry, Grow):
+                array[entry.change.index] = entry.change.new
+            else:
+                array._restore(entry.after)
+            self._position += 1
+            done += 1
+        return done
+
+    def rollback(self, array: Any, checkpoint: int) -> None:
+        position: int = 0
+        if checkpoint:
+            position = bisect_left(self._serials, checkpoint)
+            if position == len(self._serials) \
+                    or self._serials[position] != checkpoint:
+                raise ValueError('Checkpoint has been discarded from the journal')
+            position += 1
+        if position < self._position:
+            self.undo(array, self._position - position)
+        else:
+            self.redo(array, position - self._position)
+
+
+class Journaled:
+    # Mixin of the journal related methods of the arrays. Undo and redo
+    # use the arrays' own `__setitem__` while the journal is detached.
+    __slots__ = ()
+    _journal: Journal|None
+
+    @property
+    def journal(self) -> Journal|None:
+        return self._journal
+
+    def enable_journal(self) -> None:
+        if self._journal is None:
+            self._journal = Journal()
+            self._rehook() # type: ignore
+
+    def disable_journal(self) -> None:
+        self._journal = None
+        self._rehook() # type: ignore
+
+    def checkpoint(self) -> int:
+        return self._journaled().checkpoint()
+
+    def undo(self, steps: int = 1) -> int:
+        journal = self._journaled()
+        self._journal = None
+        try:
+            return journal.undo(self, steps)
+        finally:
+            self._journal = journal
+
+    def redo(self, steps: int = 1) -> int:
+        journal = self._journaled()
+        self._journal = None
+        try:
+            return journal.redo(self, steps)
+        finally:
+            self._journal = journal
+
+    def rollback(self, checkpoint: int) -> None:
+        journal = self._journaled()
+        self._journal = None
+        try:
+            journal.rollback(self, checkpoint)
+        finally:
+            self._journal = journal
+
+    def diff(self, other: Any) -> list[Change]:
+        if other.dim != self.dim: # type: ignore
+            raise ValueError('Arrays must have the same number of dimensions')
+        boundaries: Any
+        if self.dim == 1: # type: ignore
+            (low1, high1), (low2, high2) = self.boundaries, other.boundaries # type: ignore
+            boundaries = (min(low1, low2), max(high1, high2))
+        else:
+            boundaries = tuple(
+                (min(low1, low2), max(high1, high2))
+                    for (low1, high1), (low2, high2)
+                        in zip(self.boundaries, other.boundaries) # type: ignore
+            )
+        return [
+            Change(index, old, new)
+                for (index, old), (_, new) in zip(
+                    self.ndenumerate(boundaries), other.ndenumerate(boundaries) # type: ignore
+                )
+                    if old != new
+        ]
+
+    def apply_patch(self, patch: Iterable[Change], reverse: bool = False) -> None:
+        for index, old, new in patch:
+            self[index] = old if reverse else new # type: ignore
+
+    def _journaled(self) -> Journal:
+        if self._journal is None:
+            raise ValueError('Journal is not enabled')
+        return self._journal
+
+    def _record(self, index: Any, value: Any) -> None:
+        # A write beyond the boundaries of any of the planes along the path
+        # of the cell grows them, so their boundaries are recorded as well
+        change: Change = Change(index, self[index], value) # type: ignore
+        bounds: list[tuple[int, int]] = []
+        grows: bool = False
+        plane: Any = self
+        for i in index if isinstance(index, tuple) else (index,):
+            low, high = (0, 0) if plane is None \
+                else (-plane._neglen, plane._poslen)
+            bounds.append((low, high))
+            inside: bool = low <= i < high
+            grows = grows or not inside
+            plane = plane._getplane(i, create=False) \
+                if inside and plane.dim > 1 else None
+        assert self._journal is not None
+        self._journal.record(Grow(change, tuple(bounds)) if grows else change)
+
+    def _shrink(self, index: Any, bounds: tuple[tuple[int, int], ...]) -> None:
+        # Undo of the growth of a write: the planes along the path of the
+        # cell are cropped back, the deepest first. Only default cells are
+        # dropped; the planes are owned, as the cell has just been written.
+        planes: list[Any] = [self]
+        if isinstance(index, tuple):
+            for i in index[:-1]:
+                planes.append(planes[-1]._getplane(i))
+        for plane, (low, high) in reversed(list(zip(planes, bounds))):
+            if plane.dim == 1:
+                plane.crop_to((low, high))
+            else:
+                plane._shorten(low, high)
+        self._invalidate_rendering() # type: ignore
+
+    def _begin_resize(self) -> Any:
+        return self.snapshot() if self._journal is not None else None # type: ignore
+
+    def _end_resize(self, before: Any) -> None:
+        if before is not None:
+            assert self._journal is not None
+            self._journal.record(Resize(before, self.snapshot())) # type: ignore
@@ -0,0 +1,38 @@
+from collections.abc import Iterable
+from typing import Any, NamedTuple
+
+class Change(NamedTuple):
+    index: Any
+    old: Any
+    new: Any
+
+class Grow(NamedTuple):
+    change: Change
+    bounds: tuple[tuple[int, int], ...]
+
+class Resize(NamedTuple):
+    before: Any
+    after: Any
+
+class Journal:
+    def __init__(self) -> None: ...
+    @property
+    def position(self) -> int: ...
+    def __len__(self) -> int: ...
+    def record(self, entry: Union[Change, Grow, Resize]) -> None: ...
+    def checkpoint(self) -> int: ...
+    def undo(self, array: Any, steps: int = ...) -> int: ...
+    def redo(self, array: Any, steps: int = ...) -> int: ...
+    def rollback(self, array: Any, checkpoint: int) -> None: ...
+
+class Journaled:
+    @property
+    def journal(self) -> Union[Journal, None]: ...
+    def enable_journal(self) -> None: ...
+    def disable_journal(self) -> None: ...
+    def checkpoint(self) -> int: ...
+    def undo(self, steps: int = ...) -> int: ...
+    def redo(self, steps: int = ...) -> int: ...
+    def rollback(self, checkpoint: int) -> None: ...
+    def diff(self, other: Any) -> list[Change]: ...
+    def apply_patch(self, patch: Iterable[Change], reverse: bool = ...) -> None: ...
@@ -0,0 +1,331 @@
+#!/usr/bin/python3
+
+import itertools
+import operator
+from collections.abc import Callable, Iterator
+from typing import Any
+
+from .fingerprint import Frozen
+from .views import View
+
+
+Region = tuple[tuple[int, int], ...]
+
+# No default value given for the result
+_UNDEFINED: Any = object()
+
+
+class Expression:
+    # Element-wise operation of arrays, evaluated lazily. Operators build a
+    # tree of expressions; the result is computed in a single pass over
+    # the union of the boundaries of the arrays, row by row, chaining the
+    # operations as iterators, so no temporary arrays are created. The
+    # default value of the result is the expression of the default values,
+    # so rows (and the parts of rows) where all the arrays hold their
+    # default value are skipped; if the operations fail on the default
+    # values, all the cells of the region are computed instead, and the
+    # default value of the result is None. The operand arrays are
+    # snapshots taken when the expression is built; the result is computed
+    # once, on `evaluate()` or when it is read.
+    __slots__ = ('_op', '_operands', '_dim', '_result')
+
+    def __init__(self, op: Callable|None, operands: tuple) -> None:
+        # A leaf has no operation and an array as its only operand; the
+        # operands of the other nodes are expressions or constants
+        self._op: Callable|None = op
+        self._operands: tuple = operands
+        dims: set[int] = {operand._dim if isinstance(operand, Expression)
+                              else operand.dim
+                              for operand in operands
+                                  if op is None or isinstance(operand, Expression)}
+        if len(dims) != 1:
+            raise ValueError('Arrays must have the same number of dimensions')
+        self._dim: int = dims.pop()
+        self._result: Any = None
+
+
+    @property
+    def dim(self) -> int:
+        return self._dim
+
+    @property
+    def default(self) -> Any:
+        return self._cell(lambda array: array._default)
+
+    @property
+    def offset(self) -> int|tuple[int, ...]:
+        region: Region = self._region()
+        return region[0][0] if self._dim == 1 else tuple(low for low, _ in region)
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        return tuple(high - low for low, high in self._region())
+
+    @property
+    def boundaries(self) -> Any:
+        # Inferred without evaluating the expression
+        region: Region = self._region()
+        return region[0] if self._dim == 1 else region
+
+
+    def map(self, function: Callable[[Any], Any]) -> 'Expression':
+        # Applies a function of one value to each cell
+        return Expression(function, (self,))
+
+    def evaluate(self, default: Any = _UNDEFINED) -> Any: # Array1D|ArrayND
+        # A given default value is trusted to be the expression of the
+        # default values; that result is not kept
+        if default is not _UNDEFINED:
+            return self._evaluate(default)
+        if self._result is None:
+            self._result = self._evaluate()
+        return self._result
+
+    def ndenumerate(self, boundaries: Any = None) -> Iterator:
+        return self.evaluate().ndenumerate(boundaries)
+
+    def items_nondefault(self) -> Iterator:
+        return self.evaluate().items_nondefault()
+
+    def tolist(self, boundaries: Any = None, *,
+               tuples: bool = False, stream: bool = False
+               ) -> list|tuple|Iterator:
+        return self.evaluate().tolist(boundaries, tuples=tuples, stream=stream)
+
+
+    def __add__(self, other: Any) -> 'Expression':
+        return _combine(operator.add, self, other)
+
+    def __radd__(self, other: Any) -> 'Expression':
+        return _combine(operator.add, other, self)
+
+    def __sub__(self, other: Any) -> 'Expression':
+        return _combine(operator.sub, self, other)
+
+    def __rsub__(self, other: Any) -> 'Expression':
+        return _combine(operator.sub, other, self)
+
+    def __mul__(self, other: Any) -> 'Expression':
+        return _combine(operator.mul, self, other)
+
+    def __rmul__(self, other: Any) -> 'Expression':
+        return _combine(operator.mul, other, self)
+
+    def __truediv__(self, other: Any) -> 'Expression':
+        return _combine(operator.truediv, self, other)
+
+    def __rtruediv__(self, other: Any) -> 'Expression':
+        return _combine(operator.truediv, other, self)
+
+    def __floordiv__(self, other: Any) -> 'Expression':
+        return _combine(operator.floordiv, self, other)
+
+    def __rfloordiv__(self, other: Any) -> 'Expression':
+        return _combine(operator.floordiv, other, self)
+
+    def __mod__(self, other: Any) -> 'Expression':
+        return _combine(operator.mod, self, other)
+
+    def __rmod__(self, other: Any) -> 'Expression':
+        return _combine(operator.mod, other, self)
+
+    def __pow__(self, other: Any) -> 'Expression':
+        return _combine(operator.pow, self, other)
+
+    def __rpow__(self, other: Any) -> 'Expression':
+        return _combine(operator.pow, other, self)
+
+    def __and__(self, other: Any) -> 'Expression':
+        return _combine(operator.and_, self, other)
+
+    def __rand__(self, other: Any) -> 'Expression':
+        return _combine(operator.and_, other, self)
+
+    def __or__(self, other: Any) -> 'Expression':
+        return _combine(operator.or_, self, other)
+
+    def __ror__(self, other: Any) -> 'Expression':
+        return _combine(operator.or_, other, self)
+
+    def __xor__(self, other: Any) -> 'Expression':
+        return _combine(operator.xor, self, other)
+
+    def __rxor__(self, other: Any) -> 'Expression':
+        return _combine(operator.xor, other, self)
+
+    # Comparisons are element-wise as well, so expressions are not hashable
+    def __eq__(self, other: Any) -> 'Expression': # type: ignore
+        return _combine(operator.eq, self, other)
+
+    def __ne__(self, other: Any) -> 'Expression': # type: ignore
+        return _combine(operator.ne, self, other)
+
+    def __lt__(self, other: Any) -> 'Expression':
+        return _combine(operator.lt, self, other)
+
+    def __le__(self, other: Any) -> 'Expression':
+        return _combine(operator.le, self, other)
+
+    def __gt__(self, other: Any) -> 'Expression':
+        return _combine(operator.gt, self, other)
+
+    def __ge__(self, other: Any) -> 'Expression':
+        return _combine(operator.ge, self, other)
+
+    def __neg__(self) -> 'Expression':
+        return Expression(operator.neg, (self,))
+
+    def __pos__(self) -> 'Expression':
+        return Expression(operator.pos, (self,))
+
+    def __abs__(self) -> 'Expression':
+        return Expression(operator.abs, (self,))
+
+    def __invert__(self) -> 'Expression':
+        return Expression(operator.invert, (self,))
+
+    def __bool__(self) -> bool:
+        raise TypeError('The truth value of an expression is ambiguous, '
+                        'evaluate it first')
+
+    def __getitem__(self, index: int|tuple[int, ...]) -> Any:
+        # A single cell is computed from the cells of the arrays
+        if self._dim == 1:
+            if not isinstance(index, int):
+                raise TypeError('Index must be an integer')
+        elif not isinstance(index, tuple) or len(index) != self._dim \
+                or any(map(lambda x: not isinstance(x, int), index)):
+            raise TypeError(f'Index must be a {self._dim} element tuple of integers')
+        if self._result is not None:
+            return self._result[index]
+        return self._cell(lambda array: array[index])
+
+    def __iter__(self) -> Iterator:
+        return iter(self.evaluate())
+
+    def __len__(self) -> int:
+        low, high = self._region()[0]
+        return high - low
+
+    def __format__(self, format: str) -> str:
+        return self.evaluate().__format__(format)
+
+    def __str__(self) -> str:
+        return str(self.evaluate())
+
+    def __repr__(self) -> str:
+        return f'Expression(dim={self._dim}, boundaries={self.boundaries})'
+
+
+    def _values(self, region: Any) -> Iterator:
+        # Values of a region, as read by `paste`
+        return self.evaluate()._values(region)
+
+    @property
+    def _default(self) -> Any:
+        return self.evaluate()._default
+
+    def _leaves(self) -> Iterator[Any]:
+        if self._op is None:
+            yield self._operands[0]
+            return
+        for operand in self._operands:
+            if isinstance(operand, Expression):
+                yield from operand._leaves()
+
+    def _region(self) -> Region:
+        # Union of the boundaries of the arrays; empty arrays are ignored
+        region: list[tuple[int, int]]|None = None
+        for array in self._leaves():
+            bounds: Region = array._region(None)
+            if any(low >= high for low, high in bounds):
+                continue
+            region = list(bounds) if region is None else [
+                (min(low1, low2), max(high1, high2))
+                    for (low1, high1), (low2, high2) in zip(region, bounds)]
+        return ((0, 0),) * self._dim if region is None else tuple(region)
+
+    def _cell(self, read: Callable[[Any], Any]) -> Any:
+        # Value of the expression, reading the arrays by the function
+        if self._op is None:
+            return read(self._operands[0])
+        return self._op(*(operand._cell(read)
+                              if isinstance(operand, Expression) else operand
+                              for operand in self._operands))
+
+    def _stream(self, rows: Iterator, low: int, high: int) -> Iterator:
+        # Values of the expression in the columns of a row, as a chain of
+        # iterators; `rows` yields the rows of the leaves in order, None
+        # for missing rows
+        if self._op is None:
+            row: Any = next(rows)
+            if row is None:
+                return itertools.repeat(self._operands[0]._default, high - low)
+            return row._values(((low, high),))
+        return map(self._op, *(operand._stream(rows, low, high)
+                                   if isinstance(operand, Expression)
+                                   else itertools.repeat(operand)
+                               for operand in self._operands))
+
+    def _evaluate(self, default: Any = _UNDEFINED) -> Any: # Array1D|ArrayND
+        region: Region = self._region()
+        leaves: list[Any] = list(self._leaves())
+        dense: bool = False
+        if default is _UNDEFINED:
+            try:
+                default = self.default
+            except Exception:
+                # Undefined on the default values (e.g. a division by a
+                # zero default): no cell can be skipped
+                default, dense = None, True
+        result: Any = leaves[0]._plain(default)
+        if any(low >= high for low, high in region):
+            return result
+        # The result covers the region, even if its corners are default
+        result[result._index(low for low, _ in region)] = result._default
+        result[result._index(high - 1 for _, high in region)] = result._default
+        base, limit = region[-1]
+        for prefix in itertools.product(*(range(*b) for b in region[:-1])):
+            rows: list[Any] = [leaf._rowat(prefix) for leaf in leaves]
+            if dense:
+                result._pasterow(prefix, base,
+                                 list(self._stream(iter(rows), base, limit)))
+                continue
+            # Outside the rows of the arrays, all their cells are default
+            columns: list[tuple[int, int]] = [row.boundaries for row in rows
+                                                  if row is not None and row]
+            if not columns:
+                continue
+            low: int = max(base, min(low for low, _ in columns))
+            high: int = min(limit, max(high for _, high in columns))
+            if low < high:
+                result._pasterow(prefix, low,
+                                 list(self._stream(iter(rows), low, high)))
+        return result
+
+
+def _operand(value: Any) -> Any:
+    # Arrays (and views and frozen arrays) become leaves, other values are
+    # constants
+    if isinstance(value, Expression):
+        return value
+    if isinstance(value, View):
+        value = value.materialize()
+    elif isinstance(value, Frozen):
+        value = value.thaw()
+    if isinstance(value, Lazy):
+        return Expression(None, (value.snapshot(),)) # type: ignore
+    return value
+
+
+def _combine(op: Callable[[Any, Any], Any], left: Any, right: Any) -> Expression:
+    return Expression(op, (_operand(left), _operand(right)))
+
+
+class Lazy:
+    # Mixin of lazy element-wise operations: `lazy()` returns the array as
+    # an expression, operators on it build expressions
+    __slots__ = ()
+
+    def lazy(self) -> Expression:
+        return _operand(self)
@@ -0,0 +1,62 @@
+from .fingerprint import Frozen as Frozen
+from .views import View as View
+from collections.abc import Callable, Iterator
+from typing import Any
+
+Region = tuple[tuple[int, int], ...]
+
+class Expression:
+    def __init__(self, op: Union[Callable, None], operands: tuple) -> None: ...
+    @property
+    def dim(self) -> int: ...
+    @property
+    def default(self) -> Any: ...
+    @property
+    def offset(self) -> Union[int, tuple[int, ...]]: ...
+    @property
+    def shape(self) -> tuple[int, ...]: ...
+    @property
+    def boundaries(self) -> Any: ...
+    def map(self, function: Callable[[Any], Any]) -> Expression: ...
+    def evaluate(self, default: Any = ...) -> Any: ...
+    def ndenumerate(self, boundaries: Any = ...) -> Iterator: ...
+    def items_nondefault(self) -> Iterator: ...
+    def tolist(self, boundaries: Any = ..., *, tuples: bool = ..., stream: bool = ...) -> Union[list, tuple, Iterator]: ...
+    def __add__(self, other: Any) -> Expression: ...
+    def __radd__(self, other: Any) -> Expression: ...
+    def __sub__(self, other: Any) -> Expression: ...
+    def __rsub__(self, other: Any) -> Expression: ...
+    def __mul__(self, other: Any) -> Expression: ...
+    def __rmul__(self, other: Any) -> Expression: ...
+    def __truediv__(self, other: Any) -> Expression: ...
+    def __rtruediv__(self, other: Any) -> Expression: ...
+    def __floordiv__(self, other: Any) -> Expression: ...
+    def __rfloordiv__(self, other: Any) -> Expression: ...
+    def __mod__(self, other: Any) -> Expression: ...
+    def __rmod__(self, other: Any) -> Expression: ...
+    def __pow__(self, other: Any) -> Expression: ...
+    def __rpow__(self, other: Any) -> Expression: ...
+    def __and__(self, other: Any) -> Expression: ...
+    def __rand__(self, other: Any) -> Expression: ...
+    def __or__(self, other: Any) -> Expression: ...
+    def __ror__(self, other: Any) -> Expression: ...
+    def __xor__(self, other: Any) -> Expression: ...
+    def __rxor__(self, other: Any) -> Expression: ...
+    def __eq__(self, other: Any) -> Expression: ...  # type: ignore
+    def __ne__(self, other: Any) -> Expression: ...  # type: ignore
+    def __lt__(self, other: Any) -> Expression: ...
+    def __le__(self, other: Any) -> Expression: ...
+    def __gt__(self, other: Any) -> Expression: ...
+    def __ge__(self, other: Any) -> Expression: ...
+    def __neg__(self) -> Expression: ...
+    def __pos__(self) -> Expression: ...
+    def __abs__(self) -> Expression: ...
+    def __invert__(self) -> Expression: ...
+    def __bool__(self) -> bool: ...
+    def __getitem__(self, index: Union[int, tuple[int, ...]]) -> Any: ...
+    def __iter__(self) -> Iterator: ...
+    def __len__(self) -> int: ...
+    def __format__(self, format: str) -> str: ...
+
+class Lazy:
+    def lazy(self) -> Expression: ...
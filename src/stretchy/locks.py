@@ -0,0 +1,19 @@
+#!/usr/bin/python3
+
+import itertools
+import threading
+
+
+class Locks:
+    # Locks of a thread-safe array shared by all of its planes: `growth` is
+    # held while the structure (the list of planes) changes, and each row is
+    # protected by one of the striped locks when written or resized.
+    def __init__(self, stripes: int = 16) -> None:
+        self.growth: threading.RLock = threading.RLock()
+        self._stripes: list[threading.Lock] = \
+            [threading.Lock() for _ in range(stripes)]
+        self._next: itertools.count = itertools.count()
+
+    def stripe(self) -> threading.Lock:
+        # Rows get their stripes in round-robin order
+        return self._stripes[next(self._next) % len(self._stripes)]
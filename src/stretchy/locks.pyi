@@ -0,0 +1,6 @@
+import threading
+
+class Locks:
+    growth: threading.RLock
+    def __init__(self, stripes: int = ...) -> None: ...
+    def stripe(self) -> threading.Lock: ...
@@ -0,0 +1,48 @@
+#!/usr/bin/python3
+
+import sys
+from abc import ABC, abstractmethod
+from typing import Any
+
+CATEGORIES: tuple[str, ...] = (
+    'container', # the array object itself
+    'planes',    # plane objects of N-dimensional arrays
+    'lists',     # backing lists of the cells and planes, with capacity
+    'cells',     # distinct objects referenced by the cells
+)
+
+
+def _objsize(obj: Any) -> int:
+    # Size of an object including its attribute dictionary, if it has one
+    size: int = sys.getsizeof(obj)
+    if hasattr(obj, '__dict__'):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+class Measured(ABC):
+    # Mixin of memory accounting. Objects referenced by several cells (or
+    # by the cells of several planes) are counted once.
+    __slots__ = ()
+
+    def memory_usage(self, deep: bool = True,
+                     payload: bool = False) -> dict[str, int]:
+        usage: dict[str, int] = dict.fromkeys(CATEGORIES, 0)
+        usage['container'] = _objsize(self)
+        self._memory(usage, deep, set() if payload else None)
+        usage['total'] = sum(usage.values())
+        return usage
+
+    @abstractmethod
+    def _memory(self, usage: dict[str, int], deep: bool,
+                seen: set[int]|None) -> None:
+        # Adds the memory of the storage to the categories of `usage`
+        ...
+
+    @staticmethod
+    def _memory_cells(usage: dict[str, int], cells: list,
+                      seen: set[int]) -> None:
+        for cell in cells:
+            if id(cell) not in seen:
+                seen.add(id(cell))
+                usage['cells'] += sys.getsizeof(cell)
@@ -0,0 +1,5 @@
+from abc import ABC
+CATEGORIES: tuple[str, ...]
+
+class Measured(ABC):
+    def memory_usage(self, deep: bool = ..., payload: bool = ...) -> dict[str, int]: ...
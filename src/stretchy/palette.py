@@ -0,0 +1,313 @@
+#!/usr/bin/python3
+
+import itertools
+import sys
+import threading
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Any
+
+from .array1d import Array1D, Boundaries
+from .arraynd import ArrayND
+from .format import Formatter, ReprFormatter
+from .growth import GrowthPolicy, exact
+
+
+class Palette:
+    # Distinct values of an array, identified by equality (so they must be
+    # hashable); code 0 is the default value. Entries are never removed, so
+    # codes keep their meaning in all the rows and snapshots sharing it.
+    __slots__ = ('_values', '_codes', '_lock')
+
+    def __init__(self, default: Any = None) -> None:
+        self._values: list = [default]
+        self._codes: dict[Any, int] = {default: 0}
+        self._lock: threading.Lock = threading.Lock()
+
+    @property
+    def values(self) -> tuple:
+        return tuple(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def encode(self, value: Any) -> int:
+        code: int|None = self._codes.get(value)
+        if code is None:
+            with self._lock:
+                code = self._codes.get(value)
+                if code is None:
+                    code = len(self._values)
+                    if code > 0xffff:
+                        raise ValueError('Palettes can hold at most 65536 values')
+                    self._values.append(value)
+                    self._codes[value] = code
+        return code
+
+
+class PaletteArray1D(Array1D):
+    # One-dimensional array storing a code of a palette per cell. The
+    # backing lists are arrays of unsigned bytes, widened to 16 bits once a
+    # code does not fit in a byte. Spare capacity holds 0, the default.
+    __slots__ = ('_palette',)
+
+    def __init__(self,
+            default: Any = None,
+            *,
+            palette: Palette|None = None,
+            content: Iterable|None = None,
+            offset: int = 0,
+            threadsafe: bool = False,
+            growth: GrowthPolicy = exact
+            ) -> None:
+        if palette is None:
+            palette = Palette(default)
+        elif palette._values[0] != default:
+            raise ValueError('The default value must be the first one of the palette')
+        self._palette: Palette = palette
+        super().__init__(default, threadsafe=threadsafe, growth=growth)
+        self._pos: array = array('B') # type: ignore
+        self._neg: array = array('B') # type: ignore
+        if content is not None:
+            self.replace_content(content, offset)
+
+
+    @property
+    def palette(self) -> Palette:
+        return self._palette
+
+
+    def snapshot(self) -> 'PaletteArray1D':
+        clone: PaletteArray1D = PaletteArray1D(self._default,
+            palette=self._palette, threadsafe=self._lock is not None,
+            growth=self._growth)
+        clone._pos = self._pos
+        clone._neg = self._neg
+        clone._poslen = self._poslen
+        clone._neglen = self._neglen
+        clone._shared = self._shared = True
+        return clone
+
+    def replace_content(self, content: Iterable, offset: int = 0) -> None:
+        with self._guard():
+            before = self._begin_resize()
+            codes: list[int] = list(map(self._palette.encode, content))
+            typecode: str = 'H' if codes and max(codes) > 0xff else 'B'
+            if offset >= 0:
+                self._neg = array(typecode)
+                self._pos = array(typecode, itertools.chain(
+                    itertools.repeat(0, offset), codes))
+            else:
+                # The cells before the origin are stored in reverse order
+                head: list[int] = codes[:-offset]
+                head.reverse()
+                self._neg = array(typecode, itertools.chain(
+                    itertools.repeat(0, -offset - len(head)), head))
+                self._pos = array(typecode, codes[-offset:])
+            self._poslen = len(self._pos)
+            self._neglen = len(self._neg)
+            self._shared = False
+            self._end_resize(before)
+            self._invalidate_rendering()
+            self._invalidate_fingerprint()
+
+    def trim(self) -> None:
+        with self._guard():
+            before = self._begin_resize()
+            if self._shared:
+                self._unshare()
+            cells: int = len(self)
+            del self._pos[self._poslen:]
+            del self._neg[self._neglen:]
+            while self._pos and self._pos[-1] == 0:
+                self._pos.pop()
+            while self._neg and self._neg[-1] == 0:
+                self._neg.pop()
+            self._poslen = len(self._pos)
+            self._neglen = len(self._neg)
+            if self._stats is not None:
+                self._stats.count('cells_freed', cells - len(self))
+            self._end_resize(before)
+            self._invalidate_rendering()
+
+
+    def __setitem__(self, index: int|slice, value: Any) -> None:
+        if isinstance(index, slice):
+            super().__setitem__(index, value)
+            return
+        code: int = self._palette.encode(value)
+        with self._guard():
+            if self._journal is not None:
+                self._record(index, value)
+            if self._fingerprint is not None:
+                self._rehash(index, self[index], value)
+            if self._renderer is not None:
+                self._renderer._touch(())
+            if self._shared:
+                self._unshare()
+            self._widen(code)
+            if index >= 0:
+                if self._poslen <= index:
+                    if len(self._pos) <= index:
+                        self._extend(self._pos,
+                            self._growth(len(self._pos), index + 1),
+                            'cells_added_positive')
+                    self._poslen = index + 1
+                self._pos[index] = code
+            else:
+                index = -index - 1
+                if self._neglen <= index:
+                    if len(self._neg) <= index:
+                        self._extend(self._neg,
+                            self._growth(len(self._neg), index + 1),
+                            'cells_added_negative')
+                    self._neglen = index + 1
+                self._neg[index] = code
+
+    def __getitem__(self, index: int|slice) -> Any:
+        if isinstance(index, slice):
+            return super().__getitem__(index)
+        if index >= 0:
+            if len(self._pos) <= index:
+                return self._default
+            return self._palette._values[self._pos[index]]
+        index = -index - 1
+        if len(self._neg) <= index:
+            return self._default
+        return self._palette._values[self._neg[index]]
+
+    def __iter__(self) -> Iterator: # type: ignore
+        return self._values((self.boundaries,))
+
+    def __repr__(self) -> str:
+        repr_string: str = self._format(ReprFormatter(self._default))
+        return f'PaletteArray1D(default={self._default!r}, ' \
+            f'offset={self.offset}, content={repr_string})'
+
+
+    def _unshare(self) -> None:
+        self._pos = self._pos[:]
+        self._neg = self._neg[:]
+        self._shared = False
+
+    def _extend(self, part: list, size: int, event: str) -> None:
+        # Extends a backing array with code 0 to the given capacity
+        if self._stats is not None:
+            self._stats.count('grow_events')
+            self._stats.count(event, size - len(part))
+        part.frombytes(bytes((size - len(part)) * part.itemsize)) # type: ignore
+
+    def _widen(self, code: int) -> None:
+        # Codes above 255 need 16-bit backing arrays
+        if code > 0xff and self._pos.typecode == 'B':
+            self._pos = array('H', self._pos)
+            self._neg = array('H', self._neg)
+
+    def _segment(self, value: Any, size: int) -> array: # type: ignore
+        code: int = self._palette.encode(value)
+        self._widen(code)
+        return array(self._pos.typecode, [code]) * size
+
+    def _stored(self, values: list) -> array: # type: ignore
+        codes: list[int] = list(map(self._palette.encode, values))
+        if codes:
+            self._widen(max(codes))
+        return array(self._pos.typecode, codes)
+
+    def _memory(self, usage: dict[str, int], deep: bool,
+                seen: set[int]|None) -> None:
+        usage['lists'] += sys.getsizeof(self._pos) + sys.getsizeof(self._neg)
+        if seen is not None:
+            values: list = self._palette._values
+            self._memory_cells(usage, [values[code] for code in self._used()],
+                               seen)
+
+    def _codes(self, boundaries: tuple[int, int]) -> Iterator[int]:
+        # Codes of the given range, padded with 0
+        low, high = boundaries
+        neg_len: int = len(self._neg)
+        pos_len: int = len(self._pos)
+        parts: list[Iterable[int]] = []
+        if low < -neg_len:
+            parts.append(itertools.repeat(0, min(high, -neg_len) - low))
+            low = -neg_len
+        if low < 0 and low < high:
+            parts.append(reversed(self._neg[-min(high, 0):-low]))
+            low = 0
+        if low < pos_len and low < high:
+            parts.append(self._pos[low:high])
+            low = pos_len
+        if low < high:
+            parts.append(itertools.repeat(0, high - low))
+        return itertools.chain.from_iterable(parts)
+
+    def _used(self) -> set[int]:
+        # Codes occurring within the boundaries
+        return set(self._pos[:self._poslen]) | set(self._neg[:self._neglen])
+
+    def _values(self, boundaries: Boundaries) -> Iterator:
+        return map(self._palette._values.__getitem__, self._codes(boundaries[0]))
+
+    def _maxwidth(self, formatter: Formatter, boundaries: Boundaries) -> None:
+        # Widths are computed once per palette entry in use
+        if len(self):
+            values: list = self._palette._values
+            formatter.update_maxwidth([values[code] for code in self._used()])
+        if boundaries[0][0] < -self._neglen \
+                or boundaries[0][1] > self._poslen:
+            formatter.update_maxwidth_default()
+
+    def _rowstring(self, formatter: Formatter, columns: tuple[int, int]) -> str:
+        return formatter.codes_string(self._codes(columns), self._palette._values)
+
+    def _format(self, formatter: Formatter) -> str:
+        if self._stats is not None:
+            self._stats.count('cells_rendered', len(self))
+        self._maxwidth(formatter, (self.boundaries,))
+        formatter.output_string(self._rowstring(formatter, self.boundaries))
+        return formatter.output
+
+
+class PaletteArrayND(ArrayND):
+    # N-dimensional array, its rows are PaletteArray1D objects sharing the
+    # palette of the array
+    __slots__ = ('_palette',)
+
+    def __init__(self,
+            dim: int,
+            default: Any = None,
+            *,
+            palette: Palette|None = None,
+            content: Sequence|None = None,
+            offset: tuple[int,...]|list[int]|int = 0,
+            threadsafe: bool = False,
+            growth: GrowthPolicy = exact
+            ) -> None:
+        if palette is None:
+            palette = Palette(default)
+        elif palette._values[0] != default:
+            raise ValueError('The default value must be the first one of the palette')
+        self._palette: Palette = palette
+        super().__init__(dim, default, content=content, offset=offset,
+                         threadsafe=threadsafe, growth=growth)
+
+
+    @property
+    def palette(self) -> Palette:
+        return self._palette
+
+
+    def __repr__(self) -> str:
+        repr_string: str = self._format(ReprFormatter(self._default))
+        if repr_string != '[]':
+            repr_string = '\n' + repr_string
+        return f'PaletteArrayND(dim={self._dim}, default={self._default!r}, ' \
+            f'offset={self.offset}, content={repr_string})'
+
+
+    def _like(self, dim: int, threadsafe: bool = False) -> Any: # Self|PaletteArray1D
+        if dim == 1:
+            return PaletteArray1D(self._default, palette=self._palette,
+                                  threadsafe=threadsafe, growth=self._growth)
+        return PaletteArrayND(dim, self._default, palette=self._palette,
+                              threadsafe=threadsafe, growth=self._growth)
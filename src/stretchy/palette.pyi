@@ -0,0 +1,28 @@
+from .array1d import Array1D as Array1D
+from .arraynd import ArrayND as ArrayND
+from .growth import GrowthPolicy as GrowthPolicy
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Any
+
+class Palette:
+    def __init__(self, default: Any = ...) -> None: ...
+    @property
+    def values(self) -> tuple: ...
+    def __len__(self) -> int: ...
+    def encode(self, value: Any) -> int: ...
+
+class PaletteArray1D(Array1D):
+    def __init__(self, default: Any = ..., *, palette: Union[Palette, None] = ..., content: Union[Iterable, None] = ..., offset: int = ..., threadsafe: bool = ..., growth: GrowthPolicy = ...) -> None: ...
+    @property
+    def palette(self) -> Palette: ...
+    def snapshot(self) -> PaletteArray1D: ...
+    def replace_content(self, content: Iterable, offset: int = ...) -> None: ...
+    def trim(self) -> None: ...
+    def __setitem__(self, index: Union[int, slice], value: Any) -> None: ...
+    def __getitem__(self, index: Union[int, slice]) -> Any: ...
+    def __iter__(self) -> Iterator: ...
+
+class PaletteArrayND(ArrayND):
+    def __init__(self, dim: int, default: Any = ..., *, palette: Union[Palette, None] = ..., content: Union[Sequence, None] = ..., offset: Union[tuple[int, ...], list[int], int] = ..., threadsafe: bool = ..., growth: GrowthPolicy = ...) -> None: ...
+    @property
+    def palette(self) -> Palette: ...
@@ -0,0 +1,218 @@
+#!/usr/bin/python3
+
+import heapq
+import itertools
+from collections.abc import Callable, Iterable
+from math import inf, sqrt
+from typing import Any
+
+from .regions import Region, _neighbours
+
+
+# Connectivity of each metric (0: all the dimensions), and whether a step
+# costs the Euclidean length of its offset
+METRICS: dict[str, tuple[int, bool]] = {
+    'manhattan': (1, False), # orthogonal steps
+    'chebyshev': (0, False), # diagonal steps cost 1 as well
+    'euclidean': (0, True),  # diagonal steps cost their length
+}
+
+
+def _heuristic(metric: str, delta: list[int]) -> float:
+    # Lower bound of the distance of cells `delta` apart
+    if metric == 'manhattan':
+        return sum(delta)
+    if metric == 'chebyshev':
+        return max(delta)
+    delta = sorted(delta, reverse=True) + [0]
+    return sum((delta[k] - delta[k + 1]) * sqrt(k + 1)
+                   for k in range(len(delta) - 1))
+
+
+def _unflatten(values: list, region: Region, strides: list[int],
+               axis: int = 0, base: int = 0) -> list:
+    # Nested lists of the region from the flat list of a grid; `base` is
+    # the flat index of the block of the current axis
+    low, high = region[axis]
+    if axis == len(region) - 1:
+        return values[base + 1:base + 1 + high - low]
+    return [_unflatten(values, region, strides, axis + 1,
+                       base + (i + 1) * strides[axis])
+                for i in range(high - low)]
+
+
+class _Grid:
+    # Costs of entering the cells of a region in a flat list, bordered by
+    # impassable cells, so that the neighbours of a cell are at fixed
+    # offsets of its flat index and the search never leaves the region
+    __slots__ = ('region', 'strides', 'costs', 'steps')
+
+    def __init__(self, array: Any, region: Region, metric: str,
+                 weight: Callable[[Any], float|None]) -> None:
+        if metric not in METRICS:
+            raise ValueError(f"Metric must be one of {', '.join(METRICS)}")
+        self.region: Region = region
+        sizes: list[int] = [high - low + 2 for low, high in region]
+        self.strides: list[int] = [1] * len(sizes)
+        for axis in range(len(sizes) - 2, -1, -1):
+            self.strides[axis] = self.strides[axis + 1] * sizes[axis + 1]
+        self.costs: list[float|None] = [None] * (self.strides[0] * sizes[0])
+        low, high = region[-1]
+        blank: list[float|None] = [weight(array._default)] * (high - low)
+        for prefix in itertools.product(*(range(*b) for b in region[:-1])):
+            row: Any = array._rowat(prefix)
+            start: int = self.flat((*prefix, low))
+            self.costs[start:start + high - low] = blank if row is None \
+                else map(weight, row._values((region[-1],)))
+        connectivity, euclidean = METRICS[metric]
+        # Flat offset and length of each step
+        self.steps: list[tuple[int, float]] = [
+            (sum(map(lambda o, s: o * s, offset, self.strides)),
+             sqrt(sum(map(abs, offset))) if euclidean else 1)
+                for offset in _neighbours(len(region), connectivity or len(region))
+        ]
+
+    def flat(self, index: Iterable[int]) -> int:
+        return sum((i - low + 1) * stride for i, (low, _), stride
+                       in zip(index, self.region, self.strides))
+
+    def index(self, flat: int) -> tuple[int, ...]:
+        index: list[int] = []
+        for (low, _), stride in zip(self.region, self.strides):
+            i, flat = divmod(flat, stride)
+            index.append(i - 1 + low)
+        return tuple(index)
+
+    def contains(self, index: tuple[int, ...]) -> bool:
+        return all(low <= i < high for i, (low, high) in zip(index, self.region))
+
+
+class Paths:
+    # Mixin of distance fields and shortest paths on the grid of cells.
+    # Metrics: 'manhattan' (orthogonal steps of length 1), 'chebyshev'
+    # (diagonal steps of length 1 as well), 'euclidean' (diagonal steps
+    # of their geometric length). Searches are limited to `bounds`, cells
+    # outside the boundaries hold the default value.
+    __slots__ = ()
+
+    def distance_field(self, sources: Iterable[int|tuple[int, ...]],
+                       passable: Callable[[Any], bool]|None = None,
+                       metric: str = 'manhattan', *,
+                       bounds: Any = None,
+                       limit: float|None = None) -> Any: # Array1D|ArrayND
+        # Distance of each cell from the nearest source, through passable
+        # cells, within `bounds` (by default the boundaries of the array).
+        # Cells farther than `limit` or not reachable are None.
+        region: Region = self._region(bounds) # type: ignore
+        grid: _Grid = _Grid(self, region, metric,
+            (lambda value: 1) if passable is None
+                else (lambda value: 1 if passable(value) else None))
+        costs: list[float|None] = grid.costs
+        if limit is None:
+            limit = inf
+        distances: list[float|None] = [None] * len(costs)
+        queue: list[tuple[float, int]] = []
+        zero: float = 0.0 if metric == 'euclidean' else 0
+        for source in sources:
+            index: tuple[int, ...] = (source,) if isinstance(source, int) \
+                else tuple(source)
+            if not grid.contains(index):
+                raise ValueError(f'Source {source} is outside the bounds')
+            distances[grid.flat(index)] = zero
+            queue.append((zero, grid.flat(index)))
+        if metric == 'euclidean':
+            # Dijkstra's algorithm
+            heapq.heapify(queue)
+            while queue:
+                distance, cell = heapq.heappop(queue)
+                if distance > distances[cell]: # type: ignore
+                    continue
+                for offset, length in grid.steps:
+                    other: int = cell + offset
+                    if costs[other] is None:
+                        continue
+                    new: float = distance + length
+                    if new <= limit and (distances[other] is None
+                                         or new < distances[other]): # type: ignore
+                        distances[other] = new
+                        heapq.heappush(queue, (new, other))
+        else:
+            # Breadth-first search, level by level
+            frontier: list[int] = [cell for _, cell in queue]
+            level: int = 0
+            while frontier and level < limit:
+                level += 1
+                following: list[int] = []
+                for cell in frontier:
+                    for offset, _ in grid.steps:
+                        other = cell + offset
+                        if distances[other] is None and costs[other] is not None:
+                            distances[other] = level
+                            following.append(other)
+                frontier = following
+        field: Any = self._plain(None) # type: ignore
+        field.replace_content(_unflatten(distances, region, grid.strides),
+            region[0][0] if len(region) == 1 else [low for low, _ in region])
+        return field
+
+    def shortest_path(self, a: int|tuple[int, ...], b: int|tuple[int, ...],
+                      cost: Callable[[Any], float|None]|None = None,
+                      metric: str = 'manhattan', *,
+                      bounds: Any = None) -> list|None:
+        # Cells of a cheapest path from `a` to `b` (both included), or None
+        # if there is no path. `cost` gives the cost (at least 1) of
+        # entering a cell of the given value, None for impassable cells; by
+        # default every cell costs 1. Euclidean steps cost their length
+        # times the cost. The search is limited to `bounds`, by default the
+        # boundaries of the array extended to `a` and `b`.
+        start: tuple[int, ...] = (a,) if isinstance(a, int) else tuple(a)
+        goal: tuple[int, ...] = (b,) if isinstance(b, int) else tuple(b)
+        if bounds is None:
+            region: Region = tuple(
+                (min(low, i, j), max(high, i + 1, j + 1))
+                    for (low, high), i, j in zip(self._region(None), start, goal)) # type: ignore
+        else:
+            region = self._region(bounds) # type: ignore
+        def weight(value: Any) -> float|None:
+            weight: float|None = 1 if cost is None else cost(value)
+            if weight is not None and weight < 1:
+                raise ValueError('Costs must be at least 1')
+            return weight
+        grid: _Grid = _Grid(self, region, metric, weight)
+        if not grid.contains(start) or not grid.contains(goal):
+            return None
+        costs: list[float|None] = grid.costs
+        source: int = grid.flat(start)
+        target: int = grid.flat(goal)
+        # A* search; cells are numbered by their flat index
+        parents: dict[int, int] = {source: source}
+        reached: dict[int, float] = {source: 0}
+        queue: list[tuple[float, float, int]] = [(0, 0, source)]
+        while queue:
+            _, distance, cell = heapq.heappop(queue)
+            if cell == target:
+                path: list[int] = [cell]
+                while cell != source:
+                    cell = parents[cell]
+                    path.append(cell)
+                path.reverse()
+                indices = map(grid.index, path)
+                return [index[0] for index in indices] \
+                    if len(region) == 1 else list(indices)
+            if distance > reached[cell]:
+                continue
+            for offset, length in grid.steps:
+                other: int = cell + offset
+                step: float|None = costs[other]
+                if step is None:
+                    continue
+                new: float = distance + step * length
+                if new < reached.get(other, inf):
+                    reached[other] = new
+                    parents[other] = cell
+                    delta: list[int] = [abs(i - j) for i, j
+                                            in zip(grid.index(other), goal)]
+                    heapq.heappush(queue,
+                        (new + _heuristic(metric, delta), new, other))
+        return None
+
@@ -0,0 +1,8 @@
+from collections.abc import Callable, Iterable
+from typing import Any
+
+METRICS: dict[str, tuple[int, bool]]
+
+class Paths:
+    def distance_field(self, sources: Iterable[Union[int, tuple[int, ...]]], passable: Union[Callable[[Any], bool], None] = ..., metric: str = ..., *, bounds: Any = ..., limit: Union[float, None] = ...) -> Any: ...
+    def shortest_path(self, a: Union[int, tuple[int, ...]], b: Union[int, tuple[int, ...]], cost: Union[Callable[[Any], Union[float, None]], None] = ..., metric: str = ..., *, bounds: Any = ...) -> Union[list, None]: ...
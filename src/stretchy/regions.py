@@ -0,0 +1,283 @@
+#!/usr/bin/python3
+
+import itertools
+import operator
+from bisect import bisect_right
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from functools import cache, partial
+from typing import Any
+
+from .views import View
+
+
+Region = Sequence[tuple[int, int]]
+
+
+@cache
+def _neighbours(dim: int, connectivity: int) -> tuple[tuple[int, ...], ...]:
+    # Offsets of the neighbours of a cell: at most `connectivity` indices
+    # differ, each of them by one
+    if not 1 <= connectivity <= dim:
+        raise ValueError(f'Connectivity must be between 1 and {dim}')
+    return tuple(offset for offset in itertools.product((-1, 0, 1), repeat=dim)
+                     if 0 < sum(map(bool, offset)) <= connectivity)
+
+
+@cache
+def _rowsteps(dim: int, connectivity: int) -> tuple[tuple[tuple[int, ...], int], ...]:
+    # Neighbouring rows as offsets of the leading indices, with the column
+    # slack: 1 if diagonal neighbours are connected, 0 otherwise
+    steps: dict[tuple[int, ...], int] = {}
+    for offset in _neighbours(dim, connectivity):
+        if any(offset[:-1]):
+            steps[offset[:-1]] = max(steps.get(offset[:-1], 0), abs(offset[-1]))
+    return tuple(steps.items())
+
+
+def _segments(values: list, test: Callable[[Any], bool], low: int, high: int,
+              base: int) -> Iterator[tuple[int, int]]:
+    # Maximal ranges within [low, high) of the cells passing the test;
+    # `values` holds the cells of a row starting at column `base`
+    start: int|None = None
+    for column in range(low, high):
+        if test(values[column - base]):
+            if start is None:
+                start = column
+        elif start is not None:
+            yield start, column
+            start = None
+    if start is not None:
+        yield start, high
+
+
+class Regions:
+    # Mixin of flood fill and connected-component labelling. Rows are read
+    # once into lists of values and scanned segment by segment, instead of
+    # visiting the cells one by one through `__getitem__`.
+    __slots__ = ()
+
+    def flood_fill(self, start: int|tuple[int, ...], value: Any,
+                   connectivity: int = 1, *,
+                   bounds: Any = None) -> int:
+        # Fills the region of cells connected to `start` and holding the
+        # same value. The fill is limited to `bounds`, by default the
+        # boundaries of the array; cells outside the boundaries are default,
+        # so larger bounds let the fill grow the array. Returns the number
+        # of cells filled.
+        dim: int = self.dim # type: ignore
+        region: Region = self._region(bounds)
+        if isinstance(start, int):
+            start = (start,)
+        if len(start) != dim:
+            raise TypeError(f'Start must be a {dim} element tuple of integers')
+        if not all(first <= index < last
+                   for index, (first, last) in zip(start, region)):
+            return 0
+        target: Any = self[self._index(start)] # type: ignore
+        if value == target:
+            return 0
+        test: Callable[[Any], bool] = partial(operator.eq, target)
+        steps = _rowsteps(dim, connectivity)
+        base, limit = region[-1]
+        rows: dict[tuple[int, ...], list] = {}
+        filled: list[tuple[tuple[int, ...], int, int]] = []
+        stack: list[tuple[tuple[int, ...], int]] = [(start[:-1], start[-1])]
+        while stack:
+            prefix, column = stack.pop()
+            values: list = self._rowvalues(rows, prefix, region)
+            if values[column - base] != target:
+                continue
+            low: int = column
+            while low > base and values[low - 1 - base] == target:
+                low -= 1
+            high: int = column + 1
+            while high < limit and values[high - base] == target:
+                high += 1
+            # Filled cells no longer match, so they are not visited again
+            values[low - base:high - base] = [value] * (high - low)
+            filled.append((prefix, low, high))
+            for step, slack in steps:
+                neighbour: tuple[int, ...] = tuple(map(sum, zip(prefix, step)))
+                if all(first <= index < last for index, (first, last)
+                           in zip(neighbour, region)):
+                    stack.extend((neighbour, segment[0])
+                        for segment in _segments(
+                            self._rowvalues(rows, neighbour, region), test,
+                            max(low - slack, base), min(high + slack, limit),
+                            base))
+        for prefix, low, high in filled:
+            self._fillrow(prefix, low, high, value)
+        return sum(high - low for _, low, high in filled)
+
+    def label(self, predicate: Callable[[Any], bool],
+              connectivity: int = 1) -> tuple[Any, dict[int, int]]:
+        # Labels the connected components of the cells within the
+        # boundaries for which the predicate is true. Returns an array of
+        # the same boundaries holding the labels (from 1, in row-major order
+        # of the components' first cells, 0 elsewhere), and the number of
+        # cells of each label.
+        dim: int = self.dim # type: ignore
+        region: Region = self._region(None)
+        steps = [(step, slack) for step, slack in _rowsteps(dim, connectivity)
+                     if step > (0,) * len(step)]
+        base, limit = region[-1]
+        default: bool = bool(predicate(self._default)) # type: ignore
+        # Segments of the rows visited so far, and the union-find forest of
+        # the segments (by their serial numbers)
+        segments: dict[tuple[int, ...], list[tuple[int, int, int]]] = {}
+        parents: list[int] = []
+        def find(node: int) -> int:
+            while parents[node] != node:
+                parents[node] = parents[parents[node]]
+                node = parents[node]
+            return node
+        for prefix in itertools.product(*(range(*b) for b in region[:-1])):
+            row: Any = self._rowat(prefix)
+            if row is None:
+                found: list[tuple[int, int]] = \
+                    [(base, limit)] if default and base < limit else []
+            else:
+                values: list = list(row._values((region[-1],)))
+                found = list(_segments(values, predicate, base, limit, base))
+            current: list[tuple[int, int, int]] = []
+            for low, high in found:
+                node: int = len(parents)
+                parents.append(node)
+                current.append((low, high, node))
+                for step, slack in steps:
+                    previous = segments.get(
+                        tuple(index - offset
+                                  for index, offset in zip(prefix, step)))
+                    if not previous:
+                        continue
+                    i: int = bisect_right(previous, (low - slack,)) - 1
+                    if i < 0 or previous[i][1] <= low - slack:
+                        i += 1
+                    while i < len(previous) and previous[i][0] < high + slack:
+                        root: int = find(node)
+                        other: int = find(previous[i][2])
+                        if root != other:
+                            parents[max(root, other)] = min(root, other)
+                        i += 1
+            if current:
+                segments[prefix] = current
+        labels: Any = self._plain(0) # type: ignore
+        if all(low < high for low, high in region):
+            # The labels cover the boundaries, even if the corners are 0
+            labels[self._index(low for low, _ in region)] = 0
+            labels[self._index(high - 1 for _, high in region)] = 0
+        sizes: dict[int, int] = {}
+        numbers: dict[int, int] = {}
+        for prefix, current in segments.items():
+            for low, high, node in current:
+                root = find(node)
+                number: int|None = numbers.get(root)
+                if number is None:
+                    number = numbers[root] = len(numbers) + 1
+                    sizes[number] = 0
+                sizes[number] += high - low
+                labels._fillrow(prefix, low, high, number)
+        return labels, sizes
+
+
+    def fill(self, boundaries: Any, value: Any) -> None:
+        # Sets the value in all the cells of the region; the array is grown
+        # to cover the region at once, then row segments are assigned
+        region: Region = self._region(boundaries)
+        if any(low >= high for low, high in region):
+            return
+        self._cover(region) # type: ignore
+        low, high = region[-1]
+        for prefix in itertools.product(*(range(*b) for b in region[:-1])):
+            self._fillrow(prefix, low, high, value)
+
+    def paste(self, other: Any, at: int|tuple[int, ...] = 0,
+              mask_default: bool = True) -> None:
+        # Copies the cells within the boundaries of the other array (or
+        # view) of the same dimension, shifted by `at`. The array is grown
+        # to cover the region at once. With `mask_default`, the default
+        # cells of the other array are transparent and not copied.
+        dim: int = self.dim # type: ignore
+        if other.dim != dim:
+            raise ValueError('Arrays must have the same number of dimensions')
+        shift: tuple[int, ...] = (at,) * dim if isinstance(at, int) else tuple(at)
+        if len(shift) != dim:
+            raise TypeError(f'Offset must be an int or a {dim} element tuple of integers')
+        if other is self or isinstance(other, View) and other._base is self:
+            # The source must not change while it is copied
+            other = other.materialize() if isinstance(other, View) \
+                else other.snapshot()
+        bounds: Any = other.boundaries
+        source: Region = (bounds,) if dim == 1 else tuple(bounds)
+        if any(low >= high for low, high in source):
+            return
+        self._cover(tuple((low + offset, high + offset) # type: ignore
+                          for (low, high), offset in zip(source, shift)))
+        default: Any = other._base._default if isinstance(other, View) \
+            else other._default
+        values: Iterator = other._values(source)
+        base, limit = source[-1]
+        for prefix in itertools.product(*(range(*b) for b in source[:-1])):
+            row: list = list(itertools.islice(values, limit - base))
+            target: tuple[int, ...] = tuple(map(sum, zip(prefix, shift)))
+            segments: Iterable[tuple[int, int]] = [(base, limit)]
+            if mask_default:
+                segments = _segments(row, partial(operator.ne, default),
+                                     base, limit, base)
+            for low, high in segments:
+                self._pasterow(target, low + shift[-1],
+                               row[low - base:high - base])
+
+
+    def _region(self, bounds: Any) -> Region:
+        if bounds is None:
+            bounds = self.boundaries # type: ignore
+        return (bounds,) if self.dim == 1 else tuple(bounds) # type: ignore
+
+    def _index(self, indices: Iterable[int]) -> int|tuple[int, ...]:
+        index: tuple[int, ...] = tuple(indices)
+        return index if self.dim > 1 else index[0] # type: ignore
+
+    def _rowat(self, prefix: tuple[int, ...]) -> Any: # Array1D|None
+        return self._row(prefix) if prefix else self # type: ignore
+
+    def _rowvalues(self, rows: dict[tuple[int, ...], list],
+                   prefix: tuple[int, ...], region: Region) -> list:
+        # Values of a row within the region, read once per operation
+        values: list|None = rows.get(prefix)
+        if values is None:
+            row: Any = self._rowat(prefix)
+            low, high = region[-1]
+            values = rows[prefix] = [self._default] * (high - low) \
+                if row is None else list(row._values((region[-1],))) # type: ignore
+        return values
+
+    def _pasterow(self, prefix: tuple[int, ...], low: int,
+                  values: list) -> None:
+        # Writes values to a row from the given column, like `_fillrow`
+        if self._journal is not None or self._fingerprint is not None: # type: ignore
+            for column, value in enumerate(values, low):
+                self[self._index((*prefix, column))] = value # type: ignore
+            return
+        if prefix and self._renderer is not None: # type: ignore
+            self._renderer._touch(prefix) # type: ignore
+        row: Any = self
+        for index in prefix:
+            row = row._getplane(index)
+        row._paste(low, values)
+
+    def _fillrow(self, prefix: tuple[int, ...], low: int, high: int,
+                 value: Any) -> None:
+        # Writes a segment of a row, creating the planes on the way
+        if self._journal is not None or self._fingerprint is not None: # type: ignore
+            # Cell by cell, so that the journal and the fingerprint see
+            # every cell
+            for column in range(low, high):
+                self[self._index((*prefix, column))] = value # type: ignore
+            return
+        if prefix and self._renderer is not None: # type: ignore
+            self._renderer._touch(prefix) # type: ignore
+        row: Any = self
+        for index in prefix:
+            row = row._getplane(index)
+        row._fill(low, high, value)
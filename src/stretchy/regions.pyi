@@ -0,0 +1,10 @@
+from collections.abc import Callable, Sequence
+from typing import Any
+
+Region = Sequence[tuple[int, int]]
+
+class Regions:
+    def flood_fill(self, start: Union[int, tuple[int, ...]], value: Any, connectivity: int = ..., *, bounds: Any = ...) -> int: ...
+    def label(self, predicate: Callable[[Any], bool], connectivity: int = ...) -> tuple[Any, dict[int, int]]: ...
+    def fill(self, boundaries: Any, value: Any) -> None: ...
+    def paste(self, other: Any, at: Union[int, tuple[int, ...]] = ..., mask_default: bool = ...) -> None: ...
@@ -0,0 +1,141 @@
+#!/usr/bin/python3
+
+import itertools
+from math import prod
+from typing import Any
+
+from .format import Formatter
+
+
+class _CachingFormatter(Formatter):
+    # Takes the text of the rows from the cache of the renderer, and
+    # renders only the missing ones
+    __slots__ = ('_cache', '_rendered')
+
+    def __init__(self, default: Any, cache: dict[tuple[int, ...], str]) -> None:
+        super().__init__(default)
+        self._cache: dict[tuple[int, ...], str] = cache
+        self._rendered: int = 0 # cells of the rows rendered
+
+    def output_row(self, row: Any, columns: tuple[int, int],
+                   indices: list[int]) -> None:
+        key: tuple[int, ...] = tuple(indices)
+        text: str|None = self._cache.get(key)
+        if text is None:
+            text = self._cache[key] = row._rowstring(self, columns)
+            self._rendered += columns[1] - columns[0]
+        self.output_string(text)
+
+
+class Renderer:
+    # Format string parsed once and bound to an array. The array's
+    # `__setitem__` marks the changed rows dirty, rendering re-renders only
+    # those and reuses the cached text of the others. Writes through planes
+    # got by an `int` index are not tracked, call `invalidate` after them.
+    __slots__ = ('_template', '_array', '_cache', '_widths', '_dirty',
+                 '_layout')
+
+    def __init__(self, format: str = '') -> None:
+        self._template: Formatter = Formatter()
+        self._template.apply_format_string(format)
+        self._array: Any = None
+        self._cache: dict[tuple[int, ...], str] = {}
+        # Width of the widest cell of each row, used for arranged formats
+        self._widths: dict[tuple[int, ...], int] = {}
+        self._dirty: set[tuple[int, ...]] = set()
+        # Columns and cell width the cached rows were rendered with
+        self._layout: Any = None
+
+    @property
+    def array(self) -> Any: # Array1D|ArrayND|None
+        return self._array
+
+    def bind(self, array: Any) -> 'Renderer':
+        # An array has at most one renderer bound to it
+        self.unbind()
+        if array._renderer is not None:
+            array._renderer.unbind()
+        array._renderer = self
+        array._rehook()
+        self._array = array
+        return self
+
+    def unbind(self) -> None:
+        if self._array is not None:
+            self._array._renderer = None
+            self._array._rehook()
+            self._array = None
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        self._cache.clear()
+        self._widths.clear()
+        self._dirty.clear()
+        self._layout = None
+
+    def render(self) -> str:
+        array: Any = self._array
+        if array is None:
+            raise ValueError('Renderer is not bound to an array')
+        for key in self._dirty:
+            self._cache.pop(key, None)
+            self._widths.pop(key, None)
+        self._dirty.clear()
+        formatter: _CachingFormatter = _CachingFormatter(array._default,
+                                                         self._cache)
+        formatter.configure(self._template)
+        if array.dim == 1:
+            if () not in self._cache:
+                self._cache[()] = array._format(formatter)
+            return self._cache[()]
+        if array.index_format:
+            formatter.index_format = array.index_format
+        boundaries: Any = array.boundaries
+        width: int = self._maxwidth(formatter, boundaries) \
+            if formatter.arrange else 0
+        layout: tuple = (boundaries[-1], width)
+        if layout != self._layout:
+            self._cache.clear()
+            self._layout = layout
+        formatter._maxwidth = width
+        array._output(formatter, boundaries)
+        if array._stats is not None:
+            array._stats.count('cells_rendered', formatter._rendered)
+        return formatter.output
+
+    def _maxwidth(self, formatter: Formatter, boundaries: Any) -> int:
+        # Widths of clean rows are cached; the default value is shown if
+        # the rows do not cover the whole region
+        array: Any = self._array
+        width: int = 0
+        cells: int = 0
+        for prefix in itertools.product(*(range(*b) for b in boundaries[:-1])):
+            row: Any = array._row(prefix)
+            if not row:
+                continue
+            cells += len(row)
+            rowwidth: int|None = self._widths.get(prefix)
+            if rowwidth is None:
+                rowwidth = self._widths[prefix] = max(map(formatter._valwidth, row))
+            width = max(width, rowwidth)
+        if cells < prod(high - low for low, high in boundaries):
+            width = max(width, formatter._valwidth(array._default))
+        return width
+
+    def _touch(self, prefix: tuple[int, ...]) -> None:
+        self._dirty.add(prefix)
+
+
+class Rendered:
+    # Mixin of the arrays renderers can be bound to
+    __slots__ = ()
+    _renderer: Renderer|None
+
+    @property
+    def renderer(self) -> Renderer|None:
+        return self._renderer
+
+    def _invalidate_rendering(self) -> None:
+        # Resizing and restoring may change any of the rows
+        if self._renderer is not None:
+            self._renderer.invalidate()
@@ -0,0 +1,15 @@
+from .format import Formatter
+from typing import Any
+
+class Renderer:
+    def __init__(self, format: str = ...) -> None: ...
+    @property
+    def array(self) -> Any: ...
+    def bind(self, array: Any) -> Renderer: ...
+    def unbind(self) -> None: ...
+    def invalidate(self) -> None: ...
+    def render(self) -> str: ...
+
+class Rendered:
+    @property
+    def renderer(self) -> Union[Renderer, None]: ...
@@ -0,0 +1,317 @@
+#!/usr/bin/python3
+
+import itertools
+import sys
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from .array1d import Array1D, Boundaries
+from .format import Formatter, ReprFormatter
+from .growth import GrowthPolicy, exact
+
+
+class RunArray1D(Array1D):
+    # One-dimensional array storing runs of equal values instead of cells.
+    # Runs are kept sorted by their start, adjacent runs of equal values are
+    # merged, and runs of the default value are not stored at all. Memory
+    # and the cost of iteration, trimming and formatting scale with the
+    # number of runs. The inherited cell lists stay empty.
+    __slots__ = ('_starts', '_lengths', '_runvalues')
+
+    def __init__(self,
+            default: Any = None,
+            *,
+            content: Iterable|None = None,
+            offset: int = 0,
+            threadsafe: bool = False,
+            growth: GrowthPolicy = exact
+            ) -> None:
+        self._starts: list[int] = []
+        self._lengths: list[int] = []
+        self._runvalues: list = []
+        super().__init__(default, content=content, offset=offset,
+                         threadsafe=threadsafe, growth=growth)
+
+
+    @property
+    def capacity(self) -> tuple[int, int]:
+        # Runs allocate nothing in advance
+        return self.boundaries
+
+
+    def snapshot(self) -> 'RunArray1D':
+        clone: RunArray1D = RunArray1D(self._default,
+            threadsafe=self._lock is not None, growth=self._growth)
+        clone._starts = self._starts
+        clone._lengths = self._lengths
+        clone._runvalues = self._runvalues
+        clone._poslen = self._poslen
+        clone._neglen = self._neglen
+        clone._shared = self._shared = True
+        return clone
+
+    def replace_content(self, content: Iterable, offset: int = 0) -> None:
+        with self._guard():
+            before = self._begin_resize()
+            starts: list[int] = []
+            lengths: list[int] = []
+            values: list = []
+            position: int = offset
+            for value, group in itertools.groupby(content):
+                length: int = sum(1 for _ in group)
+                if value != self._default:
+                    starts.append(position)
+                    lengths.append(length)
+                    values.append(value)
+                position += length
+            self._starts = starts
+            self._lengths = lengths
+            self._runvalues = values
+            self._shared = False
+            self._neglen = max(0, -offset)
+            self._poslen = max(0, position)
+            self._end_resize(before)
+            self._invalidate_rendering()
+            self._invalidate_fingerprint()
+
+    def trim(self) -> None:
+        with self._guard():
+            before = self._begin_resize()
+            cells: int = len(self)
+            if self._starts:
+                self._neglen = max(0, -self._starts[0])
+                self._poslen = max(0, self._starts[-1] + self._lengths[-1])
+            else:
+                self._neglen = self._poslen = 0
+            if self._stats is not None:
+                self._stats.count('cells_freed', cells - len(self))
+            self._end_resize(before)
+            self._invalidate_rendering()
+
+    def shrink_by(self, by) -> None:
+        if isinstance(by, int):
+            by = (by, by)
+        with self._guard():
+            self._crop(max(0, self._neglen - by[0]), max(0, self._poslen - by[1]))
+
+    def crop_to(self, boundaries: tuple[int, int]) -> None:
+        neg_bound, pos_bound = boundaries
+        if neg_bound > 0 or pos_bound < 0:
+            raise ValueError('Lower bound cannot be positive and upper one cannot be negative')
+        with self._guard():
+            self._crop(min(self._neglen, -neg_bound), min(self._poslen, pos_bound))
+
+    def reserve(self, boundaries: tuple[int, int]) -> None:
+        neg_bound, pos_bound = boundaries
+        if neg_bound > 0 or pos_bound < 0:
+            raise ValueError('Lower bound cannot be positive and upper one cannot be negative')
+
+    def runs(self, boundaries: tuple[int, int]|None = None
+             ) -> Iterator[tuple[int, int, Any]]:
+        # `(start, length, value)` runs covering the given range, including
+        # the runs of the default value
+        if boundaries is None:
+            boundaries = self.boundaries
+        low, high = boundaries
+        starts: list[int] = self._starts
+        lengths: list[int] = self._lengths
+        values: list = self._runvalues
+        i: int = self._first_run(low)
+        position: int = low
+        while position < high:
+            if i < len(starts) and starts[i] < high:
+                start: int = max(starts[i], position)
+                if start > position:
+                    yield position, start - position, self._default
+                stop: int = min(starts[i] + lengths[i], high)
+                yield start, stop - start, values[i]
+                position = stop
+                i += 1
+            else:
+                yield position, high - position, self._default
+                position = high
+
+    def items_nondefault(self) -> Iterator[tuple[int, Any]]:
+        return ((index, value)
+                    for start, length, value
+                        in zip(self._starts, self._lengths, self._runvalues)
+                            for index in range(start, start + length))
+
+
+    def __setitem__(self, index: int|slice, value: Any) -> None:
+        if isinstance(index, slice):
+            low, high, step = self._range_indices(index)
+            if step != 1 or self._journal is not None \
+                    or self._fingerprint is not None:
+                # Cell by cell, so that the journal records every cell
+                super().__setitem__(index, value)
+            elif low < high:
+                with self._guard():
+                    self._write(low, high, value)
+            return
+        with self._guard():
+            if self._journal is not None:
+                self._record(index, value)
+            if self._fingerprint is not None:
+                self._rehash(index, self[index], value)
+            self._write(index, index + 1, value)
+
+    def __getitem__(self, index: int|slice) -> Any:
+        if isinstance(index, slice):
+            return super().__getitem__(index)
+        i: int = bisect_right(self._starts, index) - 1
+        if i >= 0 and index < self._starts[i] + self._lengths[i]:
+            return self._runvalues[i]
+        return self._default
+
+    def __iter__(self) -> itertools.chain:
+        return self._values((self.boundaries,))
+
+    def __repr__(self) -> str:
+        repr_string: str = self._format(ReprFormatter(self._default))
+        return f'RunArray1D(default={self._default!r}, ' \
+            f'offset={self.offset}, content={repr_string})'
+
+
+    def _first_run(self, index: int) -> int:
+        # Position of the first run ending after the index
+        i: int = bisect_right(self._starts, index) - 1
+        if i < 0 or self._starts[i] + self._lengths[i] <= index:
+            i += 1
+        return i
+
+    def _write(self, low: int, high: int, value: Any) -> None:
+        # Writes the range within the lock, growing the boundaries if needed
+        if self._renderer is not None:
+            self._renderer._touch(())
+        if self._shared:
+            self._unshare()
+        self._reach(low, high)
+        self._setrange(low, high, value)
+
+    def _reach(self, low: int, high: int) -> None:
+        # Only the boundaries change, nothing is allocated
+        if high > self._poslen:
+            if self._stats is not None:
+                self._stats.count('grow_events')
+                self._stats.count('cells_added_positive', high - self._poslen)
+            self._poslen = high
+        if low < -self._neglen:
+            if self._stats is not None:
+                self._stats.count('grow_events')
+                self._stats.count('cells_added_negative', -low - self._neglen)
+            self._neglen = -low
+
+    def _setrange(self, low: int, high: int, value: Any) -> None:
+        # Replaces the runs overlapping the range by the remainders of the
+        # first and last ones and the new run, then merges equal neighbours
+        starts: list[int] = self._starts
+        lengths: list[int] = self._lengths
+        values: list = self._runvalues
+        first: int = self._first_run(low)
+        last: int = bisect_left(starts, high)
+        pieces: list[list] = []
+        if first < last and starts[first] < low:
+            pieces.append([starts[first], low - starts[first], values[first]])
+        if value != self._default:
+            pieces.append([low, high - low, value])
+        if first < last and starts[last-1] + lengths[last-1] > high:
+            pieces.append([high, starts[last-1] + lengths[last-1] - high,
+                           values[last-1]])
+        if pieces:
+            if first > 0 and starts[first-1] + lengths[first-1] == pieces[0][0] \
+                    and values[first-1] == pieces[0][2]:
+                first -= 1
+                pieces.insert(0, [starts[first], lengths[first], values[first]])
+            if last < len(starts) and pieces[-1][0] + pieces[-1][1] == starts[last] \
+                    and values[last] == pieces[-1][2]:
+                pieces.append([starts[last], lengths[last], values[last]])
+                last += 1
+        merged: list[list] = []
+        for piece in pieces:
+            if merged and merged[-1][0] + merged[-1][1] == piece[0] \
+                    and merged[-1][2] == piece[2]:
+                merged[-1][1] += piece[1]
+            else:
+                merged.append(piece)
+        starts[first:last] = [piece[0] for piece in merged]
+        lengths[first:last] = [piece[1] for piece in merged]
+        values[first:last] = [piece[2] for piece in merged]
+
+    def _fill(self, low: int, high: int, value: Any) -> None:
+        with self._guard():
+            self._write(low, high, value)
+
+    def _paste(self, low: int, values: list) -> None:
+        with self._guard():
+            for value, group in itertools.groupby(values):
+                high: int = low + sum(1 for _ in group)
+                self._write(low, high, value)
+                low = high
+
+    def _crop(self, neglen: int, poslen: int) -> None:
+        before = self._begin_resize()
+        if self._shared:
+            self._unshare()
+        cells: int = len(self)
+        if self._starts and self._starts[0] < -neglen:
+            self._setrange(self._starts[0], -neglen, self._default)
+        if self._starts and self._starts[-1] + self._lengths[-1] > poslen:
+            self._setrange(poslen, self._starts[-1] + self._lengths[-1],
+                           self._default)
+        self._neglen = neglen
+        self._poslen = poslen
+        if self._stats is not None:
+            self._stats.count('cells_freed', cells - len(self))
+        self._end_resize(before)
+        self._invalidate_rendering()
+        self._invalidate_fingerprint()
+
+    def _unshare(self) -> None:
+        self._starts = self._starts.copy()
+        self._lengths = self._lengths.copy()
+        self._runvalues = self._runvalues.copy()
+        self._shared = False
+
+    def _restore(self, state: 'RunArray1D') -> None: # type: ignore[override]
+        clone: RunArray1D = state.snapshot()
+        self._starts = clone._starts
+        self._lengths = clone._lengths
+        self._runvalues = clone._runvalues
+        self._poslen = clone._poslen
+        self._neglen = clone._neglen
+        self._shared = True
+        self._invalidate_rendering()
+        self._invalidate_fingerprint()
+
+    def _memory(self, usage: dict[str, int], deep: bool,
+                seen: set[int]|None) -> None:
+        usage['lists'] += sum(map(sys.getsizeof, (self._pos, self._neg,
+            self._starts, self._lengths, self._runvalues)))
+        if seen is not None:
+            self._memory_cells(usage, self._runvalues, seen)
+
+    def _values(self, boundaries: Boundaries) -> Iterator:
+        return itertools.chain.from_iterable(
+            itertools.repeat(value, length)
+                for _, length, value in self.runs(boundaries[0])
+        )
+
+    def _maxwidth(self, formatter: Formatter, boundaries: Boundaries) -> None:
+        # Widths are computed once per run
+        if self._runvalues:
+            formatter.update_maxwidth(self._runvalues)
+        low, high = boundaries[0]
+        if sum(self._lengths) < high - low:
+            formatter.update_maxwidth_default()
+
+    def _format(self, formatter: Formatter) -> str:
+        if self._stats is not None:
+            self._stats.count('cells_rendered', len(self))
+        if len(self):
+            self._maxwidth(formatter, (self.boundaries,))
+        formatter.output_runs((value, length)
+                                for _, length, value in self.runs())
+        return formatter.output
+
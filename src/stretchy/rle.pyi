@@ -0,0 +1,21 @@
+import itertools
+from .array1d import Array1D as Array1D
+from .growth import GrowthPolicy as GrowthPolicy
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+class RunArray1D(Array1D):
+    def __init__(self, default: Any = ..., *, content: Union[Iterable, None] = ..., offset: int = ..., threadsafe: bool = ..., growth: GrowthPolicy = ...) -> None: ...
+    @property
+    def capacity(self) -> tuple[int, int]: ...
+    def snapshot(self) -> RunArray1D: ...
+    def replace_content(self, content: Iterable, offset: int = ...) -> None: ...
+    def trim(self) -> None: ...
+    def shrink_by(self, by) -> None: ...
+    def crop_to(self, boundaries: tuple[int, int]) -> None: ...
+    def reserve(self, boundaries: tuple[int, int]) -> None: ...
+    def runs(self, boundaries: Union[tuple[int, int], None] = ...) -> Iterator[tuple[int, int, Any]]: ...
+    def items_nondefault(self) -> Iterator[tuple[int, Any]]: ...
+    def __setitem__(self, index: Union[int, slice], value: Any) -> None: ...
+    def __getitem__(self, index: Union[int, slice]) -> Any: ...
+    def __iter__(self) -> itertools.chain: ...
@@ -0,0 +1,457 @@
+#!/usr/bin/python3
+
+import itertools
+import os
+import struct
+import sys
+import tempfile
+import threading
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any
+from collections.abc import Iterator
+
+from .abc import Array
+from .array1d import Array1D
+from .arraynd import ArrayND
+
+# A shared array consists of two segments. The anchor segment has a stable
+# name (this is what other processes attach to) and holds the header:
+#   magic, version, typecode, dim, generation, name of the data segment,
+#   packed default value, then for each axis: capacity low/high and
+#   logical low/high boundaries.
+# The data segment holds the cells of the capacity box in row-major order.
+# It is replaced when the array grows beyond its capacity. The generation
+# is odd while the data is being moved to the new segment.
+_HEADER = struct.Struct('<4sBcHQ64s8s')
+_AXIS = struct.Struct('<4q')
+_MAGIC = b'STRY'
+_VERSION = 1
+_GENERATION = 8 # offset of the generation counter
+_DATANAME = 16 # offset of the data segment name
+_NAMELEN = 64
+_TYPECODES = 'bBhHiIlLqQfd'
+_DEFAULT_RESERVE = (-8, 8)
+
+# Segments are not tracked by the resource tracker: the tracker of the
+# process that happened to create (or, before 3.13, attach) a segment
+# would unlink it at exit, while other processes are still using it.
+# Ownership is explicit instead, see `SharedArray.unlink`.
+_TRACKED = os.name == 'posix' and sys.version_info < (3, 13)
+
+def _open(name: str|None = None, size: int = 0) -> SharedMemory:
+    shm = SharedMemory(name, create=name is None, size=size)
+    if _TRACKED:
+        resource_tracker.unregister(shm._name, 'shared_memory') # type: ignore
+    return shm
+
+def _unlink(shm: SharedMemory) -> None:
+    if _TRACKED:
+        resource_tracker.register(shm._name, 'shared_memory') # type: ignore
+    shm.unlink()
+
+# The lock of an array is an exclusive lock of a file named after the
+# anchor segment, so processes attaching by name find it without having
+# the lock passed to them
+if os.name == 'nt':
+    import msvcrt
+
+    def _lockfile(fd: int) -> None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        while True:
+            try:
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1) # type: ignore
+                return
+            except OSError:
+                pass # gives up after 10 seconds, keep waiting
+
+    def _unlockfile(fd: int) -> None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1) # type: ignore
+else:
+    import fcntl
+
+    def _lockfile(fd: int) -> None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+
+    def _unlockfile(fd: int) -> None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+class _NamedLock:
+    # Reentrant, like `multiprocessing.RLock`; the threads of a process
+    # are serialized by a thread lock before locking the file
+    def __init__(self, name: str) -> None:
+        self._path: str = os.path.join(tempfile.gettempdir(),
+                                       f'stretchy-{name.lstrip("/")}.lock')
+        self._fd: int = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._threads: threading.RLock = threading.RLock()
+        self._depth: int = 0
+
+    def acquire(self) -> bool:
+        self._threads.acquire()
+        if self._depth == 0:
+            try:
+                _lockfile(self._fd)
+            except BaseException:
+                self._threads.release()
+                raise
+        self._depth += 1
+        return True
+
+    def release(self) -> None:
+        self._depth -= 1
+        if self._depth == 0:
+            _unlockfile(self._fd)
+        self._threads.release()
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+    def unlink(self) -> None:
+        try:
+            os.unlink(self._path)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self) -> bool:
+        return self.acquire()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.release()
+
+
+def _strides(capacity: tuple[tuple[int, int], ...]) -> tuple[int, ...]:
+    strides: list[int] = []
+    stride: int = 1
+    for lo, hi in reversed(capacity):
+        strides.append(stride)
+        stride *= hi - lo
+    return tuple(reversed(strides))
+
+def _cell(index: tuple[int, ...], capacity: tuple[tuple[int, int], ...],
+          strides: tuple[int, ...]) -> int:
+    cell: int = 0
+    for i, (lo, _), stride in zip(index, capacity, strides):
+        cell += (i - lo) * stride
+    return cell
+
+def _outside(index: tuple[int, ...],
+             boundaries: tuple[tuple[int, int], ...]) -> bool:
+    for i, (lo, hi) in zip(index, boundaries):
+        if i < lo or i >= hi:
+            return True
+    return False
+
+
+class SharedArray(Array):
+    def __init__(self,
+            dim: int = 1,
+            default: int|float = 0,
+            *,
+            typecode: str = 'd',
+            reserve: tuple[int, int]|tuple[tuple[int, int], ...]|None = None,
+            lock: Any = None
+            ) -> None:
+        if len(typecode) != 1 or typecode not in _TYPECODES:
+            raise ValueError(f"Typecode must be one of '{_TYPECODES}'")
+        if dim < 1:
+            raise ValueError('Number of dimensions must be positive')
+        if reserve is None:
+            reserve = (_DEFAULT_RESERVE,) * dim
+        elif isinstance(reserve[0], int):
+            reserve = (reserve,) # type: ignore
+        capacity = tuple((lo, hi) for lo, hi in reserve) # type: ignore
+        if len(capacity) != dim or any(lo > 0 or hi < 0 for lo, hi in capacity):
+            raise ValueError(f'`reserve` must contain {dim} (low, high) pairs around 0')
+        self._lock: Any = lock
+        anchor = _open(size=_HEADER.size + _AXIS.size * dim)
+        data = self._allocate(typecode, default, capacity)
+        _HEADER.pack_into(anchor.buf, 0, _MAGIC, _VERSION, typecode.encode(),
+            dim, 0, data.name.encode(), struct.pack(typecode, default))
+        for axis, (lo, hi) in enumerate(capacity):
+            _AXIS.pack_into(anchor.buf, _HEADER.size + _AXIS.size * axis,
+                lo, hi, 0, 0)
+        data.close()
+        self._attach(anchor)
+
+    @classmethod
+    def attach(cls, name: str, lock: Any = None) -> 'SharedArray':
+        # A lock given when creating the array must be given here as well
+        self = cls.__new__(cls)
+        self._lock = lock
+        self._attach(_open(name))
+        return self
+
+    def __reduce__(self) -> tuple:
+        # The named lock is found by the name, other locks can only be
+        # passed to processes created by this one
+        lock: Any = None if isinstance(self._lock, _NamedLock) else self._lock
+        return (SharedArray.attach, (self.name, lock))
+
+
+    @property
+    def name(self) -> str:
+        return self._anchor.name
+
+    @property
+    def lock(self) -> Any:
+        return self._lock
+
+    @property
+    def typecode(self) -> str:
+        return self._typecode
+
+    @property
+    def dim(self) -> int:
+        return self._dim
+
+    @property
+    def default(self) -> int|float:
+        return self._default
+
+    @property
+    def offset(self) -> int|tuple[int, ...]:
+        offset = tuple(lo for lo, _ in self._boundaries())
+        return offset[0] if self._dim == 1 else offset
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        return tuple(hi - lo for lo, hi in self._boundaries())
+
+    @property
+    def boundaries(self) -> tuple[int, int]|tuple[tuple[int, int], ...]:
+        boundaries = self._boundaries()
+        return boundaries[0] if self._dim == 1 else boundaries
+
+    @property
+    def capacity(self) -> tuple[int, int]|tuple[tuple[int, int], ...]:
+        self._sync()
+        return self._capacity[0] if self._dim == 1 else self._capacity
+
+
+    def close(self) -> None:
+        if self._data is None:
+            return
+        self._release()
+        self._generation_word.release()
+        self._header.release()
+        self._anchor.close()
+        if isinstance(self._lock, _NamedLock):
+            self._lock.close()
+
+    def unlink(self) -> None:
+        with self._lock:
+            self._sync()
+            assert self._segment is not None
+            _unlink(self._segment)
+            _unlink(self._anchor)
+            if isinstance(self._lock, _NamedLock):
+                self._lock.unlink()
+
+    def to_array(self) -> Array1D|ArrayND:
+        with self._lock:
+            self._sync()
+            boundaries = self._boundaries()
+            result: Array1D|ArrayND
+            if self._dim == 1:
+                lo, hi = boundaries[0]
+                first = self._cell((lo,))
+                return Array1D(self._default,
+                    content=self._data[first:first + hi - lo].tolist(), offset=lo)
+            result = ArrayND(self._dim, self._default)
+            lo, hi = boundaries[-1]
+            for prefix in itertools.product(*(range(l, h) for l, h in boundaries[:-1])):
+                first = self._cell((*prefix, lo))
+                plane = result
+                for i in prefix:
+                    plane = plane._getplane(i)
+                plane.replace_content(self._data[first:first + hi - lo].tolist(), lo)
+            return result
+
+    def __enter__(self) -> 'SharedArray':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+    def __bool__(self) -> bool:
+        return any(lo != hi for lo, hi in self._boundaries())
+
+    def __setitem__(self, index: int|tuple[int, ...], value: int|float) -> None:
+        idx = self._index(index)
+        while True:
+            self._sync()
+            if _outside(idx, self._capacity):
+                self._grow(idx)
+            if _outside(idx, self._boundaries()):
+                with self._lock:
+                    self._extend(idx)
+            self._data[self._cell(idx)] = value
+            # If the segment has been replaced meanwhile, the copy may not
+            # contain the value: write it again into the new one
+            if self._generation_word[0] == self._generation:
+                return
+
+    def __getitem__(self, index: int|tuple[int, ...]) -> int|float:
+        idx = self._index(index)
+        while True:
+            self._sync()
+            value = self._default
+            if not _outside(idx, self._boundaries()):
+                value = self._data[self._cell(idx)]
+            if self._generation_word[0] == self._generation:
+                return value
+
+    def __iter__(self) -> Iterator:
+        # Iterates over a copy; planes are not backed by the shared memory
+        return iter(self.to_array())
+
+    def __len__(self) -> int:
+        lo, hi = self._boundaries()[0]
+        return hi - lo
+
+    def __format__(self, format: str) -> str:
+        return self.to_array().__format__(format)
+
+    def __str__(self) -> str:
+        return str(self.to_array())
+
+    def __repr__(self) -> str:
+        return f'SharedArray(name={self.name!r}, dim={self._dim}, ' \
+            f'typecode={self._typecode!r}, default={self._default!r}, ' \
+            f'offset={self.offset})'
+
+
+    def _index(self, index: Any) -> tuple[int, ...]:
+        if self._dim == 1 and isinstance(index, int):
+            return (index,)
+        if not isinstance(index, tuple) or len(index) != self._dim \
+                or any(map(lambda x: not isinstance(x, int), index)):
+            raise TypeError(f'Index must be a {self._dim} element tuple of integers')
+        return index
+
+    def _cell(self, index: tuple[int, ...]) -> int:
+        return _cell(index, self._capacity, self._strides)
+
+    def _axis(self, axis: int) -> tuple[int, int, int, int]:
+        return _AXIS.unpack_from(self._header, _HEADER.size + _AXIS.size * axis)
+
+    def _boundaries(self) -> tuple[tuple[int, int], ...]:
+        return tuple(self._axis(axis)[2:] for axis in range(self._dim))
+
+    def _attach(self, anchor: SharedMemory) -> None:
+        magic, version, typecode, dim, _, _, default = \
+            _HEADER.unpack_from(anchor.buf)
+        if magic != _MAGIC or version != _VERSION:
+            anchor.close()
+            raise ValueError(f"'{anchor.name}' is not a shared stretchy array")
+        self._anchor: SharedMemory = anchor
+        if self._lock is None:
+            self._lock = _NamedLock(anchor.name)
+        self._header: memoryview = anchor.buf.toreadonly()
+        self._generation_word: memoryview = \
+            anchor.buf[_GENERATION:_GENERATION + 8].cast('Q')
+        self._dim: int = dim
+        self._typecode: str = typecode.decode()
+        self._default: int|float = struct.unpack_from(self._typecode, default)[0]
+        self._segment: SharedMemory|None = None
+        self._data: memoryview|None = None
+        self._generation: int = -1
+        self._sync()
+
+    def _sync(self) -> None:
+        # Re-maps the data segment if another process has replaced it
+        if self._data is None and self._generation >= 0:
+            raise ValueError('Shared array is closed')
+        while self._generation_word[0] != self._generation:
+            if self._generation_word[0] % 2:
+                with self._lock: # wait for the growing process, which holds it
+                    pass
+            generation: int = self._generation_word[0]
+            name: bytes = self._header[_DATANAME:_DATANAME + _NAMELEN].tobytes()
+            capacity = tuple(self._axis(axis)[:2] for axis in range(self._dim))
+            try:
+                segment = _open(name.rstrip(b'\0').decode())
+            except FileNotFoundError:
+                continue # replaced again in the meantime
+            if self._generation_word[0] != generation:
+                segment.close()
+                continue
+            self._release()
+            self._segment = segment
+            self._data = segment.buf.cast(self._typecode)
+            self._capacity: tuple[tuple[int, int], ...] = capacity
+            self._strides: tuple[int, ...] = _strides(capacity)
+            self._generation = generation
+
+    def _release(self) -> None:
+        if self._data is not None:
+            self._data.release()
+            self._data = None
+        if self._segment is not None:
+            self._segment.close()
+            self._segment = None
+
+    def _allocate(self, typecode: str, default: int|float,
+                  capacity: tuple[tuple[int, int], ...]) -> SharedMemory:
+        itemsize: int = struct.calcsize(typecode)
+        cells: int = 1
+        for lo, hi in capacity:
+            cells *= hi - lo
+        segment = _open(size=max(cells, 1) * itemsize)
+        packed_default: bytes = struct.pack(typecode, default)
+        if any(packed_default):
+            segment.buf[:cells * itemsize] = packed_default * cells
+        return segment
+
+    def _grow(self, index: tuple[int, ...]) -> None:
+        with self._lock:
+            self._sync()
+            if not _outside(index, self._capacity):
+                return # another process has already grown the array
+            grown: list[tuple[int, int]] = []
+            for i, (lo, hi) in zip(index, self._capacity):
+                width = hi - lo
+                if i < lo:
+                    lo = min(i, lo - width)
+                elif i >= hi:
+                    hi = max(i + 1, hi + width)
+                grown.append((lo, hi))
+            capacity = tuple(grown)
+            strides = _strides(capacity)
+            segment = self._allocate(self._typecode, self._default, capacity)
+            self._generation_word[0] = self._generation + 1
+            data = segment.buf.cast(self._typecode)
+            boundaries = self._boundaries()
+            lo, hi = boundaries[-1]
+            for prefix in itertools.product(*(range(l, h) for l, h in boundaries[:-1])):
+                first = self._cell((*prefix, lo))
+                target_first = _cell((*prefix, lo), capacity, strides)
+                data[target_first:target_first + hi - lo] = \
+                    self._data[first:first + hi - lo] # type: ignore
+            data.release()
+            anchor = self._anchor.buf
+            anchor[_DATANAME:_DATANAME + _NAMELEN] = \
+                segment.name.encode().ljust(_NAMELEN, b'\0')
+            for axis, (caplo, caphi) in enumerate(capacity):
+                offset = _HEADER.size + _AXIS.size * axis
+                _, _, lo, hi = _AXIS.unpack_from(anchor, offset)
+                _AXIS.pack_into(anchor, offset, caplo, caphi, lo, hi)
+            assert self._segment is not None
+            _unlink(self._segment)
+            segment.close()
+            self._generation_word[0] = self._generation + 2
+            self._sync()
+
+    def _extend(self, index: tuple[int, ...]) -> None:
+        anchor = self._anchor.buf
+        for axis, i in enumerate(index):
+            offset = _HEADER.size + _AXIS.size * axis
+            caplo, caphi, lo, hi = _AXIS.unpack_from(anchor, offset)
+            if i < lo:
+                lo = i
+            elif i >= hi:
+                hi = i + 1
+            _AXIS.pack_into(anchor, offset, caplo, caphi, lo, hi)
@@ -0,0 +1,40 @@
+from .abc import Array as Array
+from .array1d import Array1D as Array1D
+from .arraynd import ArrayND as ArrayND
+from collections.abc import Iterator
+from typing import Any
+
+class SharedArray(Array):
+    def __init__(self, dim: int = ..., default: Union[int, float] = ..., *, typecode: str = ..., reserve: Union[tuple[int, int], tuple[tuple[int, int], ...], None] = ..., lock: Any = ...) -> None: ...
+    @classmethod
+    def attach(cls, name: str, lock: Any = ...) -> SharedArray: ...
+    def __reduce__(self) -> tuple: ...
+    @property
+    def name(self) -> str: ...
+    @property
+    def lock(self) -> Any: ...
+    @property
+    def typecode(self) -> str: ...
+    @property
+    def dim(self) -> int: ...
+    @property
+    def default(self) -> Union[int, float]: ...
+    @property
+    def offset(self) -> Union[int, tuple[int, ...]]: ...
+    @property
+    def shape(self) -> tuple[int, ...]: ...
+    @property
+    def boundaries(self) -> Union[tuple[int, int], tuple[tuple[int, int], ...]]: ...
+    @property
+    def capacity(self) -> Union[tuple[int, int], tuple[tuple[int, int], ...]]: ...
+    def close(self) -> None: ...
+    def unlink(self) -> None: ...
+    def to_array(self) -> Union[Array1D, ArrayND]: ...
+    def __enter__(self) -> SharedArray: ...
+    def __exit__(self, *exc_info: Any) -> None: ...
+    def __bool__(self) -> bool: ...
+    def __setitem__(self, index: Union[int, tuple[int, ...]], value: Union[int, float]) -> None: ...
+    def __getitem__(self, index: Union[int, tuple[int, ...]]) -> Union[int, float]: ...
+    def __iter__(self) -> Iterator: ...
+    def __len__(self) -> int: ...
+    def __format__(self, format: str) -> str: ...
@@ -0,0 +1,71 @@
+#!/usr/bin/python3
+
+from typing import Any, Callable
+
+EVENTS: tuple[str, ...] = (
+    'planes_created',       # new planes of N-dimensional arrays
+    'grow_events',          # extensions of the backing lists
+    'cells_added_negative', # cells added by growing in negative direction
+    'cells_added_positive', # cells added by growing in positive direction
+    'boundaries_computed',  # computations of the boundaries
+    'cells_freed',          # cells dropped by trim, shrink_by and crop_to
+    'cells_rendered',       # cells passed to the formatter
+)
+
+# Global hook receiving each event of arrays collecting statistics, e.g. for
+# exporting them to a metrics system
+_hook: Callable[[str, int], Any]|None = None
+
+
+def set_hook(hook: Callable[[str, int], Any]|None) -> None:
+    global _hook
+    _hook = hook
+
+
+class Stats:
+    # Counters are not protected by locks, so they are approximate if
+    # different rows of a thread-safe array grow concurrently
+    def __init__(self) -> None:
+        self._counters: dict[str, int] = dict.fromkeys(EVENTS, 0)
+
+    def __getitem__(self, event: str) -> int:
+        return self._counters[event]
+
+    def __repr__(self) -> str:
+        counters: str = ', '.join(f'{event}={count}'
+                                  for event, count in self._counters.items())
+        return f'Stats({counters})'
+
+    def count(self, event: str, amount: int = 1) -> None:
+        self._counters[event] += amount
+        if _hook is not None:
+            _hook(event, amount)
+
+    def as_dict(self) -> dict[str, int]:
+        return self._counters.copy()
+
+    def reset(self) -> None:
+        self._counters = dict.fromkeys(EVENTS, 0)
+
+
+class Instrumented:
+    # Mixin of the statistics related methods of the arrays. Collection is
+    # opt-in: while disabled, the only cost is checking `_stats` on growth,
+    # resizing and formatting; reading and overwriting cells is unaffected.
+    __slots__ = ()
+    _stats: Stats|None
+
+    def enable_stats(self) -> None:
+        if self._stats is None:
+            self._set_stats(Stats())
+
+    def disable_stats(self) -> None:
+        self._set_stats(None)
+
+    def stats(self) -> Stats:
+        if self._stats is None:
+            raise ValueError('Statistics are not enabled')
+        return self._stats
+
+    def _set_stats(self, stats: Stats|None) -> None:
+        self._stats = stats
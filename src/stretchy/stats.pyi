@@ -0,0 +1,17 @@
+from typing import Any, Callable
+
+EVENTS: tuple[str, ...]
+
+def set_hook(hook: Union[Callable[[str, int], Any], None]) -> None: ...
+
+class Stats:
+    def __init__(self) -> None: ...
+    def __getitem__(self, event: str) -> int: ...
+    def count(self, event: str, amount: int = ...) -> None: ...
+    def as_dict(self) -> dict[str, int]: ...
+    def reset(self) -> None: ...
+
+class Instrumented:
+    def enable_stats(self) -> None: ...
+    def disable_stats(self) -> None: ...
+    def stats(self) -> Stats: ...
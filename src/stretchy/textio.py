@@ -0,0 +1,155 @@
+#!/usr/bin/python3
+
+import csv
+import io
+import mmap
+import os
+from collections.abc import Callable, Iterator, Mapping
+from typing import Any, IO
+
+from .array1d import Array1D
+from .arraynd import ArrayND
+from .growth import GrowthPolicy, exact
+
+
+def _lines(source: str|os.PathLike|IO, encoding: str) -> Iterator[str]:
+    # Lines of the source without line endings. Files given by path are
+    # memory mapped, so only the current line is held in memory.
+    if isinstance(source, str):
+        lines: Iterator = io.StringIO(source)
+    elif isinstance(source, os.PathLike):
+        with open(source, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                for line in iter(mapped.readline, b''):
+                    yield line.decode(encoding).rstrip('\r\n')
+        return
+    else:
+        lines = source
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode(encoding)
+        yield line.rstrip('\r\n')
+
+
+def parse(
+        source: str|os.PathLike|IO,
+        *,
+        sep: str = '',
+        default: Any = None,
+        offset: tuple[int, ...]|list[int]|int = 0,
+        dim: int = 2,
+        charmap: Mapping|None = None,
+        sparse: bool = False,
+        encoding: str = 'utf-8',
+        threadsafe: bool = False,
+        growth: GrowthPolicy = exact
+        ) -> ArrayND:
+    # Inverse of the `s` format: rows are lines, cells are characters or
+    # separated by `sep`, and N-D planes are separated by `dim - 2` empty
+    # lines
+    if dim < 2:
+        raise ValueError('Parsed arrays must have at least two dimensions')
+    if isinstance(offset, int):
+        offset = (offset,) * dim
+    if len(offset) != dim:
+        raise ValueError(f'Offset must be an int or a {dim} element tuple of integers')
+    array: ArrayND = ArrayND(dim, default, threadsafe=threadsafe, growth=growth)
+    index: list[int] = list(offset[:-1])
+    column: int = offset[-1]
+    blank: int = 0
+    for line in _lines(source, encoding):
+        if dim > 2 and not line:
+            blank += 1
+            continue
+        if blank:
+            # Empty lines step the axis before the rows of the planes
+            axis: int = max(dim - 2 - blank, 0)
+            index[axis] += 1
+            index[axis+1:] = offset[axis+1:-1]
+            blank = 0
+        cells: Any = line.split(sep) if sep else line
+        if charmap is not None:
+            cells = map(charmap.get, cells, cells)
+        start: int = 0
+        if sparse:
+            # Default cells at the ends of rows are not stored, and rows of
+            # default cells are left as placeholders
+            cells = list(cells)
+            stop: int = len(cells)
+            while stop and cells[stop - 1] == default:
+                stop -= 1
+            if stop:
+                while cells[start] == default:
+                    start += 1
+                cells = cells[start:stop]
+            else:
+                index[-1] += 1
+                continue
+        plane: Any = array
+        for i in index:
+            plane = plane._getplane(i)
+        plane.replace_content(cells, column + start)
+        index[-1] += 1
+    return array
+
+
+def read_csv(
+        fp: IO,
+        *,
+        index: bool = True,
+        default: Any = None,
+        convert: Callable[[str], Any]|None = None,
+        offset: tuple[int, ...]|list[int]|int = 0,
+        dim: int = 2,
+        threadsafe: bool = False,
+        growth: GrowthPolicy = exact,
+        **fmtparams: Any
+        ) -> Array1D|ArrayND:
+    # Inverse of `to_csv`. With index, the number of dimensions and the
+    # offset are taken from the header row and the index columns; rows may
+    # come in any order. Empty fields are read as default.
+    reader = csv.reader(fp, **fmtparams)
+    lead: int
+    column: int
+    if index:
+        header: list[str]|None = next(reader, None)
+        if header is None:
+            raise ValueError('Missing header row')
+        lead = 0
+        while lead < len(header) and header[lead] == '':
+            lead += 1
+        dim = lead + 1
+        column = int(header[lead]) if lead < len(header) else 0
+    else:
+        if dim > 2:
+            raise ValueError('Arrays of more than two dimensions need index columns')
+        if isinstance(offset, int):
+            offset = (offset,) * dim
+        lead = 0
+        column = offset[-1]
+    array: Array1D|ArrayND
+    if dim == 1:
+        array = Array1D(default, threadsafe=threadsafe, growth=growth)
+    else:
+        array = ArrayND(dim, default, threadsafe=threadsafe, growth=growth)
+    row_index: int = offset[0] if not index and dim == 2 else 0 # type: ignore
+    for fields in reader:
+        cells: list = fields[lead:]
+        if '' in cells:
+            cells = [default if field == '' else
+                     field if convert is None else convert(field)
+                        for field in cells]
+        elif convert is not None:
+            cells = list(map(convert, cells))
+        if dim == 1:
+            array.replace_content(cells, column)
+            continue
+        plane: Any = array
+        prefix = map(int, fields[:lead]) if index else (row_index,)
+        for i in prefix:
+            plane = plane._getplane(i)
+        plane.replace_content(cells, column)
+        row_index += 1
+    return array
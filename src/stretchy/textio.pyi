@@ -0,0 +1,9 @@
+import os
+from .array1d import Array1D as Array1D
+from .arraynd import ArrayND as ArrayND
+from .growth import GrowthPolicy as GrowthPolicy
+from collections.abc import Callable, Mapping
+from typing import Any, IO
+
+def parse(source: Union[str, os.PathLike, IO], *, sep: str = ..., default: Any = ..., offset: Union[tuple[int, ...], list[int], int] = ..., dim: int = ..., charmap: Union[Mapping, None] = ..., sparse: bool = ..., encoding: str = ..., threadsafe: bool = ..., growth: GrowthPolicy = ...) -> ArrayND: ...
+def read_csv(fp: IO, *, index: bool = ..., default: Any = ..., convert: Union[Callable[[str], Any], None] = ..., offset: Union[tuple[int, ...], list[int], int] = ..., dim: int = ..., threadsafe: bool = ..., growth: GrowthPolicy = ..., **fmtparams: Any) -> Union[Array1D, ArrayND]: ...
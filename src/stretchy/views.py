@@ -0,0 +1,244 @@
+#!/usr/bin/python3
+
+import itertools
+from collections.abc import Iterator, Sequence
+from typing import Any
+
+
+Boundaries = Sequence[tuple[int, int]]
+
+
+def _nested(values: Iterator, shape: tuple[int, ...], container: type) -> Any:
+    # Groups the values of a region (in row-major order) to nested containers
+    if len(shape) == 1:
+        return container(itertools.islice(values, shape[0]))
+    return container(_nested(values, shape[1:], container)
+                        for _ in range(shape[0]))
+
+
+class View:
+    # Live view of a lower-dimensional part of an N-dimensional array, or of
+    # the array with its axes permuted or mirrored. Nothing is copied: cells
+    # are read from and written to the base array. Reading never creates
+    # planes, missing planes read as all-default.
+    __slots__ = ('_base', '_fixed', '_axes', '_flips')
+
+    def __init__(self, base: Any, prefix: tuple[int, ...]) -> None:
+        # `base` is an ArrayND; the view shows the plane at `prefix`
+        self._base: Any = base
+        # Index of each axis of the base array, None for the axes of the view
+        self._fixed: tuple[int|None, ...] = \
+            prefix + (None,) * (base.dim - len(prefix))
+        # Axes of the base array shown by the axes of the view
+        self._axes: tuple[int, ...] = tuple(range(len(prefix), base.dim))
+        # Mirrored axes of the view: index `i` of the view is `-1 - i` of
+        # the base array, so the boundaries `(low, high)` become
+        # `(-high, -low)`
+        self._flips: tuple[bool, ...] = (False,) * len(self._axes)
+
+
+    @property
+    def dim(self) -> int:
+        return len(self._axes)
+
+    @property
+    def offset(self) -> int|tuple[int, ...]:
+        if self.dim == 1:
+            return self.boundaries[0] # type: ignore
+        return tuple(low for low, _ in self.boundaries) # type: ignore
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        return tuple(high - low for low, high in self._bounds())
+
+    @property
+    def boundaries(self) -> tuple[int, int]|tuple[tuple[int, int], ...]:
+        bounds = self._bounds()
+        return bounds[0] if self.dim == 1 else bounds
+
+
+    def ndenumerate(self, boundaries: Any = None) -> Iterator:
+        if self.dim == 1:
+            region: Boundaries = (boundaries or self.boundaries,)
+            return zip(range(*region[0]), self._values(region))
+        region = boundaries or self._bounds()
+        return zip(
+            itertools.product(*(range(*b) for b in region)),
+            self._values(region)
+        )
+
+    def items_nondefault(self) -> Iterator:
+        default: Any = self._base._default
+        return ((index, value) for index, value in self.ndenumerate()
+                    if value != default)
+
+    def tolist(self, boundaries: Any = None, *,
+               tuples: bool = False, stream: bool = False
+               ) -> list|tuple|Iterator:
+        region: Boundaries = self._bounds() if boundaries is None \
+            else (boundaries,) if self.dim == 1 else boundaries
+        values: Iterator = self._values(region)
+        container: type = tuple if tuples else list
+        if self.dim == 1:
+            return values if stream else container(values)
+        shape: tuple[int, ...] = tuple(high - low for low, high in region)
+        rows: Iterator = (_nested(values, shape[1:], container)
+                            for _ in range(shape[0]))
+        return rows if stream else container(rows)
+
+    def transpose(self, axes: Sequence[int]|None = None) -> 'View':
+        # Axes permuted: axis `i` of the result is axis `axes[i]` of the
+        # view; by default the order of the axes is reversed
+        if axes is None:
+            axes = range(self.dim - 1, -1, -1)
+        axes = tuple(map(self._axis, axes))
+        if sorted(axes) != list(range(self.dim)):
+            raise ValueError(f'Axes must be a permutation of the {self.dim} axes')
+        return self._derive(self._fixed,
+                            tuple(self._axes[axis] for axis in axes),
+                            tuple(self._flips[axis] for axis in axes))
+
+    def flip(self, axis: int = 0) -> 'View':
+        # Mirrored along the axis, around the origin
+        axis = self._axis(axis)
+        flips: list[bool] = list(self._flips)
+        flips[axis] = not flips[axis]
+        return self._derive(self._fixed, self._axes, tuple(flips))
+
+    def rot90(self, k: int = 1, axes: tuple[int, int] = (0, 1)) -> 'View':
+        # Rotated by 90 degrees `k` times, from the first axis towards the
+        # second one
+        first: int = self._axis(axes[0])
+        second: int = self._axis(axes[1])
+        if first == second:
+            raise ValueError('Axes of the rotation must be different')
+        permutation: list[int] = list(range(self.dim))
+        permutation[first], permutation[second] = second, first
+        view: View = self
+        for _ in range(k % 4):
+            view = view.transpose(permutation).flip(first)
+        return view
+
+    def materialize(self) -> Any: # Array1D|ArrayND
+        # Independent array with the content of the view
+        array: Any = self._base._like(self.dim)
+        array.replace_content(self.tolist(), self.offset)
+        if self.dim > 1:
+            array.index_format = self._base.index_format
+        return array
+
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __len__(self) -> int:
+        low, high = self._bounds()[0]
+        return high - low
+
+    def __iter__(self) -> Iterator:
+        # Cells of one-dimensional views, views of the planes otherwise
+        if self.dim == 1:
+            return self._values(self._bounds())
+        return (self[index] for index in range(*self._bounds()[0]))
+
+    def __getitem__(self, index: int|tuple[int, ...]) -> Any:
+        if isinstance(index, int):
+            index = (index,)
+        if not isinstance(index, tuple) or not 0 < len(index) <= self.dim \
+                or any(map(lambda x: not isinstance(x, int), index)):
+            raise TypeError(f'Index must be a tuple of at most {self.dim} integers')
+        if len(index) == self.dim:
+            return self._base[self._baseindex(index)]
+        return self._derive(self._baseindex(index), self._axes[len(index):],
+                            self._flips[len(index):])
+
+    def __setitem__(self, index: int|tuple[int, ...], value: Any) -> None:
+        if isinstance(index, int):
+            index = (index,)
+        if not isinstance(index, tuple) or len(index) != self.dim \
+                or any(map(lambda x: not isinstance(x, int), index)):
+            raise TypeError(f'Index must be a {self.dim} element tuple of integers')
+        self._base[self._baseindex(index)] = value
+
+    def __format__(self, format: str) -> str:
+        return self.materialize().__format__(format)
+
+    def __str__(self) -> str:
+        return str(self.materialize())
+
+    def __repr__(self) -> str:
+        return f'View({self.materialize()!r})'
+
+
+    def _derive(self, fixed: tuple[int|None, ...], axes: tuple[int, ...],
+                flips: tuple[bool, ...]) -> 'View':
+        view: View = View.__new__(View)
+        view._base = self._base
+        view._fixed = fixed
+        view._axes = axes
+        view._flips = flips
+        return view
+
+    def _axis(self, axis: int) -> int:
+        if not -self.dim <= axis < self.dim:
+            raise ValueError(f'Axis must be between {-self.dim} and {self.dim - 1}')
+        return axis % self.dim
+
+    def _baseindex(self, index: tuple[int, ...]) -> Any: # tuple[int|None, ...]
+        # Index of the base array; axes not covered by `index` remain None
+        full: list[int|None] = list(self._fixed)
+        for axis, flip, value in zip(self._axes, self._flips, index):
+            full[axis] = -1 - value if flip else value
+        return tuple(full)
+
+    def _plane(self) -> tuple[Any, int]:
+        # The deepest existing plane addressed by the leading fixed axes and
+        # its depth; None if a plane of the path is missing
+        plane: Any = self._base
+        depth: int = 0
+        for value in self._fixed:
+            if value is None:
+                break
+            plane = plane._getplane(value, create=False)
+            if plane is None:
+                return None, depth
+            depth += 1
+        return plane, depth
+
+    def _bounds(self) -> tuple[tuple[int, int], ...]:
+        # Boundaries of the plane found by `_plane`; the further fixed axes
+        # are not resolved, the bounds of the whole plane are used for them
+        plane, depth = self._plane()
+        bounds: Any
+        if plane is None:
+            bounds = ((0, 0),) * (self._base.dim - depth)
+        elif depth == self._base.dim - 1:
+            bounds = (plane.boundaries,)
+        else:
+            bounds = plane.boundaries
+        return tuple((-bounds[axis - depth][1], -bounds[axis - depth][0])
+                         if flip else bounds[axis - depth]
+                             for axis, flip in zip(self._axes, self._flips))
+
+    def _values(self, boundaries: Boundaries) -> Iterator:
+        # Values of the given region in row-major order
+        base: Any = self._base
+        last: int = base.dim - 1
+        ranges: list[range] = [range(*b) for b in boundaries]
+        if self._axes[-1] == last:
+            # Rows of the view are rows of the base array, maybe reversed
+            width: int = len(ranges[-1])
+            default: Any = base._default
+            low, high = boundaries[-1]
+            flip: bool = self._flips[-1]
+            columns: Boundaries = ((-high, -low),) if flip else boundaries[-1:]
+            rows = (base._row(self._baseindex(index)[:last])
+                        for index in itertools.product(*ranges[:-1]))
+            return itertools.chain.from_iterable(
+                itertools.repeat(default, width) if row is None
+                    else reversed(list(row._values(columns))) if flip
+                        else row._values(columns)
+                            for row in rows
+            )
+        return map(base.__getitem__,
+                   map(self._baseindex, itertools.product(*ranges)))
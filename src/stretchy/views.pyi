@@ -0,0 +1,28 @@
+from collections.abc import Iterator, Sequence
+from typing import Any
+
+Boundaries = Sequence[tuple[int, int]]
+
+class View:
+    def __init__(self, base: Any, prefix: tuple[int, ...]) -> None: ...
+    @property
+    def dim(self) -> int: ...
+    @property
+    def offset(self) -> Union[int, tuple[int, ...]]: ...
+    @property
+    def shape(self) -> tuple[int, ...]: ...
+    @property
+    def boundaries(self) -> Union[tuple[int, int], tuple[tuple[int, int], ...]]: ...
+    def ndenumerate(self, boundaries: Any = ...) -> Iterator: ...
+    def items_nondefault(self) -> Iterator: ...
+    def tolist(self, boundaries: Any = ..., *, tuples: bool = ..., stream: bool = ...) -> Union[list, tuple, Iterator]: ...
+    def transpose(self, axes: Union[Sequence[int], None] = ...) -> View: ...
+    def flip(self, axis: int = ...) -> View: ...
+    def rot90(self, k: int = ..., axes: tuple[int, int] = ...) -> View: ...
+    def materialize(self) -> Any: ...
+    def __bool__(self) -> bool: ...
+    def __len__(self) -> int: ...
+    def __iter__(self) -> Iterator: ...
+    def __getitem__(self, index: Union[int, tuple[int, ...]]) -> Any: ...
+    def __setitem__(self, index: Union[int, tuple[int, ...]], value: Any) -> None: ...
+    def __format__(self, format: str) -> str: ...
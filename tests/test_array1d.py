@@ -1,6 +1,7 @@
 import pytest
+import copy
 
-from stretchy import Array1D
+from stretchy import Array1D, Renderer
 
 @pytest.mark.parametrize('default',
     (42, '#', 42.69, None, False)
@@ -289,3 +290,93 @@ def test_wrong_format(array):
     with pytest.raises(ValueError):
         '{:@@@}'.format(array)
 
+
+
+# ======== Enumeration ========
+
+@pytest.mark.parametrize('boundaries, expected',
+    (
+        (None, ((-2,'a'), (-1,'.'), (0,'b'), (1,'.'), (2,'c'))),
+        ((-4,-1), ((-4,'.'), (-3,'.'), (-2,'a'))),
+        ((1,5), ((1,'.'), (2,'c'), (3,'.'), (4,'.'))),
+        ((-1,1), ((-1,'.'), (0,'b'))),
+        ((4,6), ((4,'.'), (5,'.'))),
+        ((0,0), ()),
+    )
+)
+def test_ndenumerate(boundaries, expected):
+    s = Array1D('.', content='a.b.c', offset=-2)
+    assert tuple(s.ndenumerate(boundaries)) == expected
+
+
+@pytest.mark.parametrize('content, offset, expected',
+    (
+        ('', 0, ()),
+        ('...', -1, ()),
+        ('a.b.c', -2, ((-2,'a'), (0,'b'), (2,'c'))),
+        ('.#', 3, ((4,'#'),)),
+    )
+)
+def test_items_nondefault(content, offset, expected):
+    s = Array1D('.', content=content, offset=offset)
+    assert tuple(s.items_nondefault()) == expected
+
+
+@pytest.mark.parametrize('boundaries,expected', [
+    (None, ['a', 'b', 'c']),
+    ((-3, 0), ['.', '.', 'a']),
+    ((0, 4), ['b', 'c', '.', '.']),
+    ((2, 2), []),
+])
+def test_tolist(boundaries, expected):
+    s = Array1D('.', content='abc', offset=-1)
+    assert s.tolist(boundaries) == expected
+    assert s.tolist(boundaries, tuples=True) == tuple(expected)
+    assert list(s.tolist(boundaries, stream=True)) == expected
+
+
+# ======== Snapshots ========
+
+def test_snapshot():
+    s = Array1D('.', content='abc', offset=-1)
+    t = s.snapshot()
+    assert t._pos is s._pos
+    t[0] = '#'
+    s[-3] = '@'
+    assert f'{s:s}' == '@.abc'
+    assert f'{t:s}' == 'a#c'
+    t.trim()
+    s.crop_to((-1, 1))
+    assert f'{s:s}' == 'ab'
+    assert f'{t:s}' == 'a#c'
+
+
+def test_copy():
+    s = Array1D('.', content='abc')
+    t = copy.copy(s)
+    t[1] = '#'
+    assert f'{s:s}' == 'abc'
+    assert f'{t:s}' == 'a#c'
+
+
+# ======== Short path of writing ========
+
+def test_hooks_switched():
+    s = Array1D(0, content=[1, 2])
+    assert not s._hooked
+    s.enable_journal()
+    s.enable_fingerprint()
+    s[0] = 5
+    s.disable_journal()
+    assert s._hooked
+    s[1] = 6
+    assert s.fingerprint == hash((0, 5)) ^ hash((1, 6))
+    s.disable_fingerprint()
+    assert not s._hooked
+    renderer = Renderer('s').bind(s)
+    assert renderer.render() == '56' and s._hooked
+    s[-1] = 7
+    assert renderer.render() == '756'
+    renderer.unbind()
+    assert not s._hooked
+    assert Array1D(0, threadsafe=True)._hooked
@@ -1,7 +1,8 @@
 import pytest
 import copy
+import itertools
 
-from stretchy import ArrayND
+from stretchy import Array1D, ArrayND
 
 def rows_to_str(rows):
     return '\n'.join(rows)
@@ -432,3 +433,211 @@ def test_format(fmt, expected, array):
     assert fmt.format(array) == rows_to_str(expected)
 
 
+
+# ======== Enumeration ========
+
+def test_ndenumerate():
+    s = ArrayND(2, '.', content=['ab', 'c'], offset=(-1,0))
+    assert tuple(s.ndenumerate()) == (
+        ((-1,0), 'a'), ((-1,1), 'b'), ((0,0), 'c'), ((0,1), '.'),
+    )
+
+
+@pytest.mark.parametrize('boundaries, expected',
+    (
+        (((0,1),(0,1),(0,1)), '#'),
+        (((-1,1),(0,1),(0,1)), '.#'),
+        (((2,4),(2,4),(0,2)), '.'*8),
+        (((1,3),(-1,1),(-1,2)), '.....@' + '.'*6),
+    )
+)
+def test_ndenumerate_boundaries(boundaries, expected):
+    s = ArrayND(3, '.')
+    s[0,0,0] = '#'
+    s[1,0,1] = '@'
+    items = tuple(s.ndenumerate(boundaries))
+    indices = tuple(itertools.product(*(range(*b) for b in boundaries)))
+    assert tuple(i for i, _ in items) == indices
+    assert ''.join(v for _, v in items) == expected
+
+
+def test_items_nondefault():
+    s = ArrayND(3, 0)
+    s[1,-2,3] = 5
+    s[-1,0,0] = 4
+    s[5,5,5] = 0
+    assert tuple(s.items_nondefault()) == (((-1,0,0), 4), ((1,-2,3), 5))
+    assert tuple(ArrayND(2, 0).items_nondefault()) == ()
+
+# ======== Snapshots ========
+
+def test_snapshot():
+    s = ArrayND(2, '.', content=['ab', 'cd', 'ef'])
+    t = s.snapshot()
+    t[0,0] = '#'
+    s[2,1] = '@'
+    t[4,0] = '$'
+    assert f'{s:s}' == 'ab\ncd\ne@'
+    assert f'{t:s}' == '#b\ncd\nef\n..\n$.'
+    # untouched rows are still shared
+    assert s._pos[1]._pos is t._pos[1]._pos
+
+
+def test_snapshot_deep():
+    s = ArrayND(3, 0)
+    s[1,1,1] = 1
+    t = s.snapshot()
+    u = t.snapshot()
+    t[1,1,0] = 2
+    s[1,0,0] = 3
+    assert tuple(s.items_nondefault()) == (((1,0,0), 3), ((1,1,1), 1))
+    assert tuple(t.items_nondefault()) == (((1,1,0), 2), ((1,1,1), 1))
+    assert tuple(u.items_nondefault()) == (((1,1,1), 1),)
+
+
+def test_snapshot_planes():
+    s = ArrayND(2, '.', content=['ab', 'cd'])
+    t = s.snapshot()
+    for plane in t:
+        plane[0] = '#'
+    t[1][1] = '@'
+    t.trim()
+    assert f'{s:s}' == 'ab\ncd'
+    assert f'{t:s}' == '#b\n#@'
+    s.crop_to(((0,1),(0,1)))
+    assert f'{s:s}' == 'a'
+    assert f'{t:s}' == '#b\n#@'
+
+
+def test_snapshot_plane_handles():
+    # Planes got before the snapshot stay attached to the array
+    s = ArrayND(2, '.', content=['ab', 'cd'])
+    row = s[0]
+    t = s.snapshot()
+    row[0] = '#'
+    assert f'{s:s}' == '#b\ncd'
+    assert f'{t:s}' == 'ab\ncd'
+    s[1,1] = '@'
+    row[1] = '$'
+    assert f'{s:s}' == '#$\nc@'
+    assert f'{t:s}' == 'ab\ncd'
+    # cells are still shared until written
+    assert s._pos[1]._pos is not t._pos[1]._pos
+    u = s.snapshot()
+    assert s._pos[1]._pos is u._pos[1]._pos
+
+
+def test_snapshot_plane_handles_deep():
+    s = ArrayND(3, 0)
+    s[0,0,0] = 1
+    plane = s[0]
+    row = plane[0]
+    t = s.snapshot()
+    row[0] = 2
+    plane[1,1] = 3
+    assert tuple(s.items_nondefault()) == (((0,0,0), 2), ((0,1,1), 3))
+    assert tuple(t.items_nondefault()) == (((0,0,0), 1),)
+
+
+def test_copy():
+    s = ArrayND(2, '.', content=['ab', 'cd'])
+    t = copy.copy(s)
+    t[1,1] = '#'
+    assert f'{s:s}' == 'ab\ncd'
+    assert f'{t:s}' == 'ab\nc#'
+
+
+def test_placeholders():
+    s = ArrayND(2, '.')
+    s[3,1] = '#'
+    assert s._pos[:3] == [None, None, None]
+    assert s[1,1] == '.'
+    assert s._pos[1] is None
+    assert s.boundaries == ((0, 4), (0, 2))
+    assert f'{s:s}' == '..\n..\n..\n.#'
+    assert list(s.ndenumerate(((2, 4), (1, 2)))) == [((2,1), '.'), ((3,1), '#')]
+    assert list(s.items_nondefault()) == [((3,1), '#')]
+    s[1,0] = '@'
+    assert s._pos[0] is None and s._pos[2] is None
+    assert f'{s:s}' == '..\n@.\n..\n.#'
+
+
+@pytest.mark.parametrize('cells,boundaries,text', [
+    ([(2,2,2)], ((0, 3), (0, 3), (0, 3)), '...\n...\n...\n\n...\n...\n...\n\n...\n...\n..#'),
+    ([(-1,0,0),(1,1,1)], ((-1, 2), (0, 2), (0, 2)), '#.\n..\n\n..\n..\n\n..\n.#'),
+])
+def test_placeholders_3d(cells, boundaries, text):
+    s = ArrayND(3, '.')
+    for cell in cells:
+        s[cell] = '#'
+    assert s.boundaries == boundaries
+    assert f'{s:s}' == text
+
+
+def test_placeholders_iter():
+    s = ArrayND(2, 0)
+    s[2,2] = 1
+    planes = list(s)
+    assert None not in planes
+    planes[0][1] = 5
+    assert s[0,1] == 5
+    # Placeholder rows come as real planes, with the whole API of a plane
+    g = ArrayND(2, '.')
+    g[3,3] = '#'
+    for index, row in enumerate(g):
+        assert isinstance(row, Array1D)
+        row.replace_content(str(index))
+    assert f'{g:s}' == '0\n1\n2\n3'
+
+
+def test_snapshot_iter():
+    s = ArrayND(2, '.', content=['ab.', 'cd.'])
+    t = s.snapshot()
+    # Planes shared with the snapshot are copied as they are reached
+    for row in s:
+        assert isinstance(row, Array1D)
+        row.trim()
+        row[0] = '#'
+    assert f'{s:s}' == '#b\n#d'
+    assert f'{t:s}' == 'ab.\ncd.'
+    assert list(t)[1] is t._pos[1]
+
+
+def test_placeholders_crop():
+    s = ArrayND(2, '.')
+    s[3,3] = '#'
+    s.crop_to(((0, 2), (0, 2)))
+    assert s.boundaries == ((0, 2), (0, 0))
+    assert f'{s:s}' == '\n'
+    s.trim()
+    assert len(s) == 0
+
+
+@pytest.mark.parametrize('boundaries,expected', [
+    (None, [['a', '.'], ['.', '.'], ['.', 'b']]),
+    (((1, 2), (-1, 3)), [['.', '.', 'b', '.']]),
+    (((-2, 0), (0, 1)), [['.'], ['a']]),
+    (((3, 5), (0, 2)), [['.', '.'], ['.', '.']]),
+])
+def test_tolist(boundaries, expected):
+    s = ArrayND(2, '.')
+    s[-1,0] = 'a'
+    s[1,1] = 'b'
+    assert s.tolist(boundaries) == expected
+    assert s.tolist(boundaries, tuples=True) \
+        == tuple(tuple(row) for row in expected)
+    rows = s.tolist(boundaries, stream=True)
+    assert not isinstance(rows, list)
+    assert list(rows) == expected
+
+
+def test_tolist_3d():
+    s = ArrayND(3, 0)
+    s[1,0,1] = 5
+    expected = [[[0, 0]], [[0, 5]]]
+    assert s.tolist() == expected
+    assert s.tolist() == [[[s[i,j,k] for k in range(0, 2)]
+        for j in range(0, 1)] for i in range(0, 2)]
+    blank = s.tolist(((-1, 0), (0, 2), (0, 1)))
+    assert blank == [[[0], [0]]]
+    assert blank[0][0] is not blank[0][1]
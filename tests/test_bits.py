@@ -0,0 +1,155 @@
+import random
+
+import pytest
+
+import stretchy
+from stretchy import Array1D, ArrayND, BitArray1D, BitArrayND
+
+
+def same(s, t):
+    assert s.boundaries == t.boundaries
+    assert len(s) == len(t)
+    assert list(s.ndenumerate()) == list(t.ndenumerate())
+    assert list(s.items_nondefault()) == list(t.items_nondefault())
+    for format in ('', 's', 'a', 'l', 's,b<e>'):
+        assert f'{s:{format}}' == f'{t:{format}}'
+    assert str(s) == str(t)
+
+
+@pytest.mark.parametrize('dim', [1, 2, 3])
+@pytest.mark.parametrize('seed', range(3))
+def test_random_writes(dim, seed):
+    rnd = random.Random(seed)
+    if dim == 1:
+        s = BitArray1D('.', on='#')
+    else:
+        s = BitArrayND(dim, '.', on='#')
+    t = stretchy.empty(dim, '.')
+    for _ in range(150):
+        index = tuple(rnd.randrange(-12, 12) for _ in range(dim))
+        if dim == 1:
+            index = index[0]
+        value = rnd.choice('.#')
+        s[index] = value
+        t[index] = value
+        assert s[index] == t[index]
+    same(s, t)
+    assert s.count() == sum(1 for _, value in t.items_nondefault())
+
+
+@pytest.mark.parametrize('content,offset', [
+    ([1, 0, 1, 1], -2),
+    ([0, 1], 3),
+    ([1] * 20, -7),
+    ([], 0),
+])
+def test_replace_content(content, offset):
+    s = BitArray1D(0, on=1, content=content, offset=offset)
+    t = Array1D(0, content=content, offset=offset)
+    same(s, t)
+    assert list(s) == list(t)
+
+
+@pytest.mark.parametrize('operation', [
+    lambda u: u.trim(),
+    lambda u: u.crop_to((-3, 4)),
+    lambda u: u.crop_to((0, 0)),
+    lambda u: u.shrink_by(2),
+    lambda u: u.shrink_by((0, 6)),
+])
+def test_resize(operation):
+    content = [0, 0, 1, 1, 0, 1, 1, 1, 0, 0, 0, 0]
+    s = BitArray1D(0, on=1, content=content, offset=-4)
+    t = Array1D(0, content=content, offset=-4)
+    operation(s)
+    operation(t)
+    same(s, t)
+    # cleared spare bits must read as default after growing again
+    s[9] = 0
+    t[9] = 0
+    s[-9] = 0
+    t[-9] = 0
+    same(s, t)
+
+
+@pytest.mark.parametrize('op', ['&', '|', '^'])
+def test_operators_1d(op):
+    a = BitArray1D(0, on=1, content=[1, 1, 0, 0, 1], offset=-2)
+    b = BitArray1D(0, on=1, content=[1, 0, 1], offset=-1)
+    result = eval(f'a {op} b')
+    expected = [eval(f'x {op} y') for x, y in zip(a.tolist((-2, 3)),
+                                                   b.tolist((-2, 3)))]
+    assert result.boundaries == (-2, 3)
+    assert list(result) == expected
+
+
+@pytest.mark.parametrize('op', ['&', '|', '^'])
+def test_operators_nd(op):
+    a = BitArrayND(2, '.', on='#', content=['#.#', '.##'], offset=(-1, 0))
+    b = BitArrayND(2, '.', on='#', content=['##', '..', '.#'])
+    result = eval(f'a {op} b')
+    bounds = ((-1, 3), (0, 3))
+    for (index, value), (_, x), (_, y) in zip(result.ndenumerate(bounds),
+            a.ndenumerate(bounds), b.ndenumerate(bounds)):
+        assert (value == '#') == eval(f"(x == '#') {op} (y == '#')"), index
+    assert result.boundaries == bounds
+
+
+def test_operators_invalid():
+    a = BitArray1D()
+    with pytest.raises(TypeError):
+        a & Array1D()
+    with pytest.raises(TypeError):
+        BitArrayND(2) | BitArrayND(3)
+    # The bits must mean the same values
+    with pytest.raises(ValueError):
+        BitArray1D(0, on=1) & BitArray1D(0, on=2)
+    with pytest.raises(ValueError):
+        BitArray1D(0, on=1) ^ BitArray1D(1, on=0)
+    with pytest.raises(ValueError):
+        BitArrayND(2, '.', on='#') | BitArrayND(2, ' ', on='#')
+
+
+def test_values():
+    s = BitArrayND(2, '.', on='#')
+    with pytest.raises(ValueError):
+        s[0, 0] = 'x'
+    with pytest.raises(ValueError):
+        BitArray1D(1, on=1)
+    s[1, 1] = '#'
+    assert s.on == '#'
+    assert s[1, 1] == '#'
+    assert s[5, 5] == '.'
+    assert repr(s) == "BitArrayND(dim=2, default='.', on='#', " \
+        "offset=(0, 0), content=\n[['.', '.'],\n ['.', '#']])"
+
+
+def test_snapshot():
+    s = BitArrayND(2, '.', on='#', content=['#.', '.#'])
+    t = s.snapshot()
+    assert isinstance(t, BitArrayND)
+    assert isinstance(t[0], BitArray1D)
+    t[0, 1] = '#'
+    assert f'{s:s}' == '#.\n.#'
+    assert f'{t:s}' == '##\n.#'
+    assert t.count() == 3
+
+
+def test_view():
+    s = BitArrayND(3, '.', on='#')
+    s[1, 2, 3] = '#'
+    row = s[1, 2].materialize()
+    assert isinstance(row, BitArray1D)
+    assert row.on == '#'
+    assert row.count() == 1
+
+
+def test_memory():
+    s = BitArrayND(2, False)
+    t = ArrayND(2, False)
+    for u in (s, t):
+        for i in range(64):
+            u[i, 999] = True
+    usage = s.memory_usage()
+    assert usage['lists'] * 20 < t.memory_usage()['lists']
+    assert s.capacity == ((0, 64), (0, 1000))
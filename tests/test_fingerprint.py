@@ -0,0 +1,177 @@
+import random
+
+import pytest
+
+import stretchy
+from stretchy import (Array1D, ArrayND, BitArray1D, BitArrayND, Frozen,
+                      PaletteArray1D, RunArray1D)
+from stretchy.fingerprint import _digest
+
+
+def digest(s):
+    # Fingerprint computed from scratch
+    return _digest(s.items_nondefault())
+
+
+ARRAYS = [
+    lambda: Array1D(0),
+    lambda: RunArray1D(0),
+    lambda: BitArray1D(0, on=1),
+    lambda: PaletteArray1D(0),
+    lambda: ArrayND(2, 0),
+    lambda: BitArrayND(2, 0, on=1),
+    lambda: ArrayND(3, 0),
+]
+
+
+@pytest.mark.parametrize('make', ARRAYS)
+def test_incremental(make):
+    rnd = random.Random(1)
+    s = make()
+    s.enable_fingerprint()
+    assert s.fingerprint == 0
+    values = [0, 1] if isinstance(s, (BitArray1D, BitArrayND)) else [0, 1, 2, 'x']
+    for i in range(200):
+        index = tuple(rnd.randrange(-5, 6) for _ in range(s.dim))
+        s[index[0] if s.dim == 1 else index] = rnd.choice(values)
+        if i % 20 == 0:
+            assert s.fingerprint == digest(s)
+    assert s.fingerprint == digest(s)
+
+
+@pytest.mark.parametrize('make', ARRAYS)
+def test_resize(make):
+    s = make()
+    s[(2,) * s.dim if s.dim > 1 else 2] = 1
+    s[(-2,) * s.dim if s.dim > 1 else -2] = 1
+    s.enable_fingerprint()
+    before = s.fingerprint
+    s.reserve(((-10, 10),) * s.dim if s.dim > 1 else (-10, 10))
+    s.trim()
+    assert s.fingerprint == before
+    s.crop_to(((0, 3),) * s.dim if s.dim > 1 else (0, 3))
+    assert s.fingerprint == digest(s) != before
+    s.replace_content([1, 1] if s.dim == 1 else [[1, 1]] if s.dim == 2
+                      else [[[1, 1]]])
+    assert s.fingerprint == digest(s)
+
+
+def test_slices_and_regions():
+    s = RunArray1D(0)
+    s.enable_fingerprint()
+    s[2:8] = 5
+    s.fill((-3, 0), 6)
+    assert s.fingerprint == digest(s)
+    t = ArrayND(2, 0)
+    t.enable_fingerprint()
+    t.fill(((0, 3), (0, 4)), 1)
+    t.paste(stretchy.array([[2, 0], [0, 2]], default=0), (1, 1))
+    assert t.flood_fill((0, 0), 3) == 10
+    assert t.fingerprint == digest(t)
+
+
+def test_journal():
+    s = stretchy.array([[1, 2], [3, 4]], default=0)
+    s.enable_journal()
+    s.enable_fingerprint()
+    before = s.fingerprint
+    s[0, 0] = 7
+    s.crop_to(((0, 1), (0, 2)))
+    s.undo(2)
+    assert s.fingerprint == before
+
+
+def test_disabled():
+    s = Array1D(0)
+    with pytest.raises(ValueError):
+        s.fingerprint
+    s.enable_fingerprint()
+    s.disable_fingerprint()
+    with pytest.raises(ValueError):
+        s.fingerprint
+
+
+def test_cycle_detection():
+    # Blinker of the Game of Life: period 2
+    s = stretchy.array([[0, 1, 0]] * 3, default=0)
+    s.enable_fingerprint()
+    seen = {s.freeze(): 0}
+    for tick in range(1, 5):
+        live = {index for index, _ in s.items_nondefault()}
+        cells = {(i + di, j + dj) for i, j in live
+                     for di in (-1, 0, 1) for dj in (-1, 0, 1)}
+        for i, j in cells:
+            count = sum((i + di, j + dj) in live for di in (-1, 0, 1)
+                            for dj in (-1, 0, 1) if di or dj)
+            s[i, j] = int(count == 3 or count == 2 and (i, j) in live)
+        state = s.freeze()
+        if state in seen:
+            break
+        seen[state] = tick
+    assert (seen[state], tick) == (0, 2)
+
+
+def test_frozen():
+    s = stretchy.array([[1, 0], [0, 2]], default=0, offset=(1, 1))
+    f = s.freeze()
+    assert isinstance(f, Frozen)
+    s[1, 1] = 5
+    assert f[1, 1] == 1 and s[1, 1] == 5
+    assert f.boundaries == s.boundaries
+    assert f.tolist(((1, 3), (1, 3))) == [[1, 0], [0, 2]]
+    assert repr(f).startswith('Frozen(ArrayND(')
+    with pytest.raises(TypeError):
+        f[1, 1] = 3
+    with pytest.raises(TypeError):
+        f[1]
+    thawed = f.thaw()
+    thawed[1, 1] = 3
+    assert f[1, 1] == 1
+
+
+def test_frozen_plane_handles():
+    s = stretchy.array([[1, 0], [0, 2]], default=0)
+    s.enable_fingerprint()
+    row = s[0]
+    f = s.freeze()
+    row[0] = 55
+    assert f[0, 0] == 1 and s[0, 0] == 55
+    assert hash(f) == digest(f)
+    assert f == stretchy.array([[1, 0], [0, 2]], default=0).freeze()
+    # The fingerprint does not see writes through planes, the hash does
+    g = s.freeze()
+    assert hash(g) == digest(g) != s.fingerprint
+    row[1] = 7
+    assert g[0, 1] == 0 and hash(g) == digest(g)
+
+
+def test_frozen_equality():
+    a = stretchy.array([[1, 0], [0, 2]], default=0)
+    b = stretchy.array([[1, 0, 0], [0, 2, 0], [0, 0, 0]], default=0)
+    c = stretchy.array([[1, 0], [0, 2]], default=0, offset=(3, -1))
+    assert a.freeze() == b.freeze() and hash(a.freeze()) == hash(b.freeze())
+    assert a.freeze() != c.freeze()
+    assert a.freeze(True) == c.freeze(True)
+    assert hash(a.freeze(True)) == hash(c.freeze(True))
+    assert a.freeze(True) != a.freeze()
+    assert a.freeze() != stretchy.array([[1, 0], [0, 2]], default=1).freeze()
+    assert Array1D(0, content=[0, 1]).freeze(True) \
+        == RunArray1D(0, content=[1], offset=5).freeze(True)
+    assert len({a.freeze(), b.freeze(), c.freeze()}) == 2
+
+
+def test_frozen_hash_is_fingerprint():
+    s = stretchy.array([[1, 'x'], [None, 2]], default=None)
+    s.enable_fingerprint()
+    s[4, 4] = 3
+    assert hash(s.freeze()) == s.fingerprint
+    t = stretchy.array([[1, 'x'], [None, 2]], default=None)
+    t[4, 4] = 3
+    assert hash(t.freeze()) == s.fingerprint
+
+
+def test_paste_frozen():
+    s = ArrayND(2, 0)
+    s.paste(stretchy.array([[1, 0], [0, 2]], default=0).freeze(), (1, 1))
+    assert s.tolist(((1, 3), (1, 3))) == [[1, 0], [0, 2]]
+    assert len(list(s.items_nondefault())) == 2
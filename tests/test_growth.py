@@ -0,0 +1,119 @@
+import pytest
+
+import stretchy
+from stretchy import Array1D, ArrayND, exact, geometric
+
+
+@pytest.mark.parametrize('policy,capacity,required,expected', [
+    (exact, 0, 1, 1),
+    (exact, 10, 11, 11),
+    (geometric(), 0, 1, 1),
+    (geometric(), 10, 11, 20),
+    (geometric(1.5), 10, 11, 15),
+    (geometric(2), 10, 30, 30),
+])
+def test_policy(policy, capacity, required, expected):
+    assert policy(capacity, required) == expected
+
+
+def test_geometric_invalid():
+    with pytest.raises(ValueError):
+        geometric(1)
+
+
+def test_reserve_1d():
+    s = Array1D('.', content='abc')
+    s.reserve((-5, 10))
+    assert s.capacity == (-5, 10)
+    assert s.boundaries == (0, 3)
+    assert len(s) == 3
+    assert list(s) == ['a', 'b', 'c']
+    assert s[7] == '.'
+    assert s[-4] == '.'
+    s[-2] = 'x'
+    assert s.boundaries == (-2, 3)
+    assert s.capacity == (-5, 10)
+    assert f'{s:s}' == 'x.abc'
+
+
+def test_reserve_invalid():
+    s = Array1D('.')
+    with pytest.raises(ValueError):
+        s.reserve((1, 3))
+    t = ArrayND(2, '.')
+    with pytest.raises(ValueError):
+        t.reserve(((-1, -1), (0, 0)))
+
+
+def test_reserve_nd():
+    s = stretchy.array([[1, 2], [3, 4]], default=0)
+    s.reserve(((-3, 4), (-2, 5)))
+    assert s.capacity == ((-3, 4), (-2, 5))
+    assert s.boundaries == ((0, 2), (0, 2))
+    assert s.shape == (2, 2)
+    assert len(s) == 2
+    assert s[-2, 3] == 0
+    assert list(s.items_nondefault()) == [
+        ((0, 0), 1), ((0, 1), 2), ((1, 0), 3), ((1, 1), 4)
+    ]
+    s[-2, 3] = 5
+    assert s.boundaries == ((-2, 2), (0, 4))
+    assert s.capacity == ((-3, 4), (-2, 5))
+    assert f'{s:s}' == '0005\n0000\n1200\n3400'
+
+
+@pytest.mark.parametrize('dim,default,index', [
+    (1, 0, 100),
+    (1, 0, -100),
+    (2, 0, (100, -50)),
+    (3, '.', (-20, 10, 30)),
+])
+def test_geometric_growth(dim, default, index):
+    s = stretchy.empty(dim, default, growth=geometric(2))
+    t = stretchy.empty(dim, default)
+    for i in range(1, 11):
+        if dim == 1:
+            position = index * i // 10
+        else:
+            position = tuple(n * i // 10 for n in index)
+        s[position] = i
+        t[position] = i
+        assert s.boundaries == t.boundaries
+    assert list(s.ndenumerate()) == list(t.ndenumerate())
+    assert repr(s) == repr(t)
+
+
+def test_geometric_capacity():
+    s = Array1D(0, growth=geometric(2))
+    s.enable_stats()
+    for i in range(100):
+        s[i] = i
+    assert s.boundaries == (0, 100)
+    assert s.capacity == (0, 128)
+    assert s.stats()['grow_events'] == 8
+
+
+def test_snapshot_capacity():
+    s = ArrayND(2, 0, growth=geometric())
+    s[3, 3] = 1
+    t = s.snapshot()
+    t[5, 5] = 2
+    assert s.boundaries == ((0, 4), (0, 4))
+    assert t.boundaries == ((0, 6), (0, 6))
+    assert s[5, 5] == 0
+
+
+@pytest.mark.parametrize('operation,boundaries,capacity', [
+    (lambda s: s.trim(), ((0, 2), (0, 2)), ((0, 2), (0, 2))),
+    (lambda s: s.crop_to(((0, 1), (0, 1))), ((0, 1), (0, 1)),
+        ((0, 1), (0, 1))),
+    (lambda s: s.crop_to(((-3, 3), (0, 3))), ((0, 2), (0, 2)),
+        ((-3, 3), (0, 3))),
+    (lambda s: s.shrink_by(1), ((0, 1), (0, 1)), ((0, 1), (0, 1))),
+])
+def test_resize_capacity(operation, boundaries, capacity):
+    s = stretchy.array([[1, 2], [3, 4]], default=0)
+    s.reserve(((-5, 5), (-2, 5)))
+    operation(s)
+    assert s.boundaries == boundaries
+    assert s.capacity == capacity
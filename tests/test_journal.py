@@ -0,0 +1,166 @@
+import pytest
+
+from stretchy import Array1D, ArrayND, Change
+from stretchy.journal import Grow
+
+
+@pytest.fixture
+def array():
+    s = ArrayND(2, '.')
+    s.enable_journal()
+    s[0,0] = 'a'
+    s[1,2] = 'b'
+    s[-1,-1] = 'c'
+    return s
+
+
+def test_disabled():
+    s = Array1D('.')
+    s[0] = 'a'
+    assert s.journal is None
+    with pytest.raises(ValueError):
+        s.undo()
+    with pytest.raises(ValueError):
+        s.checkpoint()
+
+
+def test_record(array):
+    assert len(array.journal) == 3
+    # The write grows the array, the previous boundaries of the planes
+    # along the path are recorded with it
+    assert array.journal._entries[1] == Grow(Change((1,2), '.', 'b'),
+                                             ((0,1), (0,0)))
+    array.disable_journal()
+    array[5,5] = 'x'
+    assert array.journal is None
+
+
+def test_undo_redo(array):
+    assert array.undo() == 1
+    assert array[-1,-1] == '.'
+    assert array.undo(5) == 2
+    assert array[0,0] == '.'
+    assert array[1,2] == '.'
+    assert tuple(array.items_nondefault()) == ()
+    assert array.boundaries == ((0,0), (0,0))
+    assert array.redo(2) == 2
+    assert f'{array:s}' == 'a..\n..b'
+    assert array.redo(2) == 1
+    assert f'{array:s}' == 'c...\n.a..\n...b'
+    assert array.redo() == 0
+
+
+def test_undo_discards(array):
+    array.undo(2)
+    array[2,0] = 'd'
+    assert array.redo() == 0
+    assert len(array.journal) == 2
+
+
+@pytest.mark.parametrize('operation, args, content',
+    (
+        ('trim', (), 'c...\n.a..\n...b'),
+        ('crop_to', (((0,1),(0,3)),), 'a'),
+        ('shrink_by', (1,), 'a..\n..b\n...\n...\n...'),
+        ('replace_content', (['xy'], 1), '...\n.xy'),
+    )
+)
+def test_resize(operation, args, content, array):
+    array[5,5] = '.'
+    before = f'{array:s}'
+    getattr(array, operation)(*args)
+    assert f'{array:s}' == content
+    array.undo()
+    assert f'{array:s}' == before
+    array.redo()
+    assert f'{array:s}' == content
+    array[0,0] = '#'
+    array.undo(2)
+    assert f'{array:s}' == before
+
+
+def test_checkpoint(array):
+    checkpoint = array.checkpoint()
+    array[0,0] = 'x'
+    array.trim()
+    array[3,3] = 'y'
+    array.rollback(checkpoint)
+    assert f'{array:s}' == 'c...\n.a..\n...b'
+    array.rollback(0)
+    assert tuple(array.items_nondefault()) == ()
+    array.redo(4)
+    assert array[0,0] == 'x'
+    array.rollback(checkpoint)
+    array[2,2] = 'z'
+    with pytest.raises(ValueError):
+        array.rollback(checkpoint + 2)
+
+
+def test_onedim():
+    s = Array1D('.', content='abc')
+    s.enable_journal()
+    s[1] = '#'
+    s[-2] = '@'
+    s.crop_to((-1, 2))
+    assert f'{s:s}' == '.a#'
+    s.undo(2)
+    assert f'{s:s}' == 'a#c'
+    s.undo()
+    assert f'{s:s}' == 'abc'
+
+
+def test_diff():
+    s = ArrayND(2, '.', content=['abc', 'def'])
+    t = s.snapshot()
+    t[0,0] = 'x'
+    t[-2,3] = 'y'
+    s[1,1] = 'z'
+    patch = s.diff(t)
+    assert patch == [
+        Change((-2,3), '.', 'y'), Change((0,0), 'a', 'x'), Change((1,1), 'z', 'e')
+    ]
+    s.apply_patch(patch)
+    assert s.diff(t) == []
+    assert f'{s:s}' == f'{t:s}'
+    s.apply_patch(patch, reverse=True)
+    assert f'{s:s}' == '....\n....\nabc.\ndzf.'
+
+
+def test_diff_onedim():
+    s = Array1D(0, content=[1, 2, 3])
+    t = Array1D(0, content=[1, 5], offset=-1)
+    assert s.diff(t) == [Change(-1, 0, 1), Change(0, 1, 5), Change(1, 2, 0), Change(2, 3, 0)]
+    with pytest.raises(ValueError):
+        s.diff(ArrayND(2))
+
+
+def test_undo_growth():
+    g = ArrayND(2, '.', content=['ab', 'cd'])
+    g.enable_journal()
+    checkpoint = g.checkpoint()
+    g[3,3] = '#'
+    g[-1,5] = 'x'
+    g[0,0] = 'z'
+    g.rollback(checkpoint)
+    assert g.boundaries == ((0,2), (0,2))
+    assert f'{g:s}' == 'ab\ncd'
+    g.redo(3)
+    assert g.boundaries == ((-1,4), (0,6))
+    assert (g[3,3], g[-1,5], g[0,0]) == ('#', 'x', 'z')
+    a = Array1D('.')
+    a.enable_journal()
+    a[5] = '#'
+    a.undo()
+    assert a.boundaries == (0, 0)
+
+
+def test_undo_growth_deep():
+    s = ArrayND(3, 0)
+    s[0,0,0] = 1
+    t = s.snapshot()
+    s.enable_journal()
+    s[2,-3,4] = 2
+    s[0,0,7] = 3
+    s.undo(2)
+    assert s.boundaries == ((0,1), (0,1), (0,1))
+    assert s.tolist() == t.tolist() == [[[1]]]
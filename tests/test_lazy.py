@@ -0,0 +1,166 @@
+import itertools
+import operator
+import random
+
+import pytest
+
+import stretchy
+from stretchy import (Array1D, ArrayND, BitArray1D, Expression,
+                      PaletteArrayND, RunArray1D)
+
+
+def randomized(make, dim, seed):
+    rnd = random.Random(seed)
+    s = make()
+    for _ in range(30):
+        index = tuple(rnd.randrange(-6, 6) for _ in range(dim))
+        s[index[0] if dim == 1 else index] = rnd.randrange(1, 5)
+    return s
+
+
+def reference(function, *arrays):
+    # Cell by cell, over the union of the boundaries
+    region = [(min(b[0] for b in bounds), max(b[1] for b in bounds))
+                  for bounds in zip(*(a._region(None) for a in arrays))]
+    cells = {index: function(*(a[index[0] if len(index) == 1 else index]
+                                   for a in arrays))
+                 for index in itertools.product(*(range(*b) for b in region))}
+    return region, cells
+
+
+def check(expression, function, *arrays):
+    region, cells = reference(function, *arrays)
+    result = expression.evaluate()
+    assert result._region(None) == tuple(region)
+    assert result._default == expression.default \
+        == function(*(a._default for a in arrays))
+    for index, value in cells.items():
+        assert result[index[0] if len(index) == 1 else index] == value
+
+
+OPERATIONS = [
+    (lambda a, b: a.lazy() + b, operator.add),
+    (lambda a, b: a.lazy() - b, operator.sub),
+    (lambda a, b: b * a.lazy(), operator.mul),
+    (lambda a, b: a.lazy() // (b.lazy() + 1), lambda x, y: x // (y + 1)),
+    (lambda a, b: (a.lazy() + b) * 3 > 7, lambda x, y: (x + y) * 3 > 7),
+    (lambda a, b: -a.lazy() % 3 == b, lambda x, y: -x % 3 == y),
+    (lambda a, b: abs(a.lazy() - b) ** 2, lambda x, y: abs(x - y) ** 2),
+    (lambda a, b: a.lazy() & b | ~a.lazy(), lambda x, y: x & y | ~x),
+    (lambda a, b: a.lazy().map(str) + 'x', lambda x, y: str(x) + 'x'),
+]
+
+
+@pytest.mark.parametrize('build, function', OPERATIONS)
+@pytest.mark.parametrize('dim', [1, 2, 3])
+def test_operations(build, function, dim):
+    a = randomized(lambda: stretchy.empty(dim, 0), dim, 1)
+    b = randomized(lambda: stretchy.empty(dim, 0), dim, 2)
+    expression = build(a, b)
+    assert isinstance(expression, Expression)
+    check(expression, function, a, b)
+
+
+@pytest.mark.parametrize('a', [
+    RunArray1D(0, content=[0, 0, 3, 3, 3, 0, 1], offset=-3),
+    BitArray1D(0, on=1, content=[1, 0, 1, 1], offset=-2),
+    PaletteArrayND(2, 0, content=[[0, 1, 2], [3, 0, 0]], offset=(-1, 1)),
+])
+def test_storages(a):
+    dim = a.dim
+    b = randomized(lambda: stretchy.empty(dim, 2), dim, 4)
+    check(a.lazy() * 10 + b, lambda x, y: x * 10 + y, a, b)
+
+
+def test_boundaries_inferred():
+    a = stretchy.array([[1, 2], [3, 4]], default=0, offset=(-1, 2))
+    b = stretchy.array([[1]], default=0, offset=(3, -3))
+    expression = a.lazy() + b
+    assert expression.boundaries == ((-1, 4), (-3, 4))
+    assert expression.offset == (-1, -3)
+    assert expression.shape == (5, 7)
+    assert len(expression) == 5
+    assert expression._result is None
+    assert expression.evaluate().boundaries == expression.boundaries
+
+
+def test_default_rows_skipped():
+    a = ArrayND(2, 0)
+    a[0, 0] = 1
+    a[1000, 1000] = 1
+    expression = a.lazy() + 1
+    assert expression.default == 1
+    result = expression.evaluate()
+    assert result[0, 0] == 2 and result[500, 500] == 1
+    # Only the rows holding non-default cells of the operand are written
+    assert sum(plane is not None and len(plane) > 0
+                   for plane in result._planes()) <= 3
+    assert result[0].boundaries == (0, 1)
+
+
+def test_snapshot_and_cache():
+    a = stretchy.array([1, 2, 3], default=0)
+    expression = a.lazy() * 2
+    a[0] = 10
+    assert expression[0] == 2
+    assert expression.evaluate() is expression.evaluate()
+    assert expression.tolist() == [2, 4, 6]
+    assert list(expression) == [2, 4, 6]
+    assert f'{expression}' == '2 4 6'
+
+
+def test_single_cell():
+    a = stretchy.array([[1, 2], [3, 4]], default=0)
+    expression = a.lazy() + a
+    assert expression[1, 1] == 8
+    assert expression[5, 5] == 0
+    assert expression._result is None
+    with pytest.raises(TypeError):
+        expression[1]
+
+
+def test_operands():
+    a = stretchy.array([[1, 2], [3, 4]], default=0)
+    view = a.transpose()
+    assert (a.lazy() - view).tolist() == [[0, -1], [1, 0]]
+    assert (a.lazy() + a.freeze()).tolist() == [[2, 4], [6, 8]]
+    with pytest.raises(ValueError):
+        a.lazy() + Array1D(0)
+    with pytest.raises(TypeError):
+        bool(a.lazy() == a)
+
+
+def test_paste():
+    a = stretchy.array([[1, 0], [0, 2]], default=0)
+    s = ArrayND(2, 5)
+    s.paste(a.lazy() * 3, (1, 1))
+    assert s.tolist(((1, 3), (1, 3))) == [[3, 5], [5, 6]]
+
+
+def test_empty():
+    expression = ArrayND(2, 0).lazy() + 1
+    assert expression.boundaries == ((0, 0), (0, 0))
+    assert len(expression.evaluate()) == 0
+
+
+def test_undefined_default():
+    a = stretchy.array([[2, 4], [9, 8]], default=0)
+    b = stretchy.array([[1, 2], [3, 4]], default=0)
+    with pytest.raises(ZeroDivisionError):
+        (a.lazy() / b).default
+    # Every cell of the region is computed, the result has no default
+    result = (a.lazy() / b).evaluate()
+    assert result._default is None
+    assert result.tolist() == [[2.0, 2.0], [3.0, 2.0]]
+    assert (a.lazy() // b).tolist() == [[2, 2], [3, 2]]
+    c = stretchy.array([[1, 2]], default=0)
+    with pytest.raises(ZeroDivisionError):
+        (a.lazy() / c).evaluate()
+    # A given default skips the default cells
+    expression = a.lazy() // b.lazy().map(lambda x: x or 1)
+    assert expression.evaluate(0).tolist() == [[2, 2], [3, 2]]
+    d = stretchy.array([[1, 2], [3, 4]], default=5, offset=(3, 3))
+    result = (d.lazy() - d).evaluate(default=0)
+    assert result._default == 0
+    assert result.boundaries == d.boundaries
+    assert not list(result.items_nondefault())
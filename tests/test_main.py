@@ -90,3 +90,33 @@ def test_empty(params, dim, default):
     else:
         pos = (2,) * dim
     assert array[pos] == default
+
+
+def rows_generator(content):
+    # Nested generators, which can be consumed only once
+    for row in content:
+        if isinstance(row, list):
+            yield rows_generator(row)
+        else:
+            yield row
+
+
+@pytest.mark.parametrize('params, dim, content, offset',
+    (
+        ({'rows':[]}, 1, '', 0),
+        ({'rows':'abc'}, 1, 'a,b,c', 0),
+        ({'rows':rows_generator(['ab','cd'])}, 1, 'ab,cd', 0),
+        ({'rows':rows_generator(['ab','cd']), 'dim':2}, 2, 'a,b\nc,d', (0,)*2),
+        ({'rows':rows_generator([['a','b'],['c','d']])}, 2, 'a,b\nc,d', (0,)*2),
+        ({'rows':rows_generator([[],['c','d']])}, 2, ',\nc,d', (0,)*2),
+        ({'rows':rows_generator([[['a'],['b']],[['c']]])}, 3, 'a\nb\n\nc\n', (0,)*3),
+        ({'rows':(line.rstrip('\n') for line in ['ab\n','cd\n']), 'dim':2,
+          'offset':(-1,2)}, 2, ',,a,b\n,,c,d', (-1,0)),
+        ({'rows':rows_generator([[1,2],[3]]), 'default':0}, 2, '1,2\n3,0', (0,)*2),
+    )
+)
+def test_from_rows(params, dim, content, offset):
+    array = stretchy.from_rows(**params)
+    assert array.dim == dim
+    assert array.offset == offset
+    assert f'{array:s,}' == content
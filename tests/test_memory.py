@@ -0,0 +1,99 @@
+import sys
+
+import pytest
+
+import stretchy
+from stretchy import Array1D, ArrayND
+from stretchy.format import Formatter, StrFormatter, ReprFormatter
+
+
+@pytest.mark.parametrize('obj', [
+    Array1D(),
+    ArrayND(2),
+])
+def test_slots(obj):
+    assert not hasattr(obj, '__dict__')
+    with pytest.raises(AttributeError):
+        obj.unknown = 1
+
+
+def test_formatter_defaults():
+    assert Formatter().sep == ' '
+    assert StrFormatter().begin == '['
+    assert ReprFormatter().literal
+    assert not StrFormatter().literal
+
+
+def test_formatter_subclass():
+    # Settings overridden as class attributes are kept
+    class Custom(StrFormatter):
+        sep = '|'
+        begin = '<'
+        _literal = True
+    formatter = Custom('.')
+    assert (formatter.sep, formatter.begin, formatter.end) == ('|', '<', ']')
+    assert formatter.literal
+    formatter.apply_format_string('s,')
+    assert formatter.sep == ',' and Custom.sep == '|'
+    assert Formatter().sep == ' '
+
+
+def test_usage_1d():
+    s = Array1D(0, content=range(100))
+    usage = s.memory_usage()
+    assert usage['container'] == sys.getsizeof(s)
+    assert usage['planes'] == 0
+    assert usage['lists'] == sys.getsizeof(s._pos) + sys.getsizeof(s._neg)
+    assert usage['cells'] == 0
+    assert usage['total'] == usage['container'] + usage['lists']
+
+
+def test_usage_payload():
+    s = Array1D(None, content=['ab', 'ab', 'cde', None])
+    usage = s.memory_usage(payload=True)
+    assert usage['cells'] == sys.getsizeof('ab') + sys.getsizeof('cde') \
+        + sys.getsizeof(None)
+
+
+def planes_of(array):
+    for plane in array._allplanes():
+        if plane is not None:
+            yield plane
+            if isinstance(plane, ArrayND):
+                yield from planes_of(plane)
+
+
+@pytest.mark.parametrize('dim,cell,planes', [
+    (2, (3, 2), 1),
+    (2, (-2, 5), 1),
+    (3, (1, 1, 1), 2),
+    (3, (2, -1, 3), 2),
+])
+def test_usage_nd(dim, cell, planes):
+    s = stretchy.empty(dim, 0)
+    s[cell] = 1
+    usage = s.memory_usage()
+    shallow = s.memory_usage(deep=False)
+    assert len(list(planes_of(s))) == planes
+    assert usage['planes'] == sum(map(sys.getsizeof, planes_of(s)))
+    assert shallow['planes'] == 0
+    assert shallow['lists'] < usage['lists']
+    assert usage['total'] == sum(usage[key]
+        for key in ('container', 'planes', 'lists', 'cells'))
+
+
+def test_usage_capacity():
+    s = ArrayND(2, 0, content=[[1, 2], [3, 4]])
+    before = s.memory_usage()
+    s.reserve(((0, 2), (0, 100)))
+    after = s.memory_usage()
+    assert after['planes'] == before['planes']
+    assert after['lists'] > before['lists']
+
+
+def test_usage_abstract():
+    # Storages must account for their own memory
+    class Storage(stretchy.abc.Array, stretchy.memory.Measured):
+        pass
+    with pytest.raises(TypeError):
+        Storage()
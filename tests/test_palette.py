@@ -0,0 +1,152 @@
+import random
+
+import pytest
+
+import stretchy
+from stretchy import Array1D, ArrayND, Palette, PaletteArray1D, PaletteArrayND
+
+
+def same(s, t):
+    assert s.boundaries == t.boundaries
+    assert len(s) == len(t)
+    assert list(s.ndenumerate()) == list(t.ndenumerate())
+    assert list(s.items_nondefault()) == list(t.items_nondefault())
+    for format in ('', 's', 'a', 'l', 's,b<e>', 'r'):
+        assert f'{s:{format}}' == f'{t:{format}}'
+    assert str(s) == str(t)
+
+
+@pytest.mark.parametrize('dim', [1, 2, 3])
+@pytest.mark.parametrize('seed', range(3))
+def test_random_writes(dim, seed):
+    rnd = random.Random(seed)
+    if dim == 1:
+        s = PaletteArray1D('.')
+    else:
+        s = PaletteArrayND(dim, '.')
+    t = stretchy.empty(dim, '.')
+    for _ in range(150):
+        index = tuple(rnd.randrange(-12, 12) for _ in range(dim))
+        if dim == 1:
+            index = index[0]
+        value = rnd.choice(['.', '#', 'ab', None, 42])
+        s[index] = value
+        t[index] = value
+        assert s[index] == t[index]
+    same(s, t)
+    assert len(s.palette) <= 5
+
+
+@pytest.mark.parametrize('content,offset', [
+    ([1, 0, 1, 2], -2),
+    ([0, 'x'], 3),
+    (list(range(20)), -7),
+    ([], 0),
+])
+def test_replace_content(content, offset):
+    s = PaletteArray1D(0, content=content, offset=offset)
+    t = Array1D(0, content=content, offset=offset)
+    same(s, t)
+    assert list(s) == list(t)
+
+
+@pytest.mark.parametrize('operation', [
+    lambda u: u.trim(),
+    lambda u: u.crop_to((-3, 4)),
+    lambda u: u.crop_to((0, 0)),
+    lambda u: u.shrink_by(2),
+    lambda u: u.shrink_by((0, 6)),
+    lambda u: u.__setitem__(slice(-6, 10, 3), 'z'),
+])
+def test_resize(operation):
+    content = [0, 0, 'a', 'b', 0, 'a', 'c', 'a', 0, 0, 0, 0]
+    s = PaletteArray1D(0, content=content, offset=-4)
+    t = Array1D(0, content=content, offset=-4)
+    operation(s)
+    operation(t)
+    same(s, t)
+    s[9] = 0
+    t[9] = 0
+    s[-9] = 0
+    t[-9] = 0
+    same(s, t)
+
+
+def test_wide_codes():
+    s = PaletteArray1D(-1)
+    t = Array1D(-1)
+    for i in range(600):
+        s[i - 300] = i
+        t[i - 300] = i
+    assert s._pos.typecode == 'H'
+    assert len(s.palette) == 601
+    same(s, t)
+    palette = Palette()
+    for i in range(0xffff):
+        palette.encode(i)
+    with pytest.raises(ValueError):
+        palette.encode('one too many')
+
+
+def test_palette():
+    palette = Palette('.')
+    assert palette.encode('.') == 0
+    assert palette.encode('#') == 1
+    assert palette.encode('#') == 1
+    assert palette.values == ('.', '#')
+    s = PaletteArrayND(2, '.', palette=palette, content=['#o', 'o.'])
+    assert s.palette is palette
+    assert s[0].palette is palette
+    assert palette.values == ('.', '#', 'o')
+    with pytest.raises(ValueError):
+        PaletteArray1D('x', palette=palette)
+    with pytest.raises(ValueError):
+        PaletteArrayND(2, 'x', palette=palette)
+    assert palette.values == ('.', '#', 'o')
+
+
+def test_snapshot():
+    s = PaletteArrayND(2, '.', content=['#.', '.#'])
+    t = s.snapshot()
+    assert isinstance(t, PaletteArrayND)
+    assert isinstance(t[0], PaletteArray1D)
+    t[0, 1] = '#'
+    t[5, 5] = 'x'
+    assert f'{s:s}' == '#.\n.#'
+    assert f'{t:s}' == '##....\n.#....\n......\n......\n......\n.....x'
+    assert t.palette is s.palette
+
+
+def test_journal():
+    s = PaletteArray1D('.', content='abc')
+    s.enable_journal()
+    s[1] = 'x'
+    s[5] = 'y'
+    s.undo(2)
+    assert s.tolist() == list('abc')
+
+
+def test_repr():
+    s = PaletteArrayND(2, '.')
+    s[1, 1] = '#'
+    assert repr(s) == "PaletteArrayND(dim=2, default='.', " \
+        "offset=(0, 0), content=\n[['.', '.'],\n ['.', '#']])"
+    assert repr(s[1]) == "PaletteArray1D(default='.', offset=0, " \
+        "content=['.', '#'])"
+
+
+def test_render():
+    s = PaletteArrayND(2, 0, content=[[1, 2], [3, 4]])
+    renderer = stretchy.Renderer('a').bind(s)
+    assert renderer.render() == '1 2\n3 4'
+    s[0, 0] = 10
+    assert renderer.render() == '10  2\n 3  4'
+
+
+def test_memory():
+    s = PaletteArrayND(2, '.')
+    t = ArrayND(2, '.')
+    for u in (s, t):
+        for i in range(64):
+            u[i, 999] = '#'
+    assert s.memory_usage()['lists'] * 4 < t.memory_usage()['lists']
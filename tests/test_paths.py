@@ -0,0 +1,156 @@
+import heapq
+import itertools
+import math
+import random
+
+import pytest
+
+import stretchy
+from stretchy import PaletteArrayND, RunArray1D
+
+CONNECTIVITY = {'manhattan': 1, 'chebyshev': None}
+
+
+def steps(dim, connectivity):
+    for offset in itertools.product((-1, 0, 1), repeat=dim):
+        if 0 < sum(map(bool, offset)) <= (connectivity or dim):
+            yield offset
+
+
+def reference(array, sources, region, passable, metric):
+    # Dijkstra's algorithm cell by cell through `__getitem__`
+    dim = len(region)
+    get = (lambda index: array[index]) if dim > 1 \
+        else (lambda index: array[index[0]])
+    connectivity = CONNECTIVITY.get(metric)
+    distances = {}
+    queue = [(0, source) for source in sources]
+    while queue:
+        distance, index = heapq.heappop(queue)
+        if index in distances:
+            continue
+        distances[index] = distance
+        for offset in steps(dim, connectivity):
+            other = tuple(i + o for i, o in zip(index, offset))
+            if other not in distances \
+                    and all(low <= i < high for i, (low, high) in zip(other, region)) \
+                    and passable(get(other)):
+                length = math.sqrt(sum(map(abs, offset))) \
+                    if metric == 'euclidean' else 1
+                heapq.heappush(queue, (distance + length, other))
+    return distances
+
+
+def random_grid(rnd, dim, factory=None):
+    array = factory() if factory else stretchy.empty(dim, '.')
+    for _ in range(25 * dim):
+        index = tuple(rnd.randrange(-5, 5) for _ in range(dim))
+        array[index if dim > 1 else index[0]] = '#'
+    return array
+
+
+def passable(value):
+    return value != '#'
+
+
+@pytest.mark.parametrize('metric', ['manhattan', 'chebyshev', 'euclidean'])
+@pytest.mark.parametrize('dim', [1, 2, 3])
+@pytest.mark.parametrize('seed', range(3))
+def test_distance_field(metric, dim, seed):
+    rnd = random.Random(seed)
+    array = random_grid(rnd, dim)
+    region = tuple((low - 1, high + 1) for low, high in
+                   ((array.boundaries,) if dim == 1 else array.boundaries))
+    sources = [tuple(rnd.randrange(low, high) for low, high in region)
+                   for _ in range(2)]
+    field = array.distance_field(
+        [source if dim > 1 else source[0] for source in sources], passable,
+        metric, bounds=region if dim > 1 else region[0])
+    expected = reference(array, sources, region, passable, metric)
+    assert field.boundaries == (region if dim > 1 else region[0])
+    for index, distance in field.ndenumerate():
+        index = index if dim > 1 else (index,)
+        if index in expected:
+            assert distance == pytest.approx(expected[index])
+        else:
+            assert distance is None
+
+
+def test_distance_field_limit():
+    array = stretchy.parse('.#..\n.#..\n....', default='.')
+    field = array.distance_field([(0, 0)], passable, limit=3)
+    assert field.tolist() == [
+        [0, None, None, None],
+        [1, None, None, None],
+        [2, 3, None, None],
+    ]
+    field = array.distance_field([(0, 0), (0, 3)], metric='chebyshev')
+    assert field.tolist() == [[0, 1, 1, 0], [1, 1, 1, 1], [2, 2, 2, 2]]
+    with pytest.raises(ValueError):
+        array.distance_field([(5, 5)])
+    with pytest.raises(ValueError):
+        array.distance_field([(0, 0)], metric='taxicab')
+
+
+@pytest.mark.parametrize('metric', ['manhattan', 'chebyshev', 'euclidean'])
+@pytest.mark.parametrize('factory', [
+    lambda: stretchy.empty(2, '.'),
+    lambda: PaletteArrayND(2, '.'),
+])
+@pytest.mark.parametrize('seed', range(3))
+def test_shortest_path(metric, factory, seed):
+    rnd = random.Random(seed)
+    array = random_grid(rnd, 2, factory)
+    a = (rnd.randrange(-5, 5), rnd.randrange(-5, 5))
+    b = (rnd.randrange(-5, 5), rnd.randrange(-5, 5))
+    array[a] = array[b] = '.'
+    region = array.boundaries
+    path = array.shortest_path(a, b, lambda value: None if value == '#' else 1,
+                               metric)
+    expected = reference(array, [a], region, passable, metric)
+    if b not in expected:
+        assert path is None
+        return
+    assert path[0] == a and path[-1] == b
+    length = 0
+    connectivity = CONNECTIVITY.get(metric)
+    for cell, other in zip(path, path[1:]):
+        offset = tuple(j - i for i, j in zip(cell, other))
+        assert offset in set(steps(2, connectivity))
+        assert array[other] != '#'
+        length += math.sqrt(sum(map(abs, offset))) \
+            if metric == 'euclidean' else 1
+    assert length == pytest.approx(expected[b])
+
+
+def test_shortest_path_cost():
+    array = stretchy.parse('.~~.\n.~~.\n....', default='.')
+    cost = {'.': 1, '~': 4}.get
+    assert array.shortest_path((0, 0), (0, 3), cost) == \
+        [(0, 0), (1, 0), (2, 0), (2, 1), (2, 2), (2, 3), (1, 3), (0, 3)]
+    assert array.shortest_path((0, 0), (0, 3), {'.': 1, '~': 1.5}.get) == \
+        [(0, 0), (0, 1), (0, 2), (0, 3)]
+    with pytest.raises(ValueError):
+        array.shortest_path((0, 0), (0, 3), lambda value: 0.5)
+
+
+def test_shortest_path_outside():
+    array = stretchy.parse('...\n###\n...', default='.')
+    wall = lambda value: None if value == '#' else 1
+    assert array.shortest_path((0, 1), (2, 1), wall) is None
+    path = array.shortest_path((0, 1), (2, 1), wall,
+                               bounds=((0, 3), (0, 4)))
+    assert path == [(0, 1), (0, 2), (0, 3), (1, 3), (2, 3), (2, 2), (2, 1)]
+    assert array.boundaries == ((0, 3), (0, 3))
+    assert array.shortest_path((0, 0), (0, 5), wall) == \
+        [(0, j) for j in range(6)]
+    assert array.shortest_path((0, 1), (2, 1), wall,
+                               bounds=((0, 2), (0, 3))) is None
+
+
+def test_1d():
+    array = RunArray1D('.', content='..#..', offset=-2)
+    assert array.shortest_path(-2, 2, lambda value: 1) == [-2, -1, 0, 1, 2]
+    assert array.shortest_path(-2, 2, {'.': 1}.get) is None
+    assert array.distance_field([1], passable, bounds=(-2, 5)).tolist() == \
+        [None, None, None, 0, 1, 2, 3]
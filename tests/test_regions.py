@@ -0,0 +1,238 @@
+import itertools
+import random
+
+import pytest
+
+import stretchy
+from stretchy import BitArrayND, PaletteArrayND, RunArray1D
+
+
+def neighbours(index, connectivity):
+    for offset in itertools.product((-1, 0, 1), repeat=len(index)):
+        if 0 < sum(map(bool, offset)) <= connectivity:
+            yield tuple(i + o for i, o in zip(index, offset))
+
+
+def inside(index, region):
+    return all(low <= i < high for i, (low, high) in zip(index, region))
+
+
+def component(array, start, region, connectivity, test):
+    # Reference: breadth-first search cell by cell
+    get = (lambda index: array[index]) if array.dim > 1 \
+        else (lambda index: array[index[0]])
+    seen = {start}
+    queue = [start]
+    for index in queue:
+        for other in neighbours(index, connectivity):
+            if other not in seen and inside(other, region) and test(get(other)):
+                seen.add(other)
+                queue.append(other)
+    return seen
+
+
+def random_grid(rnd, dim, factory=None):
+    array = factory() if factory else stretchy.empty(dim, '.')
+    for _ in range(30 * dim):
+        index = tuple(rnd.randrange(-5, 5) for _ in range(dim))
+        array[index if dim > 1 else index[0]] = '#'
+    return array
+
+
+def region_of(array):
+    return (array.boundaries,) if array.dim == 1 else array.boundaries
+
+
+@pytest.mark.parametrize('dim', [1, 2, 3])
+@pytest.mark.parametrize('seed', range(4))
+def test_flood_fill(dim, seed):
+    rnd = random.Random(seed)
+    for connectivity in range(1, dim + 1):
+        array = random_grid(rnd, dim)
+        expected = array.snapshot()
+        region = region_of(array)
+        start = tuple(rnd.randrange(low, high) for low, high in region)
+        key = start if dim > 1 else start[0]
+        cells = component(array, start, region, connectivity,
+                          lambda value: value == array[key])
+        for index in cells:
+            expected[index if dim > 1 else index[0]] = 'o'
+        assert array.flood_fill(key, 'o', connectivity) == len(cells)
+        assert array.tolist() == expected.tolist()
+
+
+@pytest.mark.parametrize('factory', [
+    lambda: stretchy.empty(2, '.'),
+    lambda: BitArrayND(2, '.', on='#'),
+    lambda: PaletteArrayND(2, '.'),
+])
+def test_flood_fill_bounds(factory):
+    array = factory()
+    array[1, 1] = '#'
+    assert array.flood_fill((0, 0), '#', bounds=((-2, 3), (-1, 2))) == 14
+    assert array.boundaries == ((-2, 3), (-1, 2))
+    assert f'{array:s}' == '###\n###\n###\n###\n###'
+    assert array.flood_fill((9, 9), '.') == 0
+    assert array.flood_fill((0, 0), '#') == 0
+
+
+def test_flood_fill_1d():
+    array = RunArray1D('.', content='..#....#.', offset=-3)
+    assert array.flood_fill(1, 'x', bounds=(-5, 10)) == 4
+    assert f'{array:s}' == '..#xxxx#.'
+    assert array.flood_fill(-5, 'y') == 0
+    assert array.flood_fill(-4, 'y', bounds=(-6, 0)) == 5
+    assert f'{array:s}' == 'yyyyy#xxxx#.'
+
+
+def test_flood_fill_journal_and_renderer():
+    array = stretchy.parse('#..\n#.#\n###', default='.')
+    renderer = stretchy.Renderer('s').bind(array)
+    assert renderer.render() == '#..\n#.#\n###'
+    array.enable_journal()
+    assert array.flood_fill((0, 1), 'o') == 3
+    assert renderer.render() == '#oo\n#o#\n###'
+    array.undo(3)
+    assert renderer.render() == '#..\n#.#\n###'
+    array.disable_journal()
+    assert array.flood_fill((2, 0), '.', connectivity=2) == 6
+    assert renderer.render() == '...\n...\n...'
+
+
+@pytest.mark.parametrize('dim', [1, 2, 3])
+@pytest.mark.parametrize('seed', range(4))
+def test_label(dim, seed):
+    rnd = random.Random(seed)
+    array = random_grid(rnd, dim)
+    region = region_of(array)
+    for connectivity in range(1, dim + 1):
+        labels, sizes = array.label(lambda value: value == '#', connectivity)
+        assert labels.boundaries == array.boundaries
+        assert sorted(sizes) == list(range(1, len(sizes) + 1))
+        seen = set()
+        for index, label in labels.ndenumerate():
+            index = index if dim > 1 else (index,)
+            value = array[index if dim > 1 else index[0]]
+            assert (label != 0) == (value == '#')
+            if label and label not in seen:
+                # Labels are numbered in row-major order
+                assert label == len(seen) + 1
+                seen.add(label)
+                cells = component(array, index, region, connectivity,
+                                  lambda value: value == '#')
+                assert len(cells) == sizes[label]
+                assert all(labels[i if dim > 1 else i[0]] == label
+                           for i in cells)
+
+
+def test_label_default():
+    array = stretchy.parse('#.\n..\n.#', default='.')
+    labels, sizes = array.label(lambda value: value == '.')
+    assert sizes == {1: 4}
+    assert f'{labels:s}' == '01\n11\n10'
+    labels, sizes = array.label(lambda value: value == '#', connectivity=2)
+    assert sizes == {1: 1, 2: 1}
+    with pytest.raises(ValueError):
+        array.label(bool, connectivity=3)
+
+
+FACTORIES = {
+    1: [lambda: stretchy.empty(1, '.'), lambda: RunArray1D('.'),
+        lambda: stretchy.PaletteArray1D('.'),
+        lambda: stretchy.BitArray1D('.', on='#')],
+    2: [lambda: stretchy.empty(2, '.'), lambda: PaletteArrayND(2, '.'),
+        lambda: BitArrayND(2, '.', on='#')],
+    3: [lambda: stretchy.empty(3, '.')],
+}
+
+
+CASES = [(dim, factory) for dim, factories in FACTORIES.items()
+             for factory in factories]
+
+
+def key(index):
+    return index if len(index) > 1 else index[0]
+
+
+@pytest.mark.parametrize('dim,factory', CASES)
+@pytest.mark.parametrize('seed', range(3))
+def test_fill(dim, factory, seed):
+    rnd = random.Random(seed)
+    array = random_grid(rnd, dim, factory)
+    expected = random_grid(random.Random(seed), dim)
+    for value in '#.':
+        region = []
+        for _ in range(dim):
+            low = rnd.randrange(-8, 6)
+            region.append((low, low + rnd.randrange(0, 5)))
+        array.fill(region if dim > 1 else region[0], value)
+        if all(low < high for low, high in region):
+            for index in itertools.product(*(range(*b) for b in region)):
+                expected[key(index)] = value
+        assert array.boundaries == expected.boundaries
+        assert array.tolist() == expected.tolist()
+
+
+@pytest.mark.parametrize('dim,factory', CASES)
+@pytest.mark.parametrize('mask_default', [True, False])
+@pytest.mark.parametrize('seed', range(3))
+def test_paste(dim, factory, mask_default, seed):
+    rnd = random.Random(seed)
+    array = random_grid(rnd, dim, factory)
+    expected = random_grid(random.Random(seed), dim)
+    other = stretchy.empty(dim, '.')
+    for _ in range(8):
+        other[key(tuple(rnd.randrange(-3, 3) for _ in range(dim)))] = '#'
+    shift = tuple(rnd.randrange(-6, 6) for _ in range(dim))
+    array.paste(other, shift if dim > 1 else shift[0], mask_default)
+    bounds = (other.boundaries,) if dim == 1 else other.boundaries
+    for index in itertools.product(*(range(*b) for b in bounds)):
+        value = other[key(index)]
+        target = key(tuple(i + s for i, s in zip(index, shift)))
+        if value != '.' or not mask_default:
+            expected[target] = value
+        else:
+            # Masked cells are not written, but the array covers them
+            expected[target] = expected[target]
+    assert array.boundaries == expected.boundaries
+    assert array.tolist() == expected.tolist()
+
+
+def test_paste_self_and_views():
+    array = stretchy.parse('ab\ncd', default='.')
+    array.paste(array, (1, 1))
+    assert f'{array:s}' == 'ab.\ncab\n.cd'
+    expected = array.snapshot()
+    expected.paste(array.rot90().materialize(), (1, 1))
+    array.paste(array.rot90(), (1, 1))
+    assert array.tolist() == expected.tolist()
+    array = stretchy.parse('ab\ncd', default='.')
+    array.paste(array.flip(1), (0, 4))
+    assert f'{array:s}' == 'abba\ncddc'
+    with pytest.raises(ValueError):
+        array.paste(stretchy.empty(3))
+    with pytest.raises(TypeError):
+        array.paste(array, (1, 2, 3))
+
+
+def test_fill_grows_once():
+    array = stretchy.empty(2, 0)
+    array.enable_stats()
+    array.fill(((-50, 50), (-50, 50)), 1)
+    # Two extensions of the top plane lists and of every row
+    assert array.stats()['grow_events'] == 2 + 2 * 100
+    assert array.boundaries == ((-50, 50), (-50, 50))
+    assert sum(1 for _ in array.items_nondefault()) == 10000
+
+
+def test_fill_paste_journal_and_renderer():
+    array = stretchy.parse('ab\ncd', default='.')
+    renderer = stretchy.Renderer('s').bind(array)
+    assert renderer.render() == 'ab\ncd'
+    array.fill(((1, 2), (0, 2)), 'x')
+    assert renderer.render() == 'ab\nxx'
+    array.enable_journal()
+    array.paste(stretchy.parse('.y', default='.'), (0, 0))
+    assert renderer.render() == 'ay\nxx'
+    array.undo()
+    assert renderer.render() == 'ab\nxx'
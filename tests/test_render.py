@@ -0,0 +1,136 @@
+import random
+
+import pytest
+
+import stretchy
+from stretchy import Array1D, ArrayND, Renderer
+
+
+@pytest.mark.parametrize('format', ['', 's', 'a', 'l', 'as, r;b<e>', 'la'])
+@pytest.mark.parametrize('dim', [1, 2, 3])
+def test_render_matches_format(format, dim):
+    rnd = random.Random(dim)
+    s = stretchy.empty(dim, 0)
+    renderer = Renderer(format).bind(s)
+    assert renderer.render() == f'{s:{format}}'
+    for i in range(60):
+        index = tuple(rnd.randrange(-4, 5) for _ in range(dim))
+        s[index[0] if dim == 1 else index] = rnd.choice([1, 22, 333, 0])
+        if i % 3 == 0:
+            assert renderer.render() == f'{s:{format}}'
+    assert renderer.render() == f'{s:{format}}'
+
+
+def test_render_index():
+    s = ArrayND(3, '.')
+    s.index_format = '#{}'
+    renderer = Renderer('ias').bind(s)
+    s[1, 0, 2] = 'x'
+    assert renderer.render() == f'{s:ias}'
+    s[0, 1, 1] = 'y'
+    assert renderer.render() == f'{s:ias}'
+
+
+def test_incremental():
+    s = stretchy.array([[1, 2, 3], [4, 5, 6], [7, 8, 9]], default=0)
+    s.enable_stats()
+    renderer = Renderer('s').bind(s)
+    assert renderer.render() == '123\n456\n789'
+    assert s.stats()['cells_rendered'] == 9
+    s[1, 1] = 0
+    assert renderer.render() == '123\n406\n789'
+    assert s.stats()['cells_rendered'] == 12
+    assert renderer.render() == '123\n406\n789'
+    assert s.stats()['cells_rendered'] == 12
+    s[3, 0] = 1
+    assert renderer.render() == '123\n406\n789\n100'
+    assert s.stats()['cells_rendered'] == 15
+
+
+def test_layout_change():
+    s = stretchy.array([[1, 2], [3, 4]], default=0)
+    renderer = Renderer('a').bind(s)
+    assert renderer.render() == '1 2\n3 4'
+    s[0, 0] = 10
+    assert renderer.render() == '10  2\n 3  4'
+    s[1, 2] = 5
+    assert renderer.render() == f'{s:a}'
+
+
+@pytest.mark.parametrize('operation', [
+    lambda s: s.trim(),
+    lambda s: s.crop_to(((0, 1), (0, 2))),
+    lambda s: s.shrink_by(1),
+    lambda s: s.replace_content([[7, 7], [7, 7]]),
+])
+def test_resize_invalidates(operation):
+    s = stretchy.array([[1, 2], [3, 4]], default=0)
+    s[-1, -1] = 0
+    renderer = Renderer('s').bind(s)
+    renderer.render()
+    operation(s)
+    assert renderer.render() == f'{s:s}'
+
+
+def test_undo_invalidates():
+    s = stretchy.array([[1, 2], [3, 4]], default=0)
+    s.enable_journal()
+    renderer = Renderer('s').bind(s)
+    s.replace_content([[5]])
+    assert renderer.render() == '5'
+    s.undo()
+    assert renderer.render() == '12\n34'
+    s.undo()
+    s.redo()
+    assert renderer.render() == '5'
+
+
+def test_view_writes():
+    s = ArrayND(3, 0)
+    renderer = Renderer('s').bind(s)
+    renderer.render()
+    s[2,][1, 1] = 5
+    assert renderer.render() == f'{s:s}'
+
+
+def test_untracked_write():
+    s = stretchy.array([[1, 2], [3, 4]], default=0)
+    renderer = Renderer('s').bind(s)
+    renderer.render()
+    s[0][0] = 9
+    assert renderer.render() == '12\n34'
+    renderer.invalidate()
+    assert renderer.render() == '92\n34'
+
+
+def test_bind():
+    s = Array1D(0, content=[1, 2])
+    t = Array1D(0, content=[3, 4])
+    renderer = Renderer('s')
+    with pytest.raises(ValueError):
+        renderer.render()
+    renderer.bind(s)
+    assert s.renderer is renderer
+    assert renderer.render() == '12'
+    renderer.bind(t)
+    assert s.renderer is None
+    assert renderer.array is t
+    assert renderer.render() == '34'
+    other = Renderer().bind(t)
+    assert renderer.array is None
+    assert t.renderer is other
+    other.unbind()
+    assert t.renderer is None
+    t[0] = 5
+    assert other.array is None
+
+
+def test_snapshot_unbound():
+    s = Array1D(0, content=[1, 2])
+    Renderer().bind(s)
+    assert s.snapshot().renderer is None
+
+
+def test_invalid_format():
+    with pytest.raises(ValueError):
+        Renderer('x')
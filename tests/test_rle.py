@@ -0,0 +1,141 @@
+import random
+
+import pytest
+
+from stretchy import Array1D, RunArray1D
+
+
+def same(s, t):
+    assert s.boundaries == t.boundaries
+    assert len(s) == len(t)
+    assert list(s) == list(t)
+    assert list(s.items_nondefault()) == list(t.items_nondefault())
+    for format in ('', 's', 'a', 'l', 's,b<e>'):
+        assert f'{s:{format}}' == f'{t:{format}}'
+    assert str(s) == str(t)
+    assert repr(s) == 'Run' + repr(t)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_random_writes(seed):
+    rnd = random.Random(seed)
+    s = RunArray1D(0)
+    t = Array1D(0)
+    for _ in range(200):
+        index = rnd.randrange(-20, 20)
+        value = rnd.choice([0, 0, 1, 2])
+        s[index] = value
+        t[index] = value
+        assert s[index] == t[index]
+    same(s, t)
+    assert all(s[i] == t[i] for i in range(-25, 25))
+    starts, lengths, values = s._starts, s._lengths, s._runvalues
+    for i in range(1, len(starts)):
+        assert starts[i-1] + lengths[i-1] <= starts[i]
+        if starts[i-1] + lengths[i-1] == starts[i]:
+            assert values[i-1] != values[i]
+    assert 0 not in values
+
+
+@pytest.mark.parametrize('content,offset,runs', [
+    ('aaab..cc', -3, [(-3, 3, 'a'), (0, 1, 'b'), (1, 2, '.'), (3, 2, 'c')]),
+    ('..a', 2, [(0, 4, '.'), (4, 1, 'a')]),
+    ('ab', -5, [(-5, 1, 'a'), (-4, 1, 'b'), (-3, 3, '.')]),
+    ('', 0, []),
+])
+def test_replace_content(content, offset, runs):
+    s = RunArray1D('.', content=content, offset=offset)
+    t = Array1D('.', content=content, offset=offset)
+    same(s, t)
+    assert list(s.runs()) == runs
+
+
+@pytest.mark.parametrize('index,value,runs', [
+    (0, 'x', [(-3, 3, 'a'), (0, 1, 'x'), (1, 2, '.'), (3, 2, 'c')]),
+    (0, 'a', [(-3, 4, 'a'), (1, 2, '.'), (3, 2, 'c')]),
+    (-2, 'b', [(-3, 1, 'a'), (-2, 1, 'b'), (-1, 1, 'a'), (0, 1, 'b'),
+               (1, 2, '.'), (3, 2, 'c')]),
+    (2, 'c', [(-3, 3, 'a'), (0, 1, 'b'), (1, 1, '.'), (2, 3, 'c')]),
+    (-3, '.', [(-3, 1, '.'), (-2, 2, 'a'), (0, 1, 'b'), (1, 2, '.'),
+               (3, 2, 'c')]),
+    (7, 'c', [(-3, 3, 'a'), (0, 1, 'b'), (1, 2, '.'), (3, 2, 'c'),
+              (5, 2, '.'), (7, 1, 'c')]),
+])
+def test_split_merge(index, value, runs):
+    s = RunArray1D('.', content='aaab..cc', offset=-3)
+    s[index] = value
+    assert list(s.runs()) == runs
+
+
+def test_slice():
+    s = RunArray1D(0)
+    t = Array1D(0)
+    for u in (s, t):
+        u[-5:5] = 1
+        u[-2:3] = 2
+        u[0:10:3] = 3
+        u[-1:1] = 0
+    same(s, t)
+    assert len(s._starts) == 7
+    assert list(s[-3:3]) == list(t[-3:3])
+
+
+def test_long_runs():
+    s = RunArray1D(0)
+    s[-10**9] = 1
+    s[10**9] = 2
+    s[-10:10] = 3
+    assert len(s) == 2 * 10**9 + 1
+    assert len(s._starts) == 3
+    assert list(s.items_nondefault())[0] == (-10**9, 1)
+    assert list(s.runs((-12, 12))) == [(-12, 2, 0), (-10, 20, 3), (10, 2, 0)]
+    s.crop_to((-20, 20))
+    assert s.boundaries == (-20, 20)
+    assert list(s.runs()) == [(-20, 10, 0), (-10, 20, 3), (10, 10, 0)]
+    s.trim()
+    assert s.boundaries == (-10, 10)
+
+
+@pytest.mark.parametrize('operation', [
+    lambda u: u.trim(),
+    lambda u: u.crop_to((-3, 4)),
+    lambda u: u.crop_to((0, 0)),
+    lambda u: u.shrink_by(2),
+    lambda u: u.shrink_by((0, 6)),
+])
+def test_resize(operation):
+    content = [0, 0, 1, 1, 0, 2, 2, 2, 0, 0]
+    s = RunArray1D(0, content=content, offset=-4)
+    t = Array1D(0, content=content, offset=-4)
+    s.enable_stats()
+    t.enable_stats()
+    operation(s)
+    operation(t)
+    same(s, t)
+    assert s.stats()['cells_freed'] == t.stats()['cells_freed']
+
+
+def test_snapshot_journal():
+    s = RunArray1D('.', content='abc')
+    t = s.snapshot()
+    s[1] = 'x'
+    assert f'{t:s}' == 'abc'
+    assert f'{s:s}' == 'axc'
+    s.enable_journal()
+    s[5] = 'y'
+    s[0:2] = 'z'
+    s.crop_to((0, 2))
+    assert f'{s:s}' == 'zz'
+    s.undo(4)
+    assert f'{s:s}' == 'axc'
+    s.redo(4)
+    assert f'{s:s}' == 'zz'
+
+
+def test_memory():
+    s = RunArray1D(0)
+    t = Array1D(0)
+    for u in (s, t):
+        u[0:10000] = 1
+    assert s.memory_usage()['total'] * 50 < t.memory_usage()['total']
+    assert s.capacity == s.boundaries == (0, 10000)
@@ -0,0 +1,160 @@
+import multiprocessing
+import os
+import subprocess
+import sys
+
+import pytest
+
+import stretchy
+from stretchy import SharedArray
+
+
+@pytest.fixture
+def shared():
+    s = SharedArray(2, default=0, typecode='q', reserve=((-2, 2), (-2, 2)))
+    yield s
+    s.unlink()
+    s.close()
+
+
+@pytest.mark.parametrize('default, typecode',
+    ((0, 'q'), (-1, 'b'), (0.5, 'd'), (2, 'H'))
+)
+def test_default(default, typecode):
+    s = SharedArray(3, default, typecode=typecode)
+    try:
+        assert s[2,2,2] == default
+        s[1,1,1] = 1
+        assert s[0,0,0] == default
+        assert s[-1,-1,-1] == default
+    finally:
+        s.unlink()
+        s.close()
+
+
+def test_setitem(shared):
+    shared[1,-2] = 5
+    assert shared[1,-2] == 5
+    assert shared.boundaries == ((0, 2), (-2, 0))
+    assert shared.offset == (0, -2)
+    assert shared.shape == (2, 2)
+    assert len(shared) == 2
+
+
+def test_grow(shared):
+    shared[1,1] = 3
+    shared[-1,-1] = 4
+    shared[10,-20] = 5
+    assert shared.boundaries == ((-1, 11), (-20, 2))
+    lo, hi = shared.capacity[1]
+    assert lo <= -20 and hi >= 2
+    assert (shared[1,1], shared[-1,-1], shared[10,-20]) == (3, 4, 5)
+
+
+def test_attach(shared):
+    other = SharedArray.attach(shared.name)
+    try:
+        shared[1,1] = 7
+        assert other[1,1] == 7
+        other[-1,0] = 8
+        assert shared[-1,0] == 8
+        # growth replaces the data segment, attached arrays re-map it
+        other[100,100] = 9
+        assert shared[100,100] == 9
+        assert shared[1,1] == 7
+        assert shared.capacity == other.capacity
+        shared[-100,-100] = 10
+        assert other[-100,-100] == 10
+        assert other.boundaries == ((-100, 101), (-100, 101))
+    finally:
+        other.close()
+
+
+GROWER = '''
+import sys
+from stretchy import SharedArray
+array = SharedArray.attach(sys.argv[1])
+for i in range(1, 300):
+    array[-i * 4, i * 4] = i
+array.close()
+'''
+
+
+def test_attach_by_name(shared):
+    # An unrelated process attaches by the name only, and grows the array
+    shared[1,1] = 7
+    env = dict(os.environ,
+        PYTHONPATH=os.path.dirname(os.path.dirname(stretchy.__file__)))
+    child = subprocess.Popen([sys.executable, '-c', GROWER, shared.name],
+                             env=env)
+    while child.poll() is None:
+        assert shared[1,1] == 7
+        assert shared[-8,8] in (0, 2)
+    assert child.returncode == 0
+    assert shared.boundaries == ((-1196, 2), (0, 1197))
+    assert all(shared[-i * 4, i * 4] == i for i in range(1, 300))
+
+
+def grower(array, count):
+    for i in range(1, count):
+        array[i * 4, -i * 4] = i
+    array.close()
+
+
+def test_grow_in_child(shared):
+    shared[1,1] = 7
+    shared[-1,0] = 8
+    child = multiprocessing.Process(target=grower, args=(shared, 300))
+    child.start()
+    # The child replaces the data segment several times meanwhile
+    while child.is_alive():
+        assert shared[1,1] == 7 and shared[-1,0] == 8
+        assert shared[8,-8] in (0, 2)
+    child.join()
+    assert child.exitcode == 0
+    assert shared.boundaries == ((-1, 1197), (-1196, 2))
+    assert all(shared[i * 4, -i * 4] == i for i in range(1, 300))
+    assert (shared[1,1], shared[-1,0]) == (7, 8)
+
+
+def test_onedim():
+    s = SharedArray(default=1.5)
+    try:
+        s[3] = 2
+        s[-20] = 3
+        assert s.boundaries == (-20, 4)
+        assert s.offset == -20
+        assert list(s) == [3.0] + [1.5] * 22 + [2.0]
+        assert f'{s:s,}' == ','.join(['3.0'] + ['1.5'] * 22 + ['2.0'])
+    finally:
+        s.unlink()
+        s.close()
+
+
+def test_to_array(shared):
+    shared[1,-1] = 1
+    shared[-1,1] = 2
+    assert f'{shared.to_array():s}' == '002\n000\n100'
+    assert f'{shared:s}' == '002\n000\n100'
+
+
+def test_wrong_index(shared):
+    with pytest.raises(TypeError):
+        shared[1] = 1
+    with pytest.raises(TypeError):
+        shared[1,2,3]
+
+
+def test_wrong_params():
+    with pytest.raises(ValueError):
+        SharedArray(typecode='x')
+    with pytest.raises(ValueError):
+        SharedArray(2, reserve=((1, 2), (0, 2)))
+
+
+def test_closed():
+    s = SharedArray()
+    s.unlink()
+    s.close()
+    with pytest.raises(ValueError):
+        s[0]
@@ -0,0 +1,115 @@
+import pytest
+
+import stretchy
+from stretchy import Array1D, ArrayND, Stats
+
+
+@pytest.fixture
+def hook():
+    events = []
+    stretchy.set_stats_hook(lambda event, amount: events.append((event, amount)))
+    yield events
+    stretchy.set_stats_hook(None)
+
+
+def test_disabled():
+    s = ArrayND(2, '.')
+    s[3,3] = 'a'
+    assert s._stats is None
+    assert s[3]._stats is None
+    with pytest.raises(ValueError):
+        s.stats()
+
+
+def test_stats_repr():
+    stats = Stats()
+    stats.count('grow_events', 2)
+    assert stats['grow_events'] == 2
+    assert 'grow_events=2' in repr(stats)
+    stats.reset()
+    assert stats['grow_events'] == 0
+
+
+@pytest.mark.parametrize('indices,grow,neg,pos', [
+    ([0], 1, 0, 1),
+    ([3], 1, 0, 4),
+    ([-3], 1, 3, 0),
+    ([2, 1, 4, -1, -2], 4, 2, 5),
+])
+def test_growth_1d(indices, grow, neg, pos):
+    s = Array1D(0)
+    s.enable_stats()
+    for index in indices:
+        s[index] = 1
+    stats = s.stats()
+    assert stats['grow_events'] == grow
+    assert stats['cells_added_negative'] == neg
+    assert stats['cells_added_positive'] == pos
+
+
+def test_growth_nd():
+    s = ArrayND(3, 0)
+    s.enable_stats()
+    s[1,1,1] = 1
+    s[-1,0,0] = 1
+    s[1,1,1] = 2
+    stats = s.stats().as_dict()
+    assert stats['planes_created'] == 4
+    assert stats['grow_events'] == 2 + 1 + 1 + 1 + 1
+    assert stats['cells_added_positive'] == 3
+    assert stats['cells_added_negative'] == 0
+
+
+def test_enable_existing():
+    s = stretchy.array([[1,2],[3,4]])
+    s.enable_stats()
+    assert s[1]._stats is s.stats()
+    s[1,3] = 5
+    assert s.stats()['cells_added_positive'] == 2
+    s.disable_stats()
+    assert s[1]._stats is None
+
+
+@pytest.mark.parametrize('operation,freed', [
+    (lambda s: s.trim(), 9),
+    (lambda s: s.crop_to(((0, 1), (0, 2))), 10),
+    (lambda s: s.shrink_by(1), 6),
+])
+def test_freed(operation, freed):
+    s = ArrayND(2, 0, content=[[0,0,0,0],[0,1,1,0],[0,0,0,0]], offset=(0,0))
+    s.enable_stats()
+    operation(s)
+    assert s.stats()['cells_freed'] == freed
+
+
+def test_boundaries_rendered():
+    s = stretchy.array([[1,2,3],[4,5,6]])
+    s.enable_stats()
+    s.boundaries
+    assert s.stats()['boundaries_computed'] == 1
+    str(s)
+    assert s.stats()['boundaries_computed'] == 2
+    assert s.stats()['cells_rendered'] == 6
+    t = Array1D(0, content=[1,2,3])
+    t.enable_stats()
+    f'{t}'
+    assert t.stats()['cells_rendered'] == 3
+
+
+def test_snapshot_independent():
+    s = stretchy.array([[1,2],[3,4]])
+    s.enable_stats()
+    t = s.snapshot()
+    t[0,5] = 1
+    assert t._stats is None
+    assert t[0]._stats is None
+    assert s.stats()['grow_events'] == 0
+
+
+def test_hook(hook):
+    s = Array1D(0)
+    s[5] = 1
+    assert hook == []
+    s.enable_stats()
+    s[-2] = 1
+    assert hook == [('grow_events', 1), ('cells_added_negative', 2)]
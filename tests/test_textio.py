@@ -0,0 +1,163 @@
+import io
+
+import pytest
+
+import stretchy
+
+
+@pytest.mark.parametrize('text,params,boundaries,content', [
+    ('', {}, ((0, 0), (0, 0)), ''),
+    ('ab\ncd', {}, ((0, 2), (0, 2)), 'ab\ncd'),
+    ('ab\ncd\n', {}, ((0, 2), (0, 2)), 'ab\ncd'),
+    ('ab\r\nc\r\n', {'default': '.'}, ((0, 2), (0, 2)), 'ab\nc.'),
+    ('ab\n\ncd', {'default': '.'}, ((0, 3), (0, 2)), 'ab\n..\ncd'),
+    ('a,b\nc,d', {'sep': ','}, ((0, 2), (0, 2)), 'ab\ncd'),
+    ('ab\ncd', {'offset': -1}, ((-1, 1), (-1, 1)), 'ab\ncd'),
+    ('ab\ncd', {'offset': (2, -1), 'default': '.'}, ((0, 4), (-1, 1)),
+        '..\n..\nab\ncd'),
+    ('ab\n\ncd\nef', {'dim': 3, 'default': '.'}, ((0, 2), (0, 2), (0, 2)),
+        'ab\n..\n\ncd\nef'),
+    ('ab\n\n\ncd', {'dim': 4, 'default': '.'},
+        ((0, 2), (0, 1), (0, 1), (0, 2)), 'ab\n\n\ncd'),
+])
+def test_parse(text, params, boundaries, content):
+    array = stretchy.parse(text, **params)
+    assert array.boundaries == boundaries
+    assert f'{array:s}' == content
+
+
+@pytest.mark.parametrize('fmt,sep', [
+    ('s', ''),
+    ('s;', ';'),
+])
+def test_roundtrip(fmt, sep):
+    s = stretchy.empty(2, '.')
+    s[-2, 3] = '#'
+    s[1, -1] = '@'
+    s[0, 0] = 'o'
+    text = format(s, fmt)
+    t = stretchy.parse(text, sep=sep, default='.', offset=s.offset)
+    assert t.boundaries == s.boundaries
+    assert list(t.ndenumerate()) == list(s.ndenumerate())
+
+
+def test_roundtrip_3d():
+    s = stretchy.empty(3, '.')
+    s[1, 2, 0] = 'a'
+    s[-1, 0, 1] = 'b'
+    t = stretchy.parse(f'{s:s}', dim=3, default='.', offset=s.offset)
+    assert list(t.ndenumerate()) == list(s.ndenumerate())
+
+
+def test_charmap():
+    array = stretchy.parse('#.\n.#', default=0, charmap={'#': 1, '.': 0})
+    assert list(array.ndenumerate()) == [
+        ((0, 0), 1), ((0, 1), 0), ((1, 0), 0), ((1, 1), 1)
+    ]
+    array = stretchy.parse('#x', charmap={'#': 1})
+    assert array[0, 1] == 'x'
+
+
+def test_sparse():
+    array = stretchy.parse('...\n.#.\n...\n#..\n...', default='.', sparse=True)
+    assert array.boundaries == ((0, 4), (0, 2))
+    assert array._pos[0] is None and array._pos[2] is None
+    assert f'{array:s}' == '..\n.#\n..\n#.'
+
+
+@pytest.mark.parametrize('source', [
+    io.StringIO('ab\ncd\n'),
+    io.BytesIO('ab\ncd\n'.encode()),
+])
+def test_file(source):
+    array = stretchy.parse(source)
+    assert f'{array:s}' == 'ab\ncd'
+
+
+def test_path(tmp_path):
+    path = tmp_path / 'map.txt'
+    path.write_text('αb\ncd\n', encoding='utf-8')
+    array = stretchy.parse(path)
+    assert f'{array:s}' == 'αb\ncd'
+    empty = tmp_path / 'empty.txt'
+    empty.write_text('')
+    assert len(stretchy.parse(empty)) == 0
+
+
+def test_invalid():
+    with pytest.raises(ValueError):
+        stretchy.parse('abc', dim=1)
+    with pytest.raises(ValueError):
+        stretchy.parse('abc', offset=(1, 2, 3))
+
+
+@pytest.mark.parametrize('index,text', [
+    (True, ',-1,0,1\r\n-1,a,.,.\r\n0,.,b,.\r\n1,.,.,c\r\n'),
+    (False, 'a,.,.\r\n.,b,.\r\n.,.,c\r\n'),
+])
+def test_to_csv(index, text):
+    s = stretchy.empty(2, '.')
+    s[-1, -1] = 'a'
+    s[0, 0] = 'b'
+    s[1, 1] = 'c'
+    out = io.StringIO()
+    s.to_csv(out, index=index)
+    assert out.getvalue() == text
+
+
+def test_to_csv_1d():
+    out = io.StringIO()
+    stretchy.array('abc', offset=-1).to_csv(out, lineterminator='\n')
+    assert out.getvalue() == '-1,0,1\na,b,c\n'
+
+
+def test_to_csv_3d():
+    s = stretchy.empty(3, 0)
+    s[1, 0, 1] = 5
+    s[0, -1, 0] = 3
+    out = io.StringIO()
+    s.to_csv(out, lineterminator='\n')
+    assert out.getvalue() == ',,0,1\n0,-1,3,0\n0,0,0,0\n1,-1,0,0\n1,0,0,5\n'
+
+
+@pytest.mark.parametrize('dim,cells,default', [
+    (1, [(-2,), (3,)], None),
+    (2, [(-1, 2), (4, -3)], '.'),
+    (2, [], None),
+    (3, [(1, 0, 1), (0, -1, 0)], 0),
+    (4, [(1, 0, -1, 2)], '.'),
+])
+def test_csv_roundtrip(dim, cells, default):
+    s = stretchy.empty(dim, default)
+    for cell in cells:
+        s[cell if dim > 1 else cell[0]] = 7
+    out = io.StringIO()
+    s.to_csv(out)
+    out.seek(0)
+    t = stretchy.read_csv(out, default=default,
+                          convert=int if default == 0 else None)
+    assert t.dim == dim
+    assert t.boundaries == s.boundaries
+    assert [value if value in (default, None) else int(value)
+        for _, value in t.ndenumerate()] == [value for _, value in s.ndenumerate()]
+
+
+def test_read_csv_noindex():
+    t = stretchy.read_csv(io.StringIO('1;2\n;4\n'), index=False, default=0,
+                          convert=int, offset=(-1, 3), delimiter=';')
+    assert t.boundaries == ((-1, 1), (0, 5))
+    assert f'{t:s,}' == '0,0,0,1,2\n0,0,0,0,4'
+
+
+def test_read_csv_sparse_rows():
+    t = stretchy.read_csv(io.StringIO(',0,1\n5,a,b\n-2,c,\n'), default='.')
+    assert t.boundaries == ((-2, 6), (0, 2))
+    assert t._pos[0] is None
+    assert t[5, 1] == 'b' and t[-2, 1] == '.'
+
+
+def test_read_csv_invalid():
+    with pytest.raises(ValueError):
+        stretchy.read_csv(io.StringIO(''))
+    with pytest.raises(ValueError):
+        stretchy.read_csv(io.StringIO('a,b'), index=False, dim=3)
@@ -0,0 +1,73 @@
+import pytest
+import sys
+import threading
+
+import stretchy
+from stretchy import Array1D, ArrayND
+
+
+@pytest.fixture
+def switching():
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def run(worker, count=8):
+    threads = [threading.Thread(target=worker, args=(k,)) for k in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_locks():
+    s = ArrayND(3, threadsafe=True)
+    s[1,2,3] = 1
+    s[-1,-2,-3] = 1
+    assert s._pos[1]._locks is s._locks
+    assert s._pos[1]._pos[2]._lock is not None
+    assert ArrayND(2)._locks is None
+    assert Array1D()._lock is None
+    assert Array1D(threadsafe=True)._lock is not None
+
+
+def test_factories():
+    assert stretchy.empty(2, threadsafe=True)._locks is not None
+    assert stretchy.empty(threadsafe=True)._lock is not None
+    assert stretchy.array(['ab'], dim=2, threadsafe=True)._locks is not None
+
+
+def test_growth(switching):
+    s = ArrayND(2, 0, threadsafe=True)
+    def worker(k):
+        sign = 1 if k % 2 else -1
+        for i in range(300):
+            s[sign * i, k] = 1
+            s[k, sign * i] = 1
+    run(worker)
+    assert s.boundaries == ((-299, 300), (-299, 300))
+    for k in range(8):
+        sign = 1 if k % 2 else -1
+        assert all(s[sign * i, k] == 1 and s[k, sign * i] == 1 for i in range(300))
+
+
+def test_onedim(switching):
+    s = Array1D(0, threadsafe=True)
+    def worker(k):
+        for i in range(k, 2000, 8):
+            s[i] = i
+            s[-i-1] = i
+    run(worker)
+    assert list(s) == list(reversed(range(2000))) + list(range(2000))
+
+
+def test_snapshot():
+    s = ArrayND(2, '.', content=['ab'], threadsafe=True)
+    t = s.snapshot()
+    t[0,0] = '#'
+    assert t._locks is not None and t._locks is not s._locks
+    assert t._pos[0]._lock is not None
+    assert f'{s:s}' == 'ab'
+    assert f'{t:s}' == '#b'
@@ -0,0 +1,194 @@
+import pytest
+
+import stretchy
+from stretchy import Array1D, ArrayND, View
+
+
+@pytest.fixture
+def cube():
+    s = stretchy.empty(3, 0)
+    s[0, 0, 0] = 1
+    s[0, 1, -1] = 2
+    s[1, -1, 2] = 3
+    s[-1, 0, 1] = 4
+    return s
+
+
+@pytest.mark.parametrize('prefix,dim,boundaries,content', [
+    ((0,), 2, ((0, 2), (-1, 1)), [[0, 1], [2, 0]]),
+    ((1,), 2, ((-1, 0), (0, 3)), [[0, 0, 3]]),
+    ((-1,), 2, ((0, 1), (0, 2)), [[0, 4]]),
+    ((0, 1), 1, (-1, 0), [2]),
+    ((1, -1), 1, (0, 3), [0, 0, 3]),
+])
+def test_partial_index(cube, prefix, dim, boundaries, content):
+    view = cube[prefix]
+    assert isinstance(view, View)
+    assert view.dim == dim
+    assert view.boundaries == boundaries
+    assert view.tolist() == content
+
+
+@pytest.mark.parametrize('prefix', [(5,), (-7,), (0, 9), (7, 1), (1, 0)])
+def test_missing_region(cube, prefix):
+    cube.enable_stats()
+    boundaries = cube.boundaries
+    view = cube[prefix]
+    assert view.shape == (0,) * view.dim
+    assert not view
+    assert len(view) == 0
+    assert view[(3,) * view.dim] == 0
+    assert list(view.items_nondefault()) == []
+    assert cube.boundaries == boundaries
+    assert cube.stats()['planes_created'] == 0
+
+
+def test_live(cube):
+    view = cube[2,]
+    assert not view
+    view[1, 1] = 5
+    assert cube[2, 1, 1] == 5
+    assert view.boundaries == ((0, 2), (0, 2))
+    cube[2, 0, 3] = 6
+    assert view[0, 3] == 6
+    row = view[0]
+    assert row[3] == 6
+    row[-1] = 7
+    assert cube[2, 0, -1] == 7
+    assert cube[2][0, -1] == 7
+
+
+def test_nested(cube):
+    assert cube[0][1].tolist() == cube[0, 1].tolist()
+    assert cube[0][1, -1] == 2
+    assert cube[0][1][-1] == 2
+    assert [row.tolist() for row in cube[0,]] == [[1], [2]]
+
+
+def test_enumerate(cube):
+    view = cube[0,]
+    assert list(view.ndenumerate()) == [
+        ((0, -1), 0), ((0, 0), 1), ((1, -1), 2), ((1, 0), 0)
+    ]
+    assert list(view.items_nondefault()) == [((0, 0), 1), ((1, -1), 2)]
+    assert list(cube[0, 1].ndenumerate()) == [(-1, 2)]
+    assert view.tolist(((1, 3), (-1, 1)), tuples=True) == ((2, 0), (0, 0))
+    assert list(view.tolist(stream=True)) == [[0, 1], [2, 0]]
+
+
+def test_materialize(cube):
+    view = cube[0,]
+    array = view.materialize()
+    assert isinstance(array, ArrayND)
+    assert array.boundaries == ((0, 2), (-1, 1))
+    array[0, 0] = 9
+    assert cube[0, 0, 0] == 1
+    row = cube[0, 1].materialize()
+    assert isinstance(row, Array1D)
+    assert row.boundaries == (-1, 0)
+    assert f'{view:s}' == '01\n20'
+    assert str(view) == str(cube[0])
+    assert repr(cube[0, 1]) == f'View({row!r})'
+
+
+def test_int_index_missing():
+    # Probing a missing plane by an int index creates nothing
+    s = ArrayND(3, 0)
+    s[1, 1, 1] = 1
+    view = s[4]
+    assert isinstance(view, View) and not view
+    assert isinstance(s[0], View)
+    assert s.boundaries == ((0, 2), (0, 2), (0, 2))
+    assert s._pos[0] is None
+    view[2, 2] = 3
+    assert s[4, 2, 2] == 3
+    assert isinstance(s[4], ArrayND) and isinstance(s[1], ArrayND)
+
+
+@pytest.mark.parametrize('index', [(), (1, 2, 3, 4), (1, 'a'), 'a'])
+def test_wrong_index(cube, index):
+    with pytest.raises(TypeError):
+        cube[index]
+
+
+def test_wrong_view_index(cube):
+    view = cube[0,]
+    with pytest.raises(TypeError):
+        view[1, 2, 3]
+    with pytest.raises(TypeError):
+        view[1] = 1
+
+
+def transposed(rows):
+    return [list(row) for row in zip(*rows)]
+
+
+GRID = ['ab.', '..c']
+
+
+@pytest.mark.parametrize('make,content,boundaries', [
+    (lambda a: a.transpose(), ['a.', 'b.', '.c'], ((0, 3), (0, 2))),
+    (lambda a: a.transpose((1, 0)), ['a.', 'b.', '.c'], ((0, 3), (0, 2))),
+    (lambda a: a.flip(0), ['..c', 'ab.'], ((-2, 0), (0, 3))),
+    (lambda a: a.flip(-1), ['.ba', 'c..'], ((0, 2), (-3, 0))),
+    (lambda a: a.rot90(), ['.c', 'b.', 'a.'], ((-3, 0), (0, 2))),
+    (lambda a: a.rot90(2), ['c..', '.ba'], ((-2, 0), (-3, 0))),
+    (lambda a: a.rot90(-1), ['.a', '.b', 'c.'], ((0, 3), (-2, 0))),
+    (lambda a: a.rot90(1, (1, 0)), ['.a', '.b', 'c.'], ((0, 3), (-2, 0))),
+    (lambda a: a.rot90(4), GRID, ((0, 2), (0, 3))),
+    (lambda a: a.flip(0).flip(0), GRID, ((0, 2), (0, 3))),
+    (lambda a: a.rot90().rot90().rot90(), ['.a', '.b', 'c.'], ((0, 3), (-2, 0))),
+])
+def test_transform(make, content, boundaries):
+    array = stretchy.parse('\n'.join(GRID), default='.')
+    view = make(array)
+    assert view.boundaries == boundaries
+    assert view.tolist() == [list(row) for row in content]
+    assert f'{view:s}' == '\n'.join(content)
+    assert [''.join(row) for row in view] == content
+    copy = view.materialize()
+    assert copy.boundaries == boundaries
+    assert f'{copy:s}' == '\n'.join(content)
+
+
+def test_transform_live():
+    array = stretchy.parse('ab\ncd', default='.')
+    view = array.rot90()
+    view[-1, 1] = 'x'
+    assert f'{array:s}' == 'ab\nxd'
+    array[0, 0] = 'y'
+    assert view[-1, 0] == 'y'
+    assert view[-1].tolist() == ['y', 'x']
+    assert view.flip(1)[-1, -1] == 'y'
+
+
+@pytest.mark.parametrize('axes', [(0, 1, 2), (2, 1, 0), (1, 2, 0), (2, 0, 1)])
+@pytest.mark.parametrize('flips', [(), (0,), (2,), (0, 1, 2)])
+def test_transform_3d(cube, axes, flips):
+    view = cube.transpose(axes)
+    for axis in flips:
+        view = view.flip(axis)
+    bounds = cube.boundaries
+    def base(index):
+        index = [-1 - i if axis in flips else i for axis, i in enumerate(index)]
+        full = [0, 0, 0]
+        for axis, i in zip(axes, index):
+            full[axis] = i
+        return tuple(full)
+    expected = tuple((-bounds[a][1], -bounds[a][0]) if axis in flips
+                         else bounds[a] for axis, a in enumerate(axes))
+    assert view.boundaries == expected
+    for index, value in view.ndenumerate():
+        assert value == cube[base(index)]
+    assert view.materialize().tolist() == view.tolist()
+
+
+def test_transform_errors(cube):
+    with pytest.raises(ValueError):
+        cube.transpose((0, 0, 1))
+    with pytest.raises(ValueError):
+        cube.transpose((0, 1))
+    with pytest.raises(ValueError):
+        cube.flip(3)
+    with pytest.raises(ValueError):
+        cube.rot90(1, (2, -1))